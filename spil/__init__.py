@@ -14,22 +14,6 @@ from spil.conf.global_conf import __version__
 
 try:
     from spil import conf  # default config bootstrap
-    from spil.sid.sid import Sid
-
-    from spil.sid.read.finder import Finder
-    from spil.sid.pathops.find_paths import FindInPaths
-    from spil.sid.read.finders.find_list import FindInList
-    from spil.sid.read.finders.find_constants import FindInConstants
-    from spil.sid.read.finders.find_all import FindInAll
-    from spil.sid.read.getters.getter_all import GetFromAll
-#     from spil.sid.read.finders.find_cache import FindInCache
-
-    from spil.sid.read.getter import Getter
-    from spil.sid.pathops.getter_paths import GetFromPaths
-
-    from spil.sid.write.writer import Writer
-    from spil.sid.write.write_all import WriteToAll
-    from spil.sid.pathops.write_paths import WriteToPaths
 
     # FIXME: keep util level import
     from spil.util.exception import SpilException
@@ -44,3 +28,39 @@ except Exception as e:
     raise Exception(
         "Spil is imported, but impossible to import spil packages. \n Please check compatibility of your sid_conf and fs_conf files."
     )
+
+# The public classes are imported on first access (PEP 562 module __getattr__), to keep "import spil" fast.
+# "from spil import Sid" works as before.
+_lazy_imports = {
+    "Sid": "spil.sid.sid",
+    "Finder": "spil.sid.read.finder",
+    "FindInPaths": "spil.sid.pathops.find_paths",
+    "FindInList": "spil.sid.read.finders.find_list",
+    "FindInCatalog": "spil.sid.read.finders.find_catalog",
+    "FindInConstants": "spil.sid.read.finders.find_constants",
+    "FindInAll": "spil.sid.read.finders.find_all",
+    "SidMatcher": "spil.sid.read.matcher",
+    "GetFromAll": "spil.sid.read.getters.getter_all",
+    # "FindInCache": "spil.sid.read.finders.find_cache",
+    "Getter": "spil.sid.read.getter",
+    "GetFromPaths": "spil.sid.pathops.getter_paths",
+    "Writer": "spil.sid.write.writer",
+    "WriteToAll": "spil.sid.write.write_all",
+    "WriteToPaths": "spil.sid.pathops.write_paths",
+}
+
+__all__ = ["__version__", "conf", "SpilException", "log", "logging", "setLevel", "ERROR", *_lazy_imports]
+
+
+def __getattr__(name):
+    module = _lazy_imports.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    import importlib  # fmt: skip
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value  # next accesses do not go through __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_lazy_imports))
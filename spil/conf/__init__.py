@@ -14,6 +14,7 @@ from spil.conf.global_conf import *
 
 # user config_name
 from spil.conf.configio import ConfigIO
+from spil.util.caching import bump_config_generation
 
 try:
     from spil.conf.sid_conf_load import *
@@ -34,6 +35,8 @@ def set(key, value, save=True):
     If save is True (the default), the variable is saved into the user config_name, and persisted
     (unless the config_name file is wiped).
 
+    The config generation is bumped, so that cached values depending on the config are recomputed.
+
     Example :
 
     conf.set('prefered_project', self.ui.prod_CBB.currentText() or conf.prefered_project)
@@ -42,6 +45,7 @@ def set(key, value, save=True):
     See also spil.tests.conf_tests
     """
     globals()[key] = value
+    bump_config_generation()
     if save:
         user_conf.save(key, value)
 
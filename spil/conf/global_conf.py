@@ -12,7 +12,9 @@ You should have received a copy of the GNU Lesser General Public License along w
 If not, see <https://www.gnu.org/licenses/>.
 
 """
+import os
 from pathlib import Path
+from typing import Dict
 
 pysep = "/"  # python path separator
 
@@ -29,6 +31,19 @@ default_sid_conf_data_path = str(application_path.parent / "spil_hamlet_conf" /
 # automatic replacement to INFO and WARN in BETA and PROD
 loglevel = 80
 
+# memory caches, see spil.util.caching
+cache_size = 4096 * 4  # default maximum amount of entries per cache
+cache_sizes: Dict[str, int] = {}  # per cache sizes, by name, eg. {"spil.sid.core.sid_resolver.sid_to_dict": 100000}
+
+# lazy Sids: if True, Sid("string") is resolved only when typed information is first needed (see sid_factory.lazy_sid)
+lazy_sids = False
+
+# configuration snapshot file: if set, the computed configuration is loaded from it (see spil.conf.snapshot)
+config_snapshot_path = os.environ.get("SPIL_CONF_SNAPSHOT")
+
+# maximum amount of searches generated by the "or" operator from one search (see unfolders.or_op), None or 0 for no limit
+search_or_limit = 10000
+
 user_app_folder_name = ".spil/conf"
 user_conf_file_name = "user_conf.json"
 
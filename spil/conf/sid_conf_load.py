@@ -14,9 +14,10 @@ If not, see <https://www.gnu.org/licenses/>.
 import importlib
 import inspect
 
-from spil.conf.util import extrapolate_templates, pattern_replacing
+from spil.conf.util import extrapolate_templates, pattern_replacing, build_template_index, build_keyset_index, build_type_meta, build_expand_table
+from spil.conf import snapshot
 try:
-    import resolva
+    import resolva  # noqa: F401  # checks that resolva is installed
 except:
     raise Exception('\nUnable to import "resolva". \n'
                     '"resolva" is the new path template resolving lib used by spil.\n'
@@ -59,11 +60,33 @@ for name, value in inspect.getmembers(module):
     globals()[name] = value
     __all__.append(name)
 
-sid_templates = extrapolate_templates(sid_templates, to_extrapolate)
-pattern_replacing(sid_templates, key_patterns)
+# the computed values are loaded from the configuration snapshot, if available and up to date (see spil.conf.snapshot)
+sources_hash = snapshot.source_hash(sid_templates, to_extrapolate, key_patterns, leaf_keys)
+snapshot_data = snapshot.get_entry('spil_sid_conf', sources_hash)
 
-# loading into a resolva.Resolver instance (that will be cached)
-resolva.Resolver("sid", sid_templates, check_duplicate_placeholders=False)
+if snapshot_data:
+    sid_templates, sid_template_index, sid_keyset_index, sid_type_meta, sid_resolver_state = snapshot_data
+    snapshot.restore_resolver(sid_resolver_state)
+else:
+    sid_templates = extrapolate_templates(sid_templates, to_extrapolate)
+    pattern_replacing(sid_templates, key_patterns)
+
+    # dispatch index, to match a sid string only against its candidate templates
+    sid_template_index = build_template_index(sid_templates)
+
+    # keyset index, to format a fields dict only with its candidate templates
+    sid_keyset_index = build_keyset_index(sid_templates)
+
+    # per type metadata (keys, basetype, parent...)
+    sid_type_meta = build_type_meta(sid_templates, leaf_keys)
+
+__all__.extend(['sid_template_index', 'sid_keyset_index', 'sid_type_meta'])
+
+# "**" expansion candidates, by leaf key, see spil.sid.core.utils.expand
+sid_expand_table = build_expand_table(sid_type_meta)
+__all__.append('sid_expand_table')
+
+# the "sid" resolva.Resolver instance is created on first use, see sid_resolver.get_resolver()
 
 if __name__ == '__main__':
 
@@ -0,0 +1,302 @@
+"""
+This file is part of SPIL, The Simple Pipeline Lib.
+
+(C) copyright 2019-2024 Michael Haussmann, spil@xeo.info
+
+SPIL is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option) any later version.
+
+SPIL is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with SPIL.
+If not, see <https://www.gnu.org/licenses/>.
+"""
+"""
+Configuration snapshot.
+
+Every process computes the extrapolated and pattern replaced sid templates, the template and keyset indexes,
+the type metadata, and the sid and path config resolvers.
+The snapshot saves these computed values to a pickle file, that is loaded at startup instead of recomputing.
+This is useful for render farms, where many short-lived processes import spil.
+
+The snapshot is used if its path is configured in the "SPIL_CONF_SNAPSHOT" environment variable (see global_conf).
+It is built by running this module (python -m spil.conf.snapshot), or by calling build_snapshot().
+
+Each entry of the snapshot is stored with a hash of its sources (the templates and patterns read from the config modules),
+so that an entry is recomputed as soon as the configuration changes.
+The snapshot file is stored with a fingerprint of the code that builds and restores its data (see code_fingerprint),
+so that the whole snapshot is ignored if spil or resolva change (eg. an upgrade, without a version change).
+
+The resolver regexes are saved as pattern strings, and compiled when first used (see LazyRegexes),
+so that a process only compiles the templates it actually resolves.
+"""
+from typing import Any, Dict, Optional, Mapping, Iterator
+
+import hashlib
+import os
+import pickle
+import re
+
+from resolva import Resolver  # type: ignore
+from resolva.resolver import instance_cache as resolver_instances  # type: ignore
+
+from spil.conf.global_conf import __version__, config_snapshot_path
+from spil.util.log import debug, info, warning
+
+snapshot_format = 2
+
+_snapshot: Optional[dict] = None  # the loaded snapshot entries, read once
+_fingerprint: Dict[str, Any] = {}  # the code fingerprint, computed once (see code_fingerprint)
+
+
+def source_hash(*sources: Any) -> str:
+    """
+    Returns a hash of the given sources, the spil version and the snapshot format.
+    The sources are configuration values (dicts, lists and strings), hashed using their repr.
+
+    Examples:
+
+        >>> source_hash({'a': '{project}'}) == source_hash({'a': '{project}'})
+        True
+        >>> source_hash({'a': '{project}'}) == source_hash({'a': '{project}/{type}'})
+        False
+
+    Args:
+        sources: configuration values
+
+    Returns: the hash, as a hexadecimal string
+    """
+    return hashlib.sha1(repr((snapshot_format, __version__) + sources).encode()).hexdigest()
+
+
+def _file_hash(module: Any) -> str:
+    # hash of the source file of the given module
+    with open(module.__file__, "rb") as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+
+def code_fingerprint() -> Dict[str, Any]:
+    """
+    Returns the fingerprint of the code that builds and restores the snapshot data:
+    the snapshot format, the spil and resolva versions, the sources of spil.conf.util (templates, indexes and type metadata)
+    and of resolva.resolver (the saved resolver state), and the SidTypeMeta fields.
+
+    It is computed once, only if a snapshot is read or built: the version lookup takes a few milliseconds.
+
+    Returns: the fingerprint dict
+    """
+    if not _fingerprint:
+        import resolva.resolver  # type: ignore
+        from spil.conf import util
+
+        try:
+            from importlib.metadata import version  # python >= 3.8
+
+            resolva_version = version("resolva")
+        except Exception:  # python 3.7, or resolva is not installed as a distribution
+            resolva_version = None
+
+        _fingerprint.update(
+            format=snapshot_format,
+            spil=__version__,
+            resolva=resolva_version,
+            resolva_resolver=_file_hash(resolva.resolver),
+            spil_conf_util=_file_hash(util),
+            SidTypeMeta=util.SidTypeMeta._fields,
+        )
+    return _fingerprint
+
+
+def read_snapshot(path: Optional[str] = None) -> dict:
+    """
+    Reads the snapshot entries from the given path, or the configured snapshot path.
+    Returns an empty dict if the file does not exist, or is not readable,
+    or if it was built by other code (see code_fingerprint).
+
+    Examples:
+
+        >>> import tempfile
+        >>> path = os.path.join(tempfile.mkdtemp(), 'spil_conf.snapshot')
+        >>> entries = build_snapshot(path)
+        >>> sorted(read_snapshot(path)) == sorted(entries)
+        True
+
+        The snapshot is rejected if resolva or the type metadata changed:
+
+        >>> saved = dict(code_fingerprint())
+        >>> code_fingerprint()['resolva'] = '0.0.0'  # as if resolva was upgraded
+        >>> read_snapshot(path)
+        {}
+        >>> code_fingerprint().update(saved)
+        >>> code_fingerprint()['SidTypeMeta'] = ('type', 'keys')  # as if the SidTypeMeta fields changed
+        >>> read_snapshot(path)
+        {}
+        >>> code_fingerprint().update(saved)
+        >>> sorted(read_snapshot(path)) == sorted(entries)
+        True
+
+    Args:
+        path: a snapshot file path
+
+    Returns: the snapshot entries, by name
+    """
+    path = path or config_snapshot_path
+    if not path or not os.path.exists(path):
+        return {}
+    try:
+        with open(path, "rb") as f:
+            data = pickle.load(f)
+    except Exception as e:
+        warning(f'Unable to read the configuration snapshot "{path}": {e}')
+        return {}
+    if data.get("format") != snapshot_format:
+        info(f'Configuration snapshot "{path}" has an outdated format, ignored.')
+        return {}
+    if data.get("fingerprint") != code_fingerprint():
+        info(f'Configuration snapshot "{path}" was built by another spil or resolva code, ignored.')
+        return {}
+    return data.get("entries", {})
+
+
+def get_entry(name: str, sources_hash: str) -> Optional[Any]:
+    """
+    Returns the data of the snapshot entry with the given name, if its sources hash matches.
+    Returns None if no snapshot is configured, or if the entry is missing or outdated.
+
+    Args:
+        name: the entry name, eg. "spil_sid_conf", or a path config name
+        sources_hash: the current hash of the entry sources, see source_hash()
+
+    Returns: the entry data, or None
+    """
+    global _snapshot
+    if not config_snapshot_path:
+        return None
+    if _snapshot is None:
+        _snapshot = read_snapshot()
+    entry = _snapshot.get(name)
+    if not entry:
+        return None
+    if entry[0] != sources_hash:
+        debug(f'Configuration snapshot entry "{name}" is outdated, recomputing.')
+        return None
+    return entry[1]
+
+
+class LazyRegexes(Mapping):
+    """
+    Read-only mapping of label to compiled regex, used as the regexes of a restored resolver.
+    Each regex is compiled when first accessed.
+
+    Examples:
+
+        >>> regexes = LazyRegexes({'a': ('^a$', 0), 'b': ('^b$', 0)})
+        >>> regexes.get('a').match('a') is not None
+        True
+        >>> regexes.get('c') is None
+        True
+        >>> list(regexes)
+        ['a', 'b']
+    """
+
+    def __init__(self, sources: dict):
+        self._sources = sources  # label: (pattern, flags)
+        self._compiled: dict = {}
+
+    def __getitem__(self, label: str) -> re.Pattern:
+        regex = self._compiled.get(label)
+        if regex is None:
+            pattern, flags = self._sources[label]
+            regex = self._compiled[label] = re.compile(pattern, flags)
+        return regex
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._sources)
+
+    def __len__(self) -> int:
+        return len(self._sources)
+
+
+def resolver_state(resolver: Resolver) -> dict:
+    """
+    Returns the state of the resolva.Resolver, to be saved in the snapshot.
+    The regexes are saved as (pattern, flags) tuples.
+    """
+    state = dict(vars(resolver))
+    state["_regexes"] = {label: (regex.pattern, regex.flags) for label, regex in resolver.get_regexes().items()}
+    return state
+
+
+def restore_resolver(state: dict) -> Resolver:
+    """
+    Recreates a resolva.Resolver from its saved state, without recomputing its regexes,
+    and registers it in the resolva instance cache.
+    """
+    resolver = Resolver.__new__(Resolver)
+    vars(resolver).update(state, _regexes=LazyRegexes(state["_regexes"]))
+    resolver_instances[resolver._id] = resolver
+    return resolver
+
+
+def build_snapshot(path: Optional[str] = None) -> dict:
+    """
+    Computes the configuration snapshot for the current configuration (sid conf and all path configs),
+    and writes it to the given path, or the configured snapshot path.
+    The file is written atomically, so that running processes can read it while it is rebuilt.
+
+    Examples:
+
+        >>> import tempfile
+        >>> from spil import conf
+        >>> path = os.path.join(tempfile.mkdtemp(), 'spil_conf.snapshot')
+        >>> entries = build_snapshot(path)
+        >>> sorted(entries) == sorted(['spil_sid_conf', *conf.path_configs])
+        True
+        >>> read_snapshot(path)['spil_sid_conf'][0] == entries['spil_sid_conf'][0]
+        True
+
+    Args:
+        path: the snapshot file path
+
+    Returns: the snapshot entries, by name
+    """
+    from spil import conf
+    from spil.conf import sid_conf_load
+    from spil.conf import sid_templates, sid_template_index, sid_keyset_index, sid_type_meta  # type: ignore
+    from spil.sid.core.sid_resolver import get_resolver
+    from spil.sid.pathops.pathconfig import get_path_config
+
+    path = path or config_snapshot_path
+    if not path:
+        raise ValueError('No snapshot path given, and no "SPIL_CONF_SNAPSHOT" configured.')
+
+    entries: Dict[str, tuple] = {}
+    sid_data = (
+        sid_templates,
+        sid_template_index,
+        sid_keyset_index,
+        sid_type_meta,
+        resolver_state(get_resolver()),
+    )
+    entries["spil_sid_conf"] = (sid_conf_load.sources_hash, sid_data)  # type: ignore
+
+    for name in conf.path_configs:  # type: ignore
+        config = get_path_config(name)
+        resolver = Resolver.get(config.name)
+        entries[config.name] = (config.sources_hash, resolver_state(resolver))
+
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        pickle.dump({"format": snapshot_format, "fingerprint": code_fingerprint(), "entries": entries}, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, path)
+    info(f'Configuration snapshot written to "{path}" ({", ".join(entries)})')
+
+    return entries
+
+
+if __name__ == "__main__":
+
+    import sys
+    from spil.util.log import setLevel, INFO
+
+    setLevel(INFO)
+    build_snapshot(sys.argv[1] if len(sys.argv) > 1 else None)
@@ -11,13 +11,14 @@ SPIL is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY
 You should have received a copy of the GNU Lesser General Public License along with SPIL.
 If not, see <https://www.gnu.org/licenses/>.
 """
-from typing import Mapping, List, Dict
+from typing import Mapping, List, Dict, Tuple, Optional, FrozenSet, NamedTuple
 
+import re
 import string
 from collections import OrderedDict
 
 from spil.util.log import debug
-from spil.conf import sidtype_keytype_sep
+from spil.conf import sidtype_keytype_sep, sip
 
 
 def get_keys(template):
@@ -158,6 +159,444 @@ def pattern_replacing(sid_templates: Dict[str, str], key_patterns: Dict[str, Dic
         sid_templates[_keytype] = template
 
 
+# same placeholder syntax as resolva.template.construct_regular_expression
+_placeholder_regex = re.compile(r'{(?P<placeholder>.+?)(:(?P<expression>(\\}|.)+?))?}')
+_escaped_char_regex = re.compile(r'\\(\W)')
+_regex_special_regex = re.compile(r'[.^$*+?{}\[\]()|\\]')
+_negated_class_regex = re.compile(r'\[\^[^\]]*\]')
+
+
+def _may_match_separator(expression: str) -> bool:
+    """
+    Returns True if the given regular expression could match a string containing the separator "sip".
+    This is conservative: an expression that cannot be analysed is considered as possibly matching the separator.
+
+    Examples:
+
+        >>> _may_match_separator(r'[^/]*')
+        False
+        >>> _may_match_separator(r'(sq\\d\\d\\d|\\*|\\>)')
+        False
+        >>> _may_match_separator(r'.*')
+        True
+        >>> _may_match_separator(r'\\S+')
+        True
+    """
+    stripped = _negated_class_regex.sub('', expression)
+    if any(s in stripped for s in ('.', r'\S', r'\W', r'\D', sip)):
+        return True
+    try:
+        found = re.search(f'(?:{expression})', sip)
+    except re.error:
+        return True
+    return bool(found and found.group())
+
+
+def _literal_values(expression: str) -> Optional[FrozenSet[str]]:
+    """
+    Returns the set of strings matched by the given regular expression,
+    if it is a plain literal or an alternation of literals, eg. "(a|s|\\*|\\>)".
+    Returns None if the expression is not a simple literal alternation.
+
+    Examples:
+
+        >>> sorted(_literal_values(r'(a|\\*|\\>)'))
+        ['*', '>', 'a']
+        >>> _literal_values(r'(sq\\d\\d\\d|\\*|\\>)') is None
+        True
+    """
+    if expression.startswith('(') and expression.endswith(')'):
+        expression = expression[1:-1]
+    values = set()
+    for alternative in expression.split('|'):
+        if _regex_special_regex.search(_escaped_char_regex.sub('', alternative)):
+            return None
+        values.add(_escaped_char_regex.sub(r'\1', alternative))
+    return frozenset(values)
+
+
+def template_segments(template: str) -> Optional[List[Tuple[Optional[str], Optional[FrozenSet[str]]]]]:
+    """
+    Analyses the given template, segment by segment (segments are separated by "sip").
+
+    Returns a list with a (key, allowed values) tuple per segment:
+    - key is the placeholder name if the segment is a single placeholder, else None.
+    - allowed values is the set of literal values the segment can match, or None if it is not a literal alternation.
+
+    Returns None if the template can match a variable number of segments,
+    for example if a placeholder expression may match the separator.
+
+    Examples:
+
+        >>> [(key, values and sorted(values)) for key, values in template_segments(r'{project}/{type:(s|\\*)}/v{version}')]
+        [('project', None), ('type', ['*', 's']), (None, None)]
+        >>> template_segments(r'{project}/{path:.*}') is None
+        True
+    """
+    placeholders = []
+
+    def replace(match):
+        placeholders.append((match.group('placeholder'), match.group('expression')))
+        return '\x00{}\x00'.format(len(placeholders) - 1)
+
+    tokenized = _placeholder_regex.sub(replace, template)
+
+    for __, expression in placeholders:
+        if expression and _may_match_separator(expression):
+            return None
+
+    segments: List[Tuple[Optional[str], Optional[FrozenSet[str]]]] = []
+    for segment in tokenized.split(sip):
+        parts = segment.split('\x00')
+        literals = parts[0::2]
+        if any(_may_match_separator(literal) for literal in literals if literal):
+            return None
+        if len(parts) == 1:  # literal segment, eg. "a"
+            segments.append((None, _literal_values(segment)))
+        elif len(parts) == 3 and not parts[0] and not parts[2]:  # single placeholder segment, eg. "{type:(a|s)}"
+            key, expression = placeholders[int(parts[1])]
+            segments.append((key, _literal_values(expression) if expression else None))
+        else:
+            segments.append((None, None))
+
+    return segments
+
+
+def template_constraints(template: str) -> Optional[Tuple[int, Tuple[Tuple[int, FrozenSet[str]], ...]]]:
+    """
+    Analyses the given template, to find out which Sid strings it could possibly match without running its regex.
+
+    Returns a tuple with the number of segments (separated by "sip"),
+    and a tuple of (position, allowed values) for each segment that can only contain literal values.
+
+    Returns None if the template can match a variable number of segments,
+    for example if a placeholder expression may match the separator.
+
+    Examples:
+
+        >>> count, constraints = template_constraints(r'{project:(hamlet|\\*|\\>)}/{type:(s|\\*|\\>)}/{sequence:(sq\\d\\d\\d|\\*|\\>)}')
+        >>> count, [(position, sorted(values)) for position, values in constraints]
+        (3, [(0, ['*', '>', 'hamlet']), (1, ['*', '>', 's'])])
+        >>> template_constraints(r'{project}/assets/{asset}')
+        (3, ((1, frozenset({'assets'})),))
+        >>> template_constraints(r'{project}/{path:.*}') is None
+        True
+    """
+    segments = template_segments(template)
+    if segments is None:
+        return None
+    constraints = tuple((position, values) for position, (__, values) in enumerate(segments) if values is not None)
+    return len(segments), constraints
+
+
+def build_template_index(sid_templates: Mapping[str, str]) -> Dict[Optional[int], tuple]:
+    """
+    Builds a dispatch index for the given templates, to quickly find the candidate types for a Sid string.
+
+    Templates are grouped by their number of segments.
+    Each group is stored as a (position, dispatch, default) tuple:
+    "dispatch" maps the literal values found at "position" (the most selective segment) to the matching entries,
+    "default" contains the entries for any other value.
+    Entries are (type, constraints) tuples, in template order.
+    Constraints are (position, allowed values) tuples, as returned by template_constraints().
+
+    Templates that cannot be analysed are added to every group, with no constraints,
+    and are also stored under the None key, used for segment counts not present in the index.
+
+    The lookup is done by get_candidate_types().
+
+    Examples:
+
+        >>> index = build_template_index({'shot': r'{project}/{type:s}', 'asset': r'{project}/{type:a}', 'project': r'{project}'})
+        >>> position, dispatch, default = index[2]
+        >>> position, sorted(dispatch), default
+        (1, ['a', 's'], [])
+        >>> index[1]
+        (None, {}, [('project', ())])
+        >>> index[None]
+        (None, {}, [])
+
+    Args:
+        sid_templates: A dictionary containing sid types (template names) as keys, and templates (path like strings) as values.
+
+    Returns:
+        the index dictionary
+    """
+    analysed = []
+    for _type, template in sid_templates.items():
+        analysed.append((_type, template_constraints(template)))
+
+    groups: Dict[Optional[int], List[Tuple[str, tuple]]] = {found[0]: [] for __, found in analysed if found}
+    groups[None] = []
+
+    for _type, found in analysed:
+        if found:
+            groups[found[0]].append((_type, found[1]))
+        else:
+            debug(f"Template for {_type} cannot be indexed, it will be matched for every Sid.")
+            for entries in groups.values():
+                entries.append((_type, ()))
+
+    index: Dict[Optional[int], tuple] = {}
+    for count, entries in groups.items():
+        index[count] = _dispatch_entries(entries)
+
+    return index
+
+
+def _dispatch_entries(entries: List[Tuple[str, tuple]]) -> tuple:
+    """
+    Chooses the constrained segment position (or key) that best splits the given entries,
+    and returns the (position, dispatch, default) tuple described in build_template_index() and build_keyset_index().
+    """
+    best: tuple = (None, {}, entries)
+    best_cost = len(entries)
+
+    positions = sorted({position for __, constraints in entries for position, __ in constraints})
+    for position in positions:
+        allowed = [dict(constraints).get(position) for __, constraints in entries]
+        default = [entry for entry, values in zip(entries, allowed) if values is None]
+        dispatch = {}
+        for value in set().union(*[values for values in allowed if values is not None]):
+            dispatch[value] = [entry for entry, values in zip(entries, allowed) if values is None or value in values]
+        cost = max([len(default)] + [len(found) for found in dispatch.values()])
+        if cost < best_cost:
+            best, best_cost = (position, dispatch, default), cost
+
+    return best
+
+
+def get_candidate_types(index: Mapping[Optional[int], tuple], sid: str) -> List[str]:
+    """
+    Returns the types whose templates could match the given "sid" string, in template order,
+    using an index built by build_template_index().
+
+    Examples:
+
+        >>> index = build_template_index({'shot': r'{project}/{type:s}', 'asset': r'{project}/{type:a}', 'project': r'{project}'})
+        >>> get_candidate_types(index, 'hamlet/s')
+        ['shot']
+        >>> get_candidate_types(index, 'hamlet/x')
+        []
+        >>> get_candidate_types(index, 'hamlet/s/sq010')
+        []
+
+    Args:
+        index: the dispatch index
+        sid: a Sid string
+
+    Returns:
+        the list of candidate types
+    """
+    parts = sid.split(sip)
+    group = index.get(len(parts)) or index.get(None)
+    if not group:
+        return []
+
+    position, dispatch, default = group
+    entries = default if position is None else dispatch.get(parts[position], default)
+
+    candidates = []
+    for _type, constraints in entries:
+        for position, values in constraints:
+            if parts[position] not in values:
+                break
+        else:
+            candidates.append(_type)
+    return candidates
+
+
+def build_keyset_index(sid_templates: Mapping[str, str]) -> Dict[FrozenSet[str], tuple]:
+    """
+    Builds an index of the templates by their set of keys, to quickly find the candidate types for a fields dictionary.
+
+    The index maps the frozenset of a template's keys to a (key, dispatch, default) tuple:
+    "dispatch" maps the literal values of "key" (the most selective key) to the matching entries,
+    "default" contains the entries for any other value.
+    Entries are (type, constraints) tuples, in template order.
+    Constraints are (key, allowed literal values) tuples, for keys that are a single placeholder segment
+    with a literal alternation (eg. "{type:(a|\\*|\\>)}").
+
+    A fields dictionary can only be formatted by the types of its keyset,
+    whose constraints are satisfied. The lookup is done by get_keyset_candidates().
+
+    Examples:
+
+        >>> index = build_keyset_index({'shot': r'{project}/{type:s}', 'asset': r'{project}/{type:a}', 'project': r'{project}'})
+        >>> key, dispatch, default = index[frozenset(['project', 'type'])]
+        >>> key, dispatch['a'], default
+        ('type', [('asset', (('type', frozenset({'a'})),))], [])
+
+    Args:
+        sid_templates: A dictionary containing sid types (template names) as keys, and templates (path like strings) as values.
+
+    Returns:
+        the index dictionary
+    """
+    groups: Dict[FrozenSet[str], List[Tuple[str, tuple]]] = {}
+    for _type, template in sid_templates.items():
+        keys = frozenset(match.group('placeholder') for match in _placeholder_regex.finditer(template))
+        constraints: Dict[str, FrozenSet[str]] = {}
+        for key, values in template_segments(template) or []:
+            if key and values is not None:
+                constraints[key] = constraints[key] & values if key in constraints else values
+        groups.setdefault(keys, []).append((_type, tuple(constraints.items())))
+
+    return {keys: _dispatch_entries(entries) for keys, entries in groups.items()}
+
+
+def get_keyset_candidates(index: Mapping[FrozenSet[str], tuple], data: Mapping[str, str]) -> List[str]:
+    """
+    Returns the types whose templates could format the given "data" fields, in template order,
+    using an index built by build_keyset_index().
+
+    Examples:
+
+        >>> index = build_keyset_index({'shot': r'{project}/{type:(s|\\*)}', 'asset': r'{project}/{type:(a|\\*)}', 'project': r'{project}'})
+        >>> get_keyset_candidates(index, {'type': 'a', 'project': 'hamlet'})
+        ['asset']
+        >>> get_keyset_candidates(index, {'type': '*', 'project': 'hamlet'})
+        ['shot', 'asset']
+        >>> get_keyset_candidates(index, {'type': 'x', 'project': 'hamlet'})
+        []
+        >>> get_keyset_candidates(index, {'task': 'anim'})
+        []
+
+    Args:
+        index: the keyset index
+        data: a fields dictionary
+
+    Returns:
+        the list of candidate types
+    """
+    group = index.get(frozenset(data))
+    if not group:
+        return []
+
+    key, dispatch, default = group
+    if key is None:
+        entries = default
+    else:
+        value = data[key]
+        entries = dispatch.get(value if value.__class__ is str else str(value), default)
+
+    candidates = []
+    for _type, constraints in entries:
+        for key, values in constraints:
+            value = data[key]
+            if (value if value.__class__ is str else str(value)) not in values:
+                break
+        else:
+            candidates.append(_type)
+    return candidates
+
+
+class SidTypeMeta(NamedTuple):
+    """
+    Metadata of a sid type, derived once from the sid templates (see build_type_meta).
+    """
+    type: str
+    keys: Tuple[str, ...]  # in template order
+    basetype: str
+    keytype: Optional[str]  # last key
+    leaf_key: Optional[str]  # leaf key of the basetype, as configured in leaf_keys
+    segments: int  # amount of "sip" separated segments in the template
+    parent: Optional[str]  # type of the parent, if it is unique
+    children: Tuple[str, ...]  # types having this type as parent
+
+
+def build_type_meta(sid_templates: Mapping[str, str], leaf_keys: Optional[Mapping] = None) -> Dict[str, SidTypeMeta]:
+    """
+    Builds the metadata of each sid type, from the templates.
+
+    The parent of a type is the type whose keys are the type's keys, without the last key.
+    It is only set if a single type has this set of keys,
+    so that a parent Sid can be built without type detection.
+
+    Examples:
+
+        >>> meta = build_type_meta({'shot__sequence': '{project}/{type:s}/{sequence}', 'shot': '{project}/{type:s}', 'project': '{project}'}, {'shot': 'ext'})
+        >>> meta['shot__sequence']
+        SidTypeMeta(type='shot__sequence', keys=('project', 'type', 'sequence'), basetype='shot', keytype='sequence', leaf_key='ext', segments=3, parent='shot', children=())
+        >>> meta['project'].children
+        ('shot',)
+
+    Args:
+        sid_templates: A dictionary containing sid types (template names) as keys, and templates (path like strings) as values.
+        leaf_keys: A dictionary containing the leaf key per basetype.
+
+    Returns:
+        A dictionary with sid types as keys and SidTypeMeta as values.
+    """
+    leaf_keys = leaf_keys or {}
+
+    type_keys = {}
+    types_by_keyset: Dict[FrozenSet[str], List[str]] = {}
+    for _type, template in sid_templates.items():
+        keys = tuple(dict.fromkeys(match.group('placeholder') for match in _placeholder_regex.finditer(template)))
+        type_keys[_type] = keys
+        types_by_keyset.setdefault(frozenset(keys), []).append(_type)
+
+    parents = {}
+    for _type, keys in type_keys.items():
+        found = types_by_keyset.get(frozenset(keys[:-1]), [])
+        if len(keys) > 1 and len(found) == 1 and type_keys[found[0]] == keys[:-1]:
+            parents[_type] = found[0]
+
+    meta = {}
+    for _type, keys in type_keys.items():
+        basetype = _type.split(sidtype_keytype_sep)[0]
+        meta[_type] = SidTypeMeta(
+            type=_type,
+            keys=keys,
+            basetype=basetype,
+            keytype=keys[-1] if keys else None,
+            leaf_key=leaf_keys.get(basetype),
+            segments=_placeholder_regex.sub('', sid_templates[_type]).count(sip) + 1,
+            parent=parents.get(_type),
+            children=tuple(t for t, p in parents.items() if p == _type),
+        )
+    return meta
+
+
+def build_expand_table(sid_type_meta: Mapping[str, SidTypeMeta]) -> Dict[Optional[str], Tuple[Tuple[int, Tuple[str, ...]], ...]]:
+    """
+    Builds the "**" expansion table (see spil.sid.core.utils.expand).
+
+    For each leaf key (as configured per basetype in leaf_keys), lists the candidate types whose last key is the leaf key,
+    grouped by amount of segments, as (segments, types) tuples.
+    The None key lists all types, for the extrapolated expansion.
+
+    Examples:
+
+        >>> meta = build_type_meta({'shot__file': '{project}/{type:s}/{shot}/{ext}', 'shot__shot': '{project}/{type:s}/{shot}', 'shot': '{project}/{type:s}'}, {'shot': 'ext'})
+        >>> table = build_expand_table(meta)
+        >>> table['ext']
+        ((4, ('shot__file',)),)
+        >>> table[None]
+        ((4, ('shot__file',)), (3, ('shot__shot',)), (2, ('shot',)))
+
+    Args:
+        sid_type_meta: the type metadata, see build_type_meta
+
+    Returns:
+        A dictionary with leaf keys (and None) as keys, and (segments, types) tuples as values.
+    """
+    table: Dict[Optional[str], Dict[int, List[str]]] = {None: {}}
+    for meta in sid_type_meta.values():
+        table[None].setdefault(meta.segments, []).append(meta.type)
+        if meta.leaf_key:
+            table.setdefault(meta.leaf_key, {})
+    for leaf_key, by_segments in table.items():
+        if leaf_key is None:
+            continue
+        for meta in sid_type_meta.values():
+            if meta.keytype == leaf_key:
+                by_segments.setdefault(meta.segments, []).append(meta.type)
+
+    return {leaf_key: tuple((segments, tuple(types)) for segments, types in by_segments.items()) for leaf_key, by_segments in table.items()}
+
+
 if __name__ == '__main__':
 
     from pprint import pprint
@@ -0,0 +1,186 @@
+"""
+This file is part of SPIL, The Simple Pipeline Lib.
+
+(C) copyright 2019-2023 Michael Haussmann, spil@xeo.info
+
+SPIL is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option) any later version.
+
+SPIL is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR a PARTICULAR PURPOSE.  See the GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with SPIL.
+If not, see <https://www.gnu.org/licenses/>.
+"""
+"""
+Compact encoding of Sids, used for pickling (eg. to send Sids to other processes with multiprocessing).
+
+A typed Sid is encoded as a tuple of its type id and its field values.
+The type id is the index of the type in the type table (the sid_templates types, in configuration order),
+so it is stable for a given configuration.
+Other Sids (untyped, with an unapplied query, or "lazy" and not yet resolved) are encoded as their uri string.
+
+Decoding formats the Sid string from the values, without type detection.
+Sid.__reduce__ uses this encoding, so that unpickling does not go through the Sid factory.
+
+The values are only meaningful with the same configuration: the type table signature is a hash of the type, keys and template of every type.
+Sid.__reduce__ passes it along with each Sid, and encode_sids once for a list of Sids.
+Decoding checks it, and raises a SpilException if the configuration differs.
+"""
+from typing import Iterable, List, Optional, Tuple, Union
+
+import zlib
+
+from spil.conf import sid_templates, sid_type_meta  # type: ignore
+from spil.sid.sid import Sid
+from spil.sid.core import sid_resolver
+from spil.sid.core.sid_factory import lazy_sid
+from spil.util.exception import SpilException
+
+# Stable per configuration type table: type id -> type, and type -> type id
+type_table: Tuple[str, ...] = tuple(sid_templates)
+type_ids = {_type: i for i, _type in enumerate(type_table)}
+
+# type id -> (type, keys, format string), filled when first decoding
+_decoding_table: List[Tuple[str, Tuple[str, ...], str]] = []
+
+
+def get_signature(table: Iterable[Tuple[str, Tuple[str, ...], str]]) -> int:
+    """
+    Returns the signature of the given type table: a hash of the (type, keys, template) of every type, in order.
+    Encoded values are decoded onto the keys and template of their type id, so all three must be the same.
+
+    Examples:
+
+        >>> table = [('shot__sequence', ('project', 'type', 'sequence'), '{project}/{type:(s)}/{sequence}')]
+        >>> get_signature(table) == get_signature(list(table))
+        True
+        >>> get_signature(table) == get_signature([('shot__sequence', ('project', 'sequence', 'type'), '{project}/{type:(s)}/{sequence}')])
+        False
+        >>> get_signature(table) == get_signature([('shot__sequence', ('project', 'type', 'sequence'), '{project}/{type:(s)}/{sequence}/x')])
+        False
+
+    Args:
+        table: iterable of (type, keys, template) tuples
+
+    Returns:
+        int
+    """
+    return zlib.crc32(repr(tuple(table)).encode())
+
+
+type_table_signature = get_signature((_type, sid_type_meta[_type].keys, sid_templates[_type]) for _type in type_table)
+
+
+def encode_sid(sid: Sid) -> Union[tuple, str]:
+    """
+    Encodes the given Sid into a tuple (type id, values), or its uri string.
+
+    Examples:
+
+        >>> encode_sid(Sid("hamlet/s/sq010")) == (type_ids['shot__sequence'], ('hamlet', 's', 'sq010'))
+        True
+
+        >>> encode_sid(Sid("bla/bla"))
+        'bla/bla'
+
+    Args:
+        sid: a Sid
+
+    Returns:
+        tuple (type id, values) or string
+    """
+    try:
+        _type = object.__getattribute__(sid, "_type")  # does not resolve a "lazy" Sid
+    except AttributeError:
+        return sid.string
+    type_id = type_ids.get(_type)
+    if type_id is None or "?" in sid.string:
+        return sid.uri
+    return type_id, sid._values
+
+
+def decode_sid(data: Union[tuple, str], signature: Optional[int] = None) -> Sid:
+    """
+    Decodes the given data, as encoded by encode_sid, into a Sid.
+
+    If the "signature" of the encoding type table is given, it is checked against the current one.
+    Raises a SpilException if they differ: the Sid was encoded with another sid configuration.
+
+    Examples:
+
+        >>> decode_sid(encode_sid(Sid("hamlet/s/sq010")))
+        Sid('shot__sequence:hamlet/s/sq010')
+
+        >>> decode_sid("bla/bla")
+        Sid('bla/bla')
+
+        >>> decode_sid(encode_sid(Sid("hamlet/s/sq010")), type_table_signature + 1)
+        Traceback (most recent call last):
+        ...
+        spil.util.exception.SpilException: [SpilException] [sid_codec] The Sid was encoded with another sid configuration (type table mismatch).
+
+    Args:
+        data: tuple (type id, values) or string
+        signature: the type table signature of the encoding configuration, or None to skip the check
+
+    Returns:
+        Sid
+    """
+    if isinstance(data, str):
+        return lazy_sid(data)
+
+    if signature is not None and signature != type_table_signature:
+        raise SpilException("[sid_codec] The Sid was encoded with another sid configuration (type table mismatch).")
+
+    if not _decoding_table:
+        r = sid_resolver.get_resolver()
+        _decoding_table.extend((_type, sid_type_meta[_type].keys, r.get_format_for(_type)) for _type in type_table)
+
+    type_id, values = data
+    _type, keys, template = _decoding_table[type_id]
+    fields = dict(zip(keys, values))
+    new_sid = Sid(from_factory=True)
+    new_sid._init(string=template.format_map(fields), type=_type, fields=fields)
+    return new_sid
+
+
+def encode_sids(sids: Iterable[Sid]) -> tuple:
+    """
+    Encodes the given Sids, with the type table signature.
+
+    Args:
+        sids: iterable of Sids
+
+    Returns:
+        tuple (type table signature, list of encoded Sids)
+    """
+    return type_table_signature, [encode_sid(sid) for sid in sids]
+
+
+def decode_sids(data: tuple) -> List[Sid]:
+    """
+    Decodes Sids encoded by encode_sids.
+
+    Raises a SpilException if the Sids were encoded with another configuration (another type table).
+
+    Examples:
+
+        >>> decode_sids(encode_sids([Sid("hamlet/s/sq010"), Sid("hamlet/a/char/ophelia")]))
+        [Sid('shot__sequence:hamlet/s/sq010'), Sid('asset__asset:hamlet/a/char/ophelia')]
+
+    Args:
+        data: tuple (type table signature, list of encoded Sids)
+
+    Returns:
+        list of Sids
+    """
+    signature, encoded = data
+    if signature != type_table_signature:
+        raise SpilException("[sid_codec] The Sids were encoded with another sid configuration (type table mismatch).")
+    return [decode_sid(item) for item in encoded]
+
+
+if __name__ == "__main__":
+
+    import doctest
+
+    doctest.testmod()
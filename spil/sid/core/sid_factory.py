@@ -11,9 +11,10 @@ You should have received a copy of the GNU Lesser General Public License along w
 If not, see <https://www.gnu.org/licenses/>.
 """
 from __future__ import annotations
-from typing import Optional
+from typing import Optional, Iterable, Iterator
 import os
 
+from spil import conf
 from spil.sid.sid import Sid
 from spil.util.caching import lru_cache
 
@@ -21,8 +22,9 @@ from spil.util.log import info, warning, debug
 from spil.sid.core import sid_resolver
 from spil.sid.core.query_helper import apply_query
 from spil.sid.pathops import fs_resolver
+from spil.sid.pathops.pathconfig import get_path_config
 
-@lru_cache
+@lru_cache(subsystem="sid")
 def sid_to_sid(sid: str | Sid) -> Sid:
     """
     Creates a Sid from the given Sid object or string.
@@ -63,6 +65,43 @@ def sid_to_sid(sid: str | Sid) -> Sid:
         return new_sid
 
 
+def lazy_sid(sid: str | Sid) -> Sid:
+    """
+    Creates a "lazy" Sid from the given string: the Sid only holds its string,
+    and is resolved when typed information (type, fields, uri, path...) is first needed.
+
+    This is useful for Sids that are only passed along, compared or printed.
+    A Sid object is returned as is, and uris or strings containing a query are resolved immediately.
+
+    Examples:
+
+        >>> sid = lazy_sid("hamlet/s/sq010")
+        >>> str(sid), sid == "hamlet/s/sq010"
+        ('hamlet/s/sq010', True)
+
+        >>> sid.type
+        'shot__sequence'
+
+        >>> lazy_sid("bla/bla")
+        Sid('bla/bla')
+
+    Args:
+        sid: a Sid string
+
+    Returns: a Sid object
+    """
+    if isinstance(sid, Sid):
+        return sid
+
+    string = str(sid)
+    if "?" in string or ":" in string:
+        return sid_to_sid(string)
+
+    new_sid = Sid(from_factory=True)
+    new_sid._init_lazy(string)
+    return new_sid
+
+
 def dict_to_sid(fields: dict) -> Sid | None:
     """
     Creates a Sid from a given Fields dictionary.
@@ -73,27 +112,68 @@ def dict_to_sid(fields: dict) -> Sid | None:
     Returns: Sid object
 
     """
-    # TODO: make a fast version when the fields comes from an internal trusted and already typed call.
-
     debug(f"Starting with: {fields}")
 
-    _type = sid_resolver.dict_to_type(fields)  # FIXME: terrible code
-    if not _type:
+    found = sid_resolver.dict_to_types(fields)
+    if not found:
         warning(f'Fields did not resolve to valid Sid type. fields: "{fields}"')
         return None
 
-    # Now getting sid and ordered dict
-    sid = sid_resolver.dict_to_sid(fields, _type)
+    # the first type is used. Its string is already formatted and checked by resolving back.
+    _type, string = next(iter(found.items()))
+    new_sid = typed_dict_to_sid(_type, fields, string=string)
+    if not new_sid:
+        warning(f"Fields {fields} did not match the keys of type {_type}. Check the config.")
+        return None
 
-    # TODO: this next line could be just a dict sorting ?
-    type, fields = sid_resolver.sid_to_dict(sid, _type)  # check if type == _type ?
+    return new_sid
 
-    if not fields:
-        warning(f"After resolving back from Sid {sid}, Fields are empty. Check the config.")
+
+def typed_dict_to_sid(_type: str, fields: dict, check: bool = False, string: Optional[str] = None) -> Sid | None:
+    """
+    Creates a Sid from a type and a Fields dictionary, coming from a trusted source.
+    This is a fast internal constructor: the Sid string is formatted once, without type detection.
+    The fields are ordered by the type's keys.
+
+    If "check" is True, the Sid string is resolved back once, to ensure that it matches the type.
+    Else the caller is trusted for this.
+    If the Sid "string" is given (already formatted by the caller), it is not formatted again.
+
+    Returns None if the fields keys do not match the type, or if the check fails.
+
+    Examples:
+
+        >>> typed_dict_to_sid('shot__sequence', {'type': 's', 'sequence': 'sq010', 'project': 'hamlet'})
+        Sid('shot__sequence:hamlet/s/sq010')
+
+        >>> typed_dict_to_sid('shot__sequence', {'type': 's', 'project': 'hamlet'})
+
+        >>> typed_dict_to_sid('shot__sequence', {'type': 's', 'sequence': 'bla', 'project': 'hamlet'}, check=True)
+
+    Args:
+        _type: a Sid type
+        fields: a Sid fields dictionary, matching the given type
+        check: if True, the resulting Sid string is checked against the type template
+        string: the Sid string, if already formatted
+
+    Returns: Sid object, or None
+    """
+    keys = sid_resolver.get_type_keys(_type)
+    if len(keys) != len(fields):
+        return None
+    try:
+        ordered = {key: fields[key] for key in keys}
+    except KeyError:
+        return None
+
+    r = sid_resolver.get_resolver()
+    string = string or r.get_format_for(_type).format(**ordered)
+    if check and not r.resolve_one(string, _type):
+        debug(f'Check failed for "{string}" ({_type})')
         return None
 
     new_sid = Sid(from_factory=True)
-    new_sid._init(string=sid, type=_type, fields=fields)
+    new_sid._init(string=string, type=_type, fields=ordered)
     return new_sid
 
 
@@ -116,16 +196,103 @@ def path_to_sid(path: str | os.Pathlike[str], config: Optional[str]) -> Sid | No
         return None
 
     # Now getting sid
-    resolved_sid = sid_resolver.dict_to_sid(fields, _type)
-    if not resolved_sid:
+    new_sid = typed_dict_to_sid(_type, fields, check=True)
+    if not new_sid:
         info('Path "{}" did resolve to fields {}, but not back to Sid'.format(path, fields))
         return None
 
-    new_sid = Sid(from_factory=True)
-    new_sid._init(string=resolved_sid, type=_type, fields=fields)
     return new_sid
 
 
+def sids_from_strings(sids: Iterable[str | Sid]) -> Iterator[Sid]:
+    """
+    Creates Sids from the given Sid objects or strings.
+    Batch version of sid_to_sid, to create large amounts of Sids.
+
+    The result is the same as calling `Sid(sid)` for each item, but the per item overhead is reduced:
+    plain strings are resolved by sid_resolver.sid_to_dict without going through its cache,
+    and repeated strings are resolved only once (the same Sid instance is returned).
+
+    Strings containing a query or a type (uri) are handled by sid_to_sid.
+    If conf.lazy_sids is True, strings are turned into lazy Sids (see lazy_sid), as with `Sid(sid)`.
+
+    Examples:
+
+        >>> list(sids_from_strings(['hamlet/s/sq010', 'asset__asset:hamlet/a/char/ophelia', 'hamlet/s/sq010', 'bla']))
+        [Sid('shot__sequence:hamlet/s/sq010'), Sid('asset__asset:hamlet/a/char/ophelia'), Sid('shot__sequence:hamlet/s/sq010'), Sid('bla')]
+
+    Args:
+        sids: an iterable of Sid objects or strings
+
+    Returns: a generator of Sid objects
+    """
+    resolve = sid_resolver.sid_to_dict.__wrapped__  # repeated strings are already handled here
+    created: dict[str, Sid] = {}
+
+    for sid in sids:
+        string = sid.uri if isinstance(sid, Sid) else str(sid)
+
+        new_sid = created.get(string)
+        if new_sid is None:
+            if conf.lazy_sids and not isinstance(sid, Sid):
+                new_sid = lazy_sid(string)
+            elif "?" in string or ":" in string:
+                new_sid = sid_to_sid(string)
+            else:
+                _type, fields = resolve(string)
+                new_sid = Sid(from_factory=True)
+                new_sid._init(string=string, type=_type, fields=fields)
+            created[string] = new_sid
+
+        yield new_sid
+
+
+def sids_from_paths(paths: Iterable[str | os.Pathlike[str]], config: Optional[str] = None) -> Iterator[Sid]:  # type: ignore  # (Problem with os.Pathlike)
+    """
+    Creates Sids from the given paths.
+    Batch version of path_to_sid, to create large amounts of Sids.
+
+    The result is the same as calling `Sid(path=path, config=config)` for each item:
+    a path that does not resolve returns an empty Sid.
+    The path config is fetched once, and repeated paths are resolved only once.
+
+    Examples:
+
+        >>> from pathlib import Path
+        >>> from spil import conf
+        >>> root = Path(conf.default_sid_conf_data_path) / "testing/SPIL_PROJECTS/LOCAL/PROJECTS/HAMLET/PROD/ASSETS/char/ophelia"
+        >>> list(sids_from_paths([root / "model/v001/char_ophelia_model_WORK_v001.ma", root / "model", "/not/a/sid/path"], config="local"))
+        [Sid('asset__file:hamlet/a/char/ophelia/model/v001/w/ma'), Sid('asset__task:hamlet/a/char/ophelia/model'), Sid('')]
+
+    Args:
+        paths: an iterable of paths
+        config: config name for the path resolving
+
+    Returns: a generator of Sid objects
+    """
+    config = get_path_config(config).name
+    created: dict[str, Sid] = {}
+
+    for path in paths:
+        path = str(path)
+
+        new_sid = created.get(path)
+        if new_sid is None:
+            _type, fields = fs_resolver.path_to_dict(path, config=config)
+            if fields:
+                new_sid = typed_dict_to_sid(_type, fields, check=True)
+                if not new_sid:
+                    info('Path "{}" did resolve to fields {}, but not back to Sid'.format(path, fields))
+            else:
+                info(f"Path [{path}] did not resolve to valid Sid fields (config_name:{config}.")
+            if not new_sid:
+                new_sid = Sid(from_factory=True)
+                new_sid._init()
+            created[path] = new_sid
+
+        yield new_sid
+
+
 # @lru_kw_cache
 def sid_factory(
     sid: Optional[str] = None,
@@ -159,7 +326,7 @@ def sid_factory(
     debug(f"sid_factory start: {sid} - {query} - {fields} - {path} - {config}")
     result = None
     if sid:
-        result = sid_to_sid(sid)
+        result = lazy_sid(sid) if conf.lazy_sids and isinstance(sid, str) else sid_to_sid(sid)
 
     elif query:
         result = sid_to_sid(f"?{query}")
@@ -13,22 +13,66 @@ from __future__ import annotations
 from typing import Tuple, List, Optional
 
 from resolva import Resolver
+from resolva.resolver import instance_cache as resolver_instances  # type: ignore
 
-from spil.util.caching import lru_kw_cache as cache
+from spil.util.caching import lru_kw_cache as cache, register_cache
+from spil.conf.util import get_candidate_types as get_candidate_types_from_index, get_keyset_candidates
 from spil.util.log import debug, info
 from spil.util.exception import SpilException, raiser
 
 # sid conf
 from spil.conf import key_types, sidtype_keytype_sep  # type: ignore
-from spil.conf import sip, sid_templates  # type: ignore
+from spil.conf import sip, sid_templates, sid_template_index, sid_keyset_index, sid_type_meta  # type: ignore
 
 """
 Sid resolver
 Transforms the sid string into a valid sid dict, and reverse.
 """
 
+# the resolva caches (functools.lru_cache), shared by the sid and path resolvers.
+# They do not check the config generation, bump_config_generation clears them.
+for _method in (Resolver.resolve_first, Resolver.resolve_one, Resolver.resolve_all):
+    register_cache(_method, "resolver", name=f"resolva.Resolver.{_method.__name__}")
 
-@cache
+
+def get_resolver() -> Resolver:
+    """
+    Returns the "sid" resolva.Resolver instance.
+    It is created from the sid templates on first use, instead of at config load, to keep "import spil" fast.
+
+    Examples:
+
+        >>> get_resolver() is get_resolver()
+        True
+
+    Returns: the resolva.Resolver with id "sid"
+    """
+    return resolver_instances.get("sid") or Resolver("sid", sid_templates, check_duplicate_placeholders=False)
+
+
+def get_candidate_types(sid: str) -> List[str]:
+    """
+    Returns the sid types whose templates could match the given "sid" string, in template order.
+    Uses the "sid_template_index" built at config load, to avoid running every template regex.
+
+    Only the returned types need to be resolved, others can not match.
+
+    Examples:
+
+        >>> get_candidate_types('hamlet/s/sq010')
+        ['shot__sequence']
+        >>> get_candidate_types('hamlet/*/*')
+        ['asset__assettype', 'shot__sequence']
+
+    Args:
+        sid: a Sid string
+
+    Returns: the list of candidate types
+    """
+    return get_candidate_types_from_index(sid_template_index, sid)
+
+
+@cache(subsystem="sid")
 def sid_to_dict(sid: str, _type: Optional[str] = None) -> Tuple[str, dict] | Tuple[None, None]:
     """
     Parses a given "sid" string using the existing spil_sid_config templates.
@@ -36,6 +80,8 @@ def sid_to_dict(sid: str, _type: Optional[str] = None) -> Tuple[str, dict] | Tup
     Else, all templates are parsed, and the first matching result is returned.
     This is the normal usage (as opposed to sid_to_dicts which returns all possible results).
 
+    Only the candidate templates returned by get_candidate_types are parsed.
+
     Returns a tuple with the type and the resolved data dict.
     If the parsing failed (no template matching) returns a (None, None) tuple.
 
@@ -47,21 +93,21 @@ def sid_to_dict(sid: str, _type: Optional[str] = None) -> Tuple[str, dict] | Tup
 
     Returns: a tuple with the type and the resolved data dict.
     """
-    r = Resolver.get("sid")
+    r = get_resolver()
 
     if _type:
         data = r.resolve_one(sid, _type)
-        template = _type
-    else:
-        template, data = r.resolve_first(sid)
+        return (_type, data) if data else (None, None)
 
-    if not data:
-        return None, None
+    for candidate in get_candidate_types(sid):
+        data = r.resolve_one(sid, candidate)
+        if data:
+            return candidate, data
 
-    return template, data
+    return None, None
 
 
-@cache
+@cache(subsystem="sid")
 def sid_to_dicts(sid: str) -> dict[str, dict]:
     """
     Parses a given "sid" using the existing spil_sid_config templates.
@@ -73,7 +119,7 @@ def sid_to_dicts(sid: str) -> dict[str, dict]:
 
     If no match is found, an empty dict is returned.
 
-    This function wraps resolva.Resolver.resolve_all.
+    This function wraps resolva.Resolver.resolve_one, called for each candidate type (see get_candidate_types).
 
     Args:
         sid: a Sid string
@@ -82,9 +128,14 @@ def sid_to_dicts(sid: str) -> dict[str, dict]:
         a dictionary containing types as keys and resolved data as values.
 
     """
-    r = Resolver.get("sid")
+    r = get_resolver()
 
-    return r.resolve_all(sid)
+    result = {}
+    for candidate in get_candidate_types(sid):
+        data = r.resolve_one(sid, candidate)
+        if data:
+            result[candidate] = data
+    return result
 
 
 def dict_to_sid(data: dict, _type: Optional[str] = None) -> str:
@@ -104,7 +155,7 @@ def dict_to_sid(data: dict, _type: Optional[str] = None) -> str:
     if not data:
         raise SpilException("[dict_to_sid] Data is empty")
 
-    r = Resolver.get("sid")
+    r = get_resolver()
 
     if _type:
         result = r.format_one(data, _type)
@@ -114,6 +165,68 @@ def dict_to_sid(data: dict, _type: Optional[str] = None) -> str:
     return result or ""
 
 
+def get_type_keys(_type: str) -> Tuple[str, ...]:
+    """
+    Returns the keys of the given sid type, in template order.
+    Returns an empty tuple if the type does not exist.
+
+    Examples:
+
+        >>> get_type_keys('shot__task')
+        ('project', 'type', 'sequence', 'shot', 'task')
+
+        >>> get_type_keys('not_a_type')
+        ()
+
+    Args:
+        _type: a Sid type name
+
+    Returns: tuple of keys
+    """
+    meta = sid_type_meta.get(_type)
+    return meta.keys if meta else ()
+
+
+def dict_to_types(data: dict) -> dict[str, str]:
+    """
+    Returns the sid types matching the given dict "data", with the resulting Sid strings.
+    "data" can be unsorted.
+
+    Only the candidate types for the data keys (and literal values) are looked up, using the "sid_keyset_index".
+    For each candidate, the data is formatted and checked by resolving back.
+
+    Multiple matching types may be a sign for a configuration problem.
+    It is logged using debug('Sid multitypes for  =>')
+
+    Examples:
+
+        >>> dict_to_types({'project': 'hamlet', 'type': 's', 'sequence': 'sq010'})
+        {'shot__sequence': 'hamlet/s/sq010'}
+
+    Args:
+        data: a data dictionary with Sid fields
+
+    Returns: a dictionary with matching types as keys and Sid strings as values, in template order.
+    """
+    r = get_resolver()
+    found = {}
+    for candidate in get_keyset_candidates(sid_keyset_index, data):
+        formatted = r.get_format_for(candidate).format(**data)
+        if r.resolve_one(formatted, candidate):
+            found[candidate] = formatted
+        else:
+            debug(f'reverse check failed on "{formatted}" ({candidate})')
+
+    if not found:
+        info("No type found for {}".format(data))
+        return {}
+
+    if len(found) > 1:
+        debug("Sid multitypes for  => {} // {}".format(data, list(found.keys())))
+
+    return found
+
+
 def dict_to_type(data: dict, all: bool = False) -> str | List[str]:
     """
     Retrieves the sid types for the given dict "data".
@@ -126,9 +239,9 @@ def dict_to_type(data: dict, all: bool = False) -> str | List[str]:
     Multiple matching types may be a sign for a configuration problem.
     It is logged using debug('Sid multitypes for  =>')
 
-    The types are found by calling resolva.Resolver.format_all.
-    Note that we always use "format_all".
-    Even if "all" is False, we do not use "format_first".
+    The types are found by calling dict_to_types.
+    Note that we always look up all types.
+    Even if "all" is False, we do not stop at the first match.
     Because we want to log that multiple types where found.
 
     Args:
@@ -137,17 +250,11 @@ def dict_to_type(data: dict, all: bool = False) -> str | List[str]:
 
     Returns: the type or types resolved from the given data dictionary.
     """
-
-    r = Resolver.get("sid")
-    found = list(r.format_all(data).keys())
+    found = list(dict_to_types(data).keys())
 
     if not found:
-        info("No type found for {}".format(data))
         return ""
 
-    if len(found) > 1:
-        debug("Sid multitypes for  => {} // {}".format(data, found))
-
     if all:
         return found
     else:
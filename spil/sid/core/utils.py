@@ -11,14 +11,13 @@ You should have received a copy of the GNU Lesser General Public License along w
 If not, see <https://www.gnu.org/licenses/>.
 """
 from __future__ import annotations
-import string
-
 from typing import List, Iterable
 
 from spil.util.log import info, debug
 from spil.util.exception import SpilException
-from spil.conf import sid_templates, leaf_keys  # type: ignore
-from spil.sid.core.sid_resolver import sid_to_dicts
+from spil.conf import sid_type_meta, sid_expand_table  # type: ignore
+from spil.sid.core.sid_resolver import sid_to_dicts, get_resolver
+from spil.sid.core.sid_factory import typed_dict_to_sid
 from spil import Sid
 from spil.util.caching import lru_cache as cache
 
@@ -36,6 +35,8 @@ def extrapolate(sids: Iterable[str], as_sid: bool = False) -> Iterable[str | Sid
     This is a pure string operation.
 
     Is as_sid is True, returns Sids instead of strings (the default). Sids are a bit slower.
+    The parent Sids are then built from the type metadata (Sid.parent) if they match the extrapolated string,
+    to avoid typing each string.
 
     :param as_sid: if we want the returned values to be Sids, instead of strings.
     :param sids: generator
@@ -54,7 +55,8 @@ def extrapolate(sids: Iterable[str], as_sid: bool = False) -> Iterable[str | Sid
 
         generated.add(sid)
         if as_sid:
-            yield Sid(sid)
+            current = Sid(sid)
+            yield current
         else:
             yield sid
 
@@ -67,7 +69,9 @@ def extrapolate(sids: Iterable[str], as_sid: bool = False) -> Iterable[str | Sid
                 generated.add(new_sid)
                 # print(new_sid)
                 if as_sid:
-                    yield Sid(new_sid)
+                    parent = current.parent if current else Sid()
+                    current = parent if parent.string == new_sid else Sid(new_sid)
+                    yield current
                 else:
                     yield new_sid
 
@@ -102,11 +106,10 @@ def expand(sid: str | Sid, do_extrapolate: bool = False) -> List[Sid]:
     We get the roots basetype ("asset", or "shot", etc) and deduce the "leaf" key.
     The leaf key is the last key we look up.
 
-    - Then we look up all existing types (sid_templates).
-    For each type, we get the amount of keys, and replace "/**" by "/*" x the amount of keys.
-    That gives us a test sid, that we use to instantiate valid sids, using all possible templates again.
-
-    - we continue with all the types we have not already tested.
+    - Then we look up the candidate types in the expand table (built at config load, see conf.util.build_expand_table):
+    the types whose last key is the leaf key (or all types, if do_extrapolate is True), by amount of segments.
+    For each amount of segments, we replace "/**" by the needed amount of "/*".
+    That gives us a test sid, that is resolved with the candidate types templates only.
 
     :param sid: string (or sid)
     :param do_extrapolate: boolean
@@ -130,61 +133,46 @@ def expand(sid: str | Sid, do_extrapolate: bool = False) -> List[Sid]:
         query = ""
 
     root = sid.split("/**")[0]
-    basetype = Sid(root).basetype
+    root_meta = sid_type_meta.get(Sid(root).type)
+    basetype = root_meta.basetype if root_meta else None
     debug("Basetype: {}".format(basetype))
     if not basetype:
         raise SpilException(
             f'The Search Sids "{sid}" root "{root}" cannot be typed, so it cannot be expanded. This is probably a configuration error.'
         )
 
-    leaf_key = leaf_keys.get(basetype)
+    leaf_key = root_meta.leaf_key
     # leaf_key = 'version'  # TODO: find an option to edit this depending on the Finder.
     if not do_extrapolate and not leaf_key:
         raise SpilException(
             f'Leaf key not defined for basetype: "{basetype}". Please check config.'
         )
 
-    tested = []
-    found = []
+    # candidate types by amount of segments, precomputed at config load (see conf.util.build_expand_table)
+    r = get_resolver()
+    candidates = sid_expand_table[None if do_extrapolate else leaf_key]
+    current = sid.count("/")
+
     result = []
-    for key, template in sid_templates.items():
-        debug("Checking " + key)
-        if key in found:
-            debug(".. Already checked {}, continue".format(key))
-            continue
-        debug(f'.. Checking key "{key}"')
-        keys = list(string.Formatter().parse(template))
-        if do_extrapolate or keys[-1][1] == leaf_key:
-            count = len(keys) - 1
-            current = sid.count("/")
-            needed = count - current + 1
-            test = sid.replace("/**", "/*" * needed)
-            if test in tested:
-                debug("... Already tested, continue")
+    for segments, types in candidates:
+        test = sid.replace("/**", "/*" * (segments - current))
+        debug("... Filled {} segments --> {}".format(segments, test))
+        for __type in types:
+            data = r.resolve_one(test, __type)
+            if not data:
                 continue
+            debug(".... found :" + __type)
+            if query:
+                new_sid = Sid("{}:{}?{}".format(__type, test, query))
             else:
-                tested.append(test)
-            debug("... Filled {}x* --> {}".format(needed, test))
-            matching = sid_to_dicts(test)
-            debug("... Got {}".format(matching))
-            for __type, data in matching.items():
-                debug(".... found :" + __type)
-                found.append(__type)
-                if data and (do_extrapolate or (list(data)[-1] == leaf_key)):
-                    if query:
-                        new_sid = Sid("{}:{}?{}".format(__type, test, query))
-                    else:
-                        new_sid = Sid(__type + ":" + test)
-                    debug(".... appending: {}".format(new_sid.uri))
-                    result.append(new_sid)
-        else:
-            debug('.. Type "{}" is not a leaf, and do_extrapolate is False, skipped.'.format(key))
-            continue
+                new_sid = typed_dict_to_sid(__type, data, string=test)
+            debug(".... appending: {}".format(new_sid.uri))
+            result.append(new_sid)
 
     return sorted(list(set(result)))
 
 
-@cache
+@cache(subsystem="search")
 def simple_typing(sid: str | Sid) -> List[Sid]:
     """
     Takes a given sid string (or Sid), typically containing search symbols, and returns a list of typed Sids.
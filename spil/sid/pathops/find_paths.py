@@ -10,7 +10,6 @@ You should have received a copy of the GNU Lesser General Public License along w
 If not, see <https://www.gnu.org/licenses/>.
 """
 from __future__ import annotations
-from collections import defaultdict
 from typing import Iterator, List, Set, Optional
 
 import os
@@ -19,6 +18,7 @@ import glob
 from spil import Sid
 from spil import conf
 from spil.sid.pathops.pathconfig import get_path_config
+from spil.sid.pathops.traversal import TraversalTree, has_magic
 from spil.sid.read.finders.find_glob import FindByGlob
 from spil.util.exception import SpilException
 from spil.util.log import warn, debug, error
@@ -81,13 +81,87 @@ class FindInPaths(FindByGlob):
 
         yield from generator
 
+    def get_search_pattern(self, search: Sid) -> str:
+        """
+        Returns the glob pattern of the search Sid: its path, with the config's search path mapping applied.
+        Returns an empty string if the search Sid does not resolve to a path.
+        """
+        pattern = str(search.path(self.config_name) or "")
+        for key, value in self.conf.search_path_mapping.items():
+            pattern = pattern.replace(key, value)
+        return pattern.replace(os.sep, "/")
+
+    def sorted_candidates(self, search_sid: Sid, is_first: bool = False) -> Iterator[str]:
+        """
+        Returns the candidate matches of a sorted search sid (see FindByGlob.sorted_search),
+        with the sorted key pushed down into the file system walk.
+
+        The directory level of the sorted key is listed, and the entries are sorted
+        (descending for ">" (last), ascending for "<" (first)).
+        The entries are searched one after the other, until one has matches below.
+        Only these matches are returned, for each parent of the sorted level.
+
+        This applies if the path segment of the sorted key ends with the sign, after a literal prefix (eg. ">", "sq010_>"),
+        so that the entries sort like the key values.
+        Else, and for file sequence searches, all the matches are returned (see FindByGlob.sorted_candidates).
+
+        :param search_sid: a typed search Sid, containing ">" or "<"
+        :param is_first: True if the first matches are searched ("<"), False for the last (">")
+        :return: an iterator of sid strings
+        """
+        sign = "<" if is_first else ">"
+        pattern = self.get_search_pattern(search_sid) if search_sid.get("frame") != "*" else ""  # FIXME: hardcoded "frame"
+        parts = pattern.split("/")
+        index = next((i for i, part in enumerate(parts) if sign in part), None)
+        prefix = parts[index][:-1] if index else ""
+        if not index or not parts[index].endswith(sign) or has_magic(prefix) or ">" in prefix or "<" in prefix:
+            yield from super().sorted_candidates(search_sid, is_first)
+            return
+
+        head = "/".join(parts[:index])
+        rest = "/".join(parts[index + 1:]).replace(">", "*").replace("<", "*")
+        debug(f"Sorted search pushed down: {head} / {prefix}{sign} / {rest}")
+
+        for parent in glob.glob(head) if has_magic(head) else [head]:
+            try:
+                with os.scandir(parent) as it:
+                    names = [entry.name for entry in it if entry.name.startswith(prefix) and (not rest or entry.is_dir())]
+            except OSError:
+                continue
+            if not prefix.startswith("."):  # hidden entries, as in glob
+                names = [name for name in names if name[0] != "."]
+            for name in sorted(names, reverse=not is_first):
+                if name == prefix:
+                    continue
+                candidate = f"{parent}/{name}"
+                paths = glob.glob(f"{candidate}/{rest}") if rest else [candidate]
+                found = [sid for sid in (self._path_to_sid(path, search_sid) for path in paths) if sid]
+                if found:
+                    yield from found
+                    break
+
+    def _path_to_sid(self, path: str, search: Sid) -> Optional[str]:
+        # the sid string of the found path, if it has the search type
+        path = path.replace(os.sep, "/")
+        try:
+            sid = Sid(path=path, config=self.config_name)
+        except SpilException:
+            debug(f"Path did not generate sid: {path}")
+            return None
+        if not sid or sid.type != search.type:
+            debug(f"Path did not generate sid of type {search.type}: {path}")
+            return None
+        return str(sid)
+
     def star_search_simple(
         self, search_sids: List[Sid], as_sid: bool = False
     ) -> Iterator[Sid] | Iterator[str]:
         """
         Star search without file sequence handline.
 
-        Uses Glob.
+        The glob patterns of all search sids are merged into a TraversalTree,
+        so that directories shared by several searches are listed once.
+        Each found path is tested against the searches that matched it.
 
         :param search_sids:
         :param as_sid:
@@ -95,10 +169,7 @@ class FindInPaths(FindByGlob):
         """
         debug("Starting star_search_simple")
 
-        # doublon detection
-        searched: dict[str, list] = defaultdict(list)  # already searched patterns by sid type
-        found_paths = set()
-
+        tree = TraversalTree()
         for search_sid in search_sids:
 
             debug('Starting search:  "{}"'.format(repr(search_sid)))
@@ -106,51 +177,41 @@ class FindInPaths(FindByGlob):
             search = search_sid  # TODO: handle also strings ?
 
             debug("Search : {}".format(search))
-            pattern = str(search.path(self.config_name))
+            pattern = self.get_search_pattern(search)
 
             if not pattern:
                 warn("Search sid {} did not resolve to a path. Cancelled.".format(search))
                 continue
 
-            for key, value in self.conf.search_path_mapping.items():
-                pattern = pattern.replace(key, value)
-
             debug(f"Search pattern: {pattern}")
-            if pattern in searched.get(search.type, []):
+            # doublon detection: a pattern is searched once per sid type
+            tree.add(pattern, search, key=search.type)
+
+        for path, searches in tree.walk():
+            path = path.replace(os.sep, "/")
+            try:
+                sid = Sid(path=path, config=self.config_name)
+                debug(f"found {sid}")
+            except SpilException as e:
+                debug(f"Path did not generate sid: {path}")
+                continue
+            if not sid:
+                debug(f"Path did not generate sid: {path}")
+                continue
+            if not any(sid.type == search.type for search in searches):
+                warn(
+                    f"Found Sid and search have different types. "
+                    f'Consider narrowing the pattern, or implementing "typed_search_narrowing".'
+                    f"Found: {sid.uri} -- Search: {searches[0].uri}"
+                )
                 continue
+
+            if as_sid:
+                yield sid
             else:
-                searched[search.type].append(pattern)
-
-            debug(f"Now searching pattern: {pattern}")
-            found = glob.glob(pattern)
-            debug("found")
-            debug(found)
-            for path in found:
-                path = path.replace(os.sep, "/")
-                if path in found_paths:
-                    continue
-                try:
-                    sid = Sid(path=path, config=self.config_name)
-                    debug(f"found {sid}")
-                    if sid.type != search.type:
-                        warn(
-                            f"Found Sid and search have different types. "
-                            f'Consider narrowing the pattern, or implementing "typed_search_narrowing".'
-                            f"Found: {sid.uri} -- Search: {search.uri}"
-                        )
-                        continue
-                except SpilException as e:
-                    debug(f"Path did not generate sid: {path}")
-                    continue
-                if not sid:
-                    debug(f"Path did not generate sid: {path}")
-                    continue
+                yield str(sid)
 
-                found_paths.add(path)
-                if as_sid:
-                    yield sid
-                else:
-                    yield str(sid)
+        debug(f"Searched with {tree.listings} directory listings and {tree.checks} existence checks")
 
     def star_search_framed(
         self, search_sids: List[Sid], as_sid: bool = False
@@ -11,7 +11,7 @@ You should have received a copy of the GNU Lesser General Public License along w
 If not, see <https://www.gnu.org/licenses/>.
 """
 from __future__ import annotations
-from typing import Tuple, Optional
+from typing import Tuple, Optional, Mapping
 
 import os
 from pathlib import Path
@@ -35,7 +35,7 @@ Path <-> dict translation
 """
 
 
-@cache
+@cache(subsystem="path")
 def path_to_dict(
     path: str | os.PathLike[str], _type: Optional[str] = None, config: Optional[str] = None
 ) -> Tuple[str, dict] | Tuple[None, None]:
@@ -101,7 +101,7 @@ def path_to_dict(
     return template, ordered
 
 
-def dict_to_path(data: dict, _type: Optional[str] = None, config: Optional[str] = None) -> Path:
+def dict_to_path(data: Mapping, _type: Optional[str] = None, config: Optional[str] = None) -> Path:
     """
     Resolves the given data dictionary into a path.
     Uses the _type, if given, else calls dict_to_type to find matching type.
@@ -117,7 +117,7 @@ def dict_to_path(data: dict, _type: Optional[str] = None, config: Optional[str]
     pc = get_path_config(config)
     r = Resolver.get(pc.name)
 
-    data = data.copy()
+    data = dict(data)
 
     debug(f"Data: {data}")
 
@@ -21,10 +21,11 @@ from resolva import Resolver
 from spil import conf
 from spil.util.log import debug
 from spil.conf.util import pattern_replacing
-from spil.util.caching import lru_cache as cache
+from spil.conf import snapshot
+from spil.util.caching import lru_cache as cache, bump_config_generation
 
 
-@cache
+@cache(subsystem="path")
 def get_path_config(name: Optional[str] = None) -> PathConfig:
 
     if not name:  # either name, or configured default, or first config_name entry
@@ -39,6 +40,35 @@ def get_path_config(name: Optional[str] = None) -> PathConfig:
     return config
 
 
+def reload_path_config(name: Optional[str] = None) -> None:
+    """
+    Reloads the given path config from its config module, and rebuilds its resolver.
+    If no name is given, all configured path configs are reloaded.
+
+    The config generation is bumped:
+    cached path configs, paths and path resolves are recomputed when next accessed, no cache is flushed.
+
+    Examples:
+
+        >>> from spil import Sid
+        >>> path = Sid('hamlet/a/char/ophelia/model/v001/w/ma').path()
+        >>> reload_path_config('local')
+        >>> Sid('hamlet/a/char/ophelia/model/v001/w/ma').path() == path
+        True
+
+    Args:
+        name: name of a path config, as configured in conf.path_configs.
+    """
+    names = [name] if name else list(conf.path_configs.keys())  # type: ignore
+    for config_name in names:
+        module_name = conf.path_configs.get(config_name) or config_name  # type: ignore
+        importlib.reload(importlib.import_module(module_name))
+        config = PathConfig(config_name, module_name)
+        Resolver(config.name, config.path_templates)  # type: ignore  # overrides the existing instance
+        debug(f'Reloaded: {config}')
+    bump_config_generation()
+
+
 class PathConfig:
 
     def __init__(self, name: Optional[str] = 'spil_fs_conf', config_module_name: Optional[str] = None):
@@ -60,8 +90,14 @@ class PathConfig:
 
         pattern_replacing(self.path_templates, self.key_patterns)  # type: ignore
 
-        # instantiates a resolver if not already in instance cache
-        Resolver.get(self.name) or Resolver(self.name, self.path_templates)  # type: ignore
+        # instantiates a resolver if not already in instance cache, from the configuration snapshot if possible
+        self.sources_hash = snapshot.source_hash(self.name, self.path_templates)  # type: ignore
+        if not Resolver.get(self.name):
+            resolver_state = snapshot.get_entry(self.name, self.sources_hash)  # type: ignore
+            if resolver_state:
+                snapshot.restore_resolver(resolver_state)
+            else:
+                Resolver(self.name, self.path_templates)  # type: ignore
 
     def __str__(self):
         return f"PathConfig: {self.name} / {self.module}"
@@ -76,13 +112,11 @@ if __name__ == '__main__':
     setLevel(INFO)
 
     conf.set('default_path_config', None)
-    get_path_config.cache_clear()
 
     pc = get_path_config()
     info(pc.path_templates.get('project'))
 
     conf.set('default_path_config', 'server')
-    get_path_config.cache_clear()
 
     pc = get_path_config()
     info(pc.path_templates.get('project'))
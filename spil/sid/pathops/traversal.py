@@ -0,0 +1,206 @@
+"""
+This file is part of SPIL, The Simple Pipeline Lib.
+
+(C) copyright 2019-2024 Michael Haussmann, spil@xeo.info
+
+SPIL is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option) any later version.
+SPIL is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with SPIL.
+If not, see <https://www.gnu.org/licenses/>.
+"""
+"""
+Shared traversal of glob patterns, used by FindInPaths.
+
+The typed searches of a single search (eg. "hamlet/*/**/maya") resolve to many glob patterns, sharing most of their directories.
+Globbing each pattern independently lists the same directories again and again.
+
+The TraversalTree merges the patterns into a tree of path segments.
+The tree is walked once: each directory is listed at most once, and its entries are matched against
+all the segments of all the patterns reaching that directory.
+Each matched path is returned with the consumers (the searches) of all the patterns it matches.
+
+Matching follows glob.glob (non recursive): fnmatch on the directory entries, hidden entries only match hidden patterns,
+literal segments are not listed (only the last one is checked for existence).
+"""
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import fnmatch
+import os
+import re
+
+magic_check = re.compile("[*?[]")
+
+
+def has_magic(segment: str) -> bool:
+    """
+    Returns True if the segment is a glob pattern, False if it is a literal name.
+
+        >>> has_magic('char_*_model.ma'), has_magic('char')
+        (True, False)
+    """
+    return magic_check.search(segment) is not None
+
+
+class Node:
+    """
+    Path segment of the TraversalTree.
+    """
+
+    __slots__ = ("children", "consumers")
+
+    def __init__(self):
+        self.children: Dict[str, Node] = {}  # segment: Node
+        self.consumers: Dict[Any, Any] = {}  # key: consumer, for patterns ending at this segment
+
+
+class TraversalTree:
+    """
+    Tree of glob patterns, walked once.
+
+    Example:
+
+        >>> import tempfile
+        >>> root = tempfile.mkdtemp().replace(os.sep, '/')
+        >>> for folder in ['char/ophelia/model', 'char/ophelia/rig', 'char/hamlet/model', 'prop/skull/model']:
+        ...     os.makedirs(os.path.join(root, folder))
+        >>> tree = TraversalTree()
+        >>> tree.add(root + '/*/ophelia', 'asset')
+        True
+        >>> tree.add(root + '/*/*/model', 'task')
+        True
+        >>> tree.add(root + '/char/*/model', 'char task')
+        True
+        >>> tree.add(root + '/*/ophelia', 'asset')  # duplicate, ignored
+        False
+        >>> for path, consumers in sorted(tree.walk()):  # listing order is arbitrary, as in glob
+        ...     print(path[len(root):], consumers)
+        /char/hamlet/model ['task', 'char task']
+        /char/ophelia ['asset']
+        /char/ophelia/model ['task', 'char task']
+        /prop/skull/model ['task']
+        >>> tree.listings  # the root, char and prop folders are listed once each
+        3
+
+    """
+
+    def __init__(self):
+        self.root = Node()
+        self.listings = 0  # amount of directory listings during the walk
+        self.checks = 0  # amount of existence checks during the walk
+
+    def add(self, pattern: str, consumer: Any, key: Any = None) -> bool:
+        """
+        Adds the glob pattern, with its consumer.
+        Consumers of the same pattern are deduplicated by key (the consumer itself if key is None).
+
+        Args:
+            pattern: a glob pattern, with "/" as separator
+            consumer: any object, returned by walk() with the matching paths
+            key: the deduplication key of the consumer
+
+        Returns: True if the consumer was added, False if it was already present for this pattern.
+        """
+        node = self.root
+        for segment in pattern.replace(os.sep, "/").split("/"):
+            child = node.children.get(segment)
+            if child is None:
+                child = node.children[segment] = Node()
+            node = child
+
+        key = consumer if key is None else key
+        if key in node.consumers:
+            return False
+        node.consumers[key] = consumer
+        return True
+
+    def walk(self) -> Iterator[Tuple[str, List[Any]]]:
+        """
+        Walks the tree, and yields each matching path with its consumers.
+        Each path is yielded once.
+
+        Returns: an iterator of (path, consumers) tuples
+        """
+        self.listings = 0
+        self.checks = 0
+
+        # depth first, iterative: (directory path, the nodes of all patterns reaching it).
+        # the nodes reaching a directory are merged, so that each directory is walked (and listed) once.
+        stack: List[Tuple[Optional[str], List[Node]]] = [(None, [self.root])]
+        while stack:
+            path, nodes = stack.pop()
+            listing = None
+            matches: Dict[str, List[Node]] = {}  # matched name: the nodes of all patterns matching it
+            literals = set()
+            for node in nodes:
+                for segment, child in node.children.items():
+                    if not has_magic(segment):
+                        matches.setdefault(segment, []).append(child)
+                        literals.add(segment)
+                        continue
+                    if listing is None:
+                        listing = self._list(path)
+                    names = listing.get(segment[0] == ".", bool(child.children) and not child.consumers)
+                    for name in fnmatch.filter(names, segment):
+                        matches.setdefault(name, []).append(child)
+
+            subfolders = []
+            for name, children in matches.items():
+                child_path = name if path is None else f"{path}/{name}"
+                consumers: Dict[Any, Any] = {}
+                for child in children:
+                    if child.consumers:
+                        consumers.update(child.consumers)
+                if consumers and (name not in literals or self._exists(child_path, name, listing)):
+                    yield child_path, list(consumers.values())
+                if any(child.children for child in children):
+                    subfolders.append((child_path, children))
+            stack.extend(reversed(subfolders))
+
+    def _list(self, path: Optional[str]) -> "Listing":
+        # path is None for relative patterns, and "" for the root of absolute patterns
+        self.listings += 1
+        try:
+            with os.scandir(os.curdir if path is None else path or "/") as it:
+                return Listing([(entry.name, entry.is_dir()) for entry in it])
+        except OSError:
+            return Listing([])
+
+    def _exists(self, path: str, name: str, listing: Optional["Listing"]) -> bool:
+        # a literal name is looked up in the directory listing, if it was listed
+        if listing is not None and name in listing.names:
+            return True
+        self.checks += 1
+        return os.path.lexists(path)
+
+
+class Listing:
+    """
+    Entries of a listed directory, filtered as glob does.
+    """
+
+    __slots__ = ("entries", "names", "_filtered")
+
+    def __init__(self, entries: List[Tuple[str, bool]]):
+        self.entries = entries  # (name, is_dir)
+        self.names = {name for name, _ in entries}
+        self._filtered: Dict[Tuple[bool, bool], List[str]] = {}
+
+    def get(self, hidden: bool, dironly: bool) -> List[str]:
+        """
+        Returns the entry names, only directories if dironly,
+        including hidden entries (starting with ".") only if hidden (hidden entries are only matched by hidden patterns).
+        """
+        names = self._filtered.get((hidden, dironly))
+        if names is None:
+            names = self._filtered[(hidden, dironly)] = [
+                name for name, is_dir in self.entries if (is_dir or not dironly) and (hidden or name[0] != ".")
+            ]
+        return names
+
+
+if __name__ == "__main__":
+
+    import doctest
+
+    doctest.testmod()
@@ -15,6 +15,7 @@ from typing import Iterator, List, Dict, Optional, overload
 from typing_extensions import Literal
 
 from spil import Sid
+from spil import conf
 from spil.sid.read.finder import Finder
 
 from spil.util.log import debug, warning
@@ -23,7 +24,7 @@ from spil.util.caching import lru_cache as cache
 from spil.sid.read.tools import unfold_search
 
 
-@cache
+@cache(subsystem="search")
 def get_finder(sid: Sid | str, config: Optional[str] = None) -> Finder | None:
     """
     Calls spil.conf.get_finder_for() which is implemented in the spil_data_conf.
@@ -114,6 +115,28 @@ class FindInAll(Finder):  # noqa
             search_sid: Sid to search
             as_sid: result will be returned as a Sid object if True, as a string otherwise.
 
+        If conf.lazy_sids is True, the found Sids are "lazy" (see Sid.lazy): they are only resolved if the caller needs their type or fields.
+
+        Examples:
+
+            >>> from spil import conf
+            >>> def is_lazy(sid):  # the type slot of a lazy Sid is unset until resolved
+            ...     try:
+            ...         object.__getattribute__(sid, "_type")
+            ...     except AttributeError:
+            ...         return True
+            ...     return False
+
+            >>> found = next(FindInAll().find('hamlet/a/char/ophelia/model'))
+            >>> found, is_lazy(found)
+            (Sid('asset__task:hamlet/a/char/ophelia/model'), False)
+
+            >>> conf.lazy_sids = True
+            >>> found = next(FindInAll().find('hamlet/a/char/ophelia/model'))
+            >>> is_lazy(found), found.type, is_lazy(found)
+            (True, 'asset__task', False)
+            >>> conf.lazy_sids = False
+
         Returns:
             Generator over the found Sids, as Sid or string instances.
         """
@@ -148,7 +171,7 @@ class FindInAll(Finder):  # noqa
                 if i not in done:
                     done.add(i)
                     if as_sid:
-                        yield Sid(i)
+                        yield Sid.lazy(i) if conf.lazy_sids else Sid(i)
                     else:
                         yield i
 
@@ -52,7 +52,7 @@ def now():
 
 
 # @lru_cache
-@cache
+@cache(subsystem="data")
 def get_sidcache(data_search, data_source, cache_file=None, name=None):
     """
     Factory to build pooled SidCache objects.
@@ -0,0 +1,250 @@
+"""
+This file is part of SPIL, The Simple Pipeline Lib.
+
+(C) copyright 2019-2024 Michael Haussmann, spil@xeo.info
+
+SPIL is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option) any later version.
+
+SPIL is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with SPIL.
+If not, see <https://www.gnu.org/licenses/>.
+"""
+from __future__ import annotations
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple, overload
+
+from typing_extensions import Literal
+
+from array import array
+from fnmatch import fnmatchcase
+
+from spil import Sid
+from spil.sid.core.sid_factory import typed_dict_to_sid
+from spil.sid.core.sid_resolver import sid_to_dict, get_type_keys
+from spil.sid.read.finders.find_glob import FindByGlob
+from spil.util.exception import SpilException
+from spil.util.log import debug
+
+try:
+    import numpy as np  # type: ignore
+except ImportError:
+    np = None  # type: ignore  # optional dependency, checked in FindInCatalog.__init__
+
+magic_chars = set("*?[")
+
+
+class CatalogTable:
+    """
+    Rows of a single Sid type, in list order:
+    one array of value codes per key (the columns), and the Sid strings.
+    """
+
+    __slots__ = ("type", "keys", "columns", "strings")
+
+    def __init__(self, _type: str, keys: Tuple[str, ...]):
+        self.type = _type
+        self.keys = keys
+        self.columns: dict = {key: array("i") for key in keys}  # numpy arrays, once built
+        self.strings: List[str] = []
+
+    def __len__(self):
+        return len(self.strings)
+
+
+class FindInCatalog(FindByGlob):
+    """
+    Catalog search.
+
+    Searches for sids in a columnar catalog, built once from a list of Sids or Sid strings (eg. all the versions of a show).
+    For analytics-style searches on big lists (millions of Sids).
+
+    The Sids are grouped by type.
+    For each type, each key is a column: an integer array of value codes.
+    The values are dictionary encoded per key: all "sequence" values share one vocabulary, across types.
+
+    A typed search Sid is compiled into vectorized masks on the columns of its type:
+    equality for literal values, code membership for patterns (eg. "sq0*"), and no mask for "*".
+    The rows are matched by chunks (array views), and the matching Sids are yielded lazily, in list order.
+
+    Unlike FindInList, which matches strings, a Sid is only found by searches of its own type.
+
+    Needs numpy (pip install spil[catalog]).
+
+    Example:
+
+        >>> sids = ['hamlet/a/char/ophelia/model', 'hamlet/s/sq010/sh0010/anim', 'hamlet/a/prop/skull/model', 'hamlet/a/char/ophelia/rig']
+        >>> catalog = FindInCatalog(sids)
+        >>> list(catalog.find('hamlet/a/*/*/model', as_sid=False))
+        ['hamlet/a/char/ophelia/model', 'hamlet/a/prop/skull/model']
+        >>> list(catalog.find('hamlet/a/char/o*/*'))
+        [Sid('asset__task:hamlet/a/char/ophelia/model'), Sid('asset__task:hamlet/a/char/ophelia/rig')]
+        >>> list(catalog.find('hamlet/s/sq020/*/anim'))
+        []
+    """
+
+    chunk_size = 65536  # rows matched at once
+
+    def __init__(self, searchlist: Iterable[str | Sid]):
+        """
+        Builds the catalog from the searchlist, Sids or Sid strings.
+        Strings that do not resolve to a typed Sid are skipped.
+
+        Args:
+            searchlist: Sids or Sid strings
+        """
+        if np is None:
+            raise SpilException('FindInCatalog needs numpy. Install it with: pip install "spil[catalog]"')
+
+        self._codes: Dict[str, Dict[str, int]] = {}  # key: {value: code}
+        self._values: Dict[str, List[str]] = {}  # key: values, by code
+        self._tables: Dict[str, CatalogTable] = {}  # sid type: table
+
+        resolve = sid_to_dict.__wrapped__  # not cached: millions of one-off resolves would flush the sid cache
+        encoders: Dict[str, list] = {}  # sid type: [(key, column append, codes, values)]
+        for item in searchlist:
+            if isinstance(item, Sid):
+                _type, fields, string = item.type, item.fields_view, item.string
+            else:
+                string = str(item)
+                _type, fields = resolve(string)
+            if not _type or not fields:
+                debug(f"Item did not resolve to a typed Sid, skipped: {item}")
+                continue
+            table = self._tables.get(_type)
+            if table is None:
+                table = self._tables[_type] = CatalogTable(_type, get_type_keys(_type))
+                encoders[_type] = [(key, table.columns[key].append, *self._vocabulary(key)) for key in table.keys]
+            for key, append, codes, values in encoders[_type]:
+                value = fields[key]
+                code = codes.get(value)
+                if code is None:
+                    code = codes[value] = len(values)
+                    values.append(value)
+                append(code)
+            table.strings.append(string)
+
+        for table in self._tables.values():
+            table.columns = {key: np.frombuffer(column, dtype=np.intc) for key, column in table.columns.items()}
+        debug(f"Catalog built: {len(self)} Sids, {len(self._tables)} types")
+
+    def _vocabulary(self, key: str) -> Tuple[Dict[str, int], List[str]]:
+        # the codes by value, and the values by code, of the key
+        if key not in self._codes:
+            self._codes[key] = {}
+            self._values[key] = []
+        return self._codes[key], self._values[key]
+
+    def select(self, search_sid: Sid) -> Iterator[Tuple[CatalogTable, np.ndarray]]:
+        """
+        Yields the rows matching the typed search Sid, by chunks:
+        the CatalogTable of the search type, and an array of matching row indices.
+
+        The values of a row are table.columns[key][index] (value codes), and its Sid string is table.strings[index].
+
+        Args:
+            search_sid: a typed search Sid
+
+        Returns: an iterator of (CatalogTable, row indices) tuples
+        """
+        table = self._tables.get(search_sid.type)
+        if table is None:
+            return
+
+        conditions: List[Tuple[Any, Any]] = []  # (column, code) or (column, codes array)
+        for key, value in search_sid.fields_view.items():
+            if value == "*":
+                continue
+            column = table.columns.get(key)
+            codes = self._codes.get(key, {})
+            if column is None:
+                return
+            if magic_chars.intersection(value):
+                matching = np.array([code for v, code in codes.items() if fnmatchcase(v, value)], dtype=np.intc)
+                if not len(matching):
+                    return
+                conditions.append((column, matching))
+            else:
+                code = codes.get(value)
+                if code is None:
+                    return
+                conditions.append((column, code))
+
+        size = len(table)
+        for start in range(0, size, self.chunk_size):
+            stop = min(start + self.chunk_size, size)
+            mask = None
+            for column, wanted in conditions:
+                view = column[start:stop]  # no copy
+                matched = np.isin(view, wanted) if isinstance(wanted, np.ndarray) else view == wanted
+                mask = matched if mask is None else mask & matched
+            if mask is None:
+                indices = np.arange(start, stop)
+            else:
+                indices = np.flatnonzero(mask) + start
+            if len(indices):
+                yield table, indices
+
+    @overload
+    def star_search(
+        self, search_sids: List[Sid], as_sid: Literal[False], do_sort: bool = False
+    ) -> Iterator[str]:
+        ...
+
+    @overload
+    def star_search(
+        self, search_sids: List[Sid], as_sid: Literal[True], do_sort: bool = False
+    ) -> Iterator[Sid]:
+        ...
+
+    @overload
+    def star_search(
+        self, search_sids: List[Sid], as_sid: Optional[bool], do_sort: bool
+    ) -> Iterator[str] | Iterator[Sid]:
+        ...
+
+    def star_search(self, search_sids: List[Sid],
+                    as_sid: Optional[bool] = False,
+                    do_sort: bool = False) -> Iterator[Any]:
+        """
+        Star search, on the catalog columns.
+
+        Args:
+            search_sids: typed search Sids
+            as_sid: return the result as sid object or string (the default)
+            do_sort: not implemented in FindInCatalog, the results are in list order
+
+        Returns:
+
+        """
+        if do_sort:
+            debug("do_sort not implemented in FindInCatalog")
+
+        done: Set[str] = set()
+        done_add = done.add  # performance
+
+        for search_sid in search_sids:
+            debug('[star_search] "{}"'.format(search_sid))
+            for table, indices in self.select(search_sid):
+                for index in indices.tolist():
+                    item = table.strings[index]
+                    if item in done:
+                        continue
+                    done_add(item)
+                    if as_sid:
+                        fields = {key: self._values[key][table.columns[key][index]] for key in table.keys}
+                        yield typed_dict_to_sid(table.type, fields, string=item)
+                    else:
+                        yield item
+
+    def __len__(self):
+        return sum(len(table) for table in self._tables.values())
+
+    def __str__(self):
+        return f'[spil.{self.__class__.__name__} -- {len(self)} Sids, {len(self._tables)} types]'
+
+
+if __name__ == "__main__":
+
+    import doctest
+
+    doctest.testmod()
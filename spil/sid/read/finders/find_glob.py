@@ -11,7 +11,7 @@ You should have received a copy of the GNU Lesser General Public License along w
 If not, see <https://www.gnu.org/licenses/>.
 """
 from __future__ import annotations
-from typing import Iterator, List, overload, Optional
+from typing import Dict, Iterator, List, overload, Optional
 
 from typing_extensions import Literal
 
@@ -33,7 +33,7 @@ class FindByGlob(Finder):
         - the search sid string is "unfolded" into a list of typed search Sids.
 
         do_find()
-        - depending on the types of searches, defined by the search symbols ('>', ...), the search is delegated to a finder function.
+        - depending on the types of searches, defined by the search symbols ('>', '<', ...), the search is delegated to a finder function.
         (currently either "sorted_search" or "star_search").
     """
 
@@ -54,7 +54,7 @@ class FindByGlob(Finder):
     def do_find(self, search_sids, as_sid=True):
 
         # depending on input, select the right generator
-        is_sorted_search = any([ssid.string.count(">") for ssid in search_sids])
+        is_sorted_search = any(">" in ssid.string or "<" in ssid.string for ssid in search_sids)
 
         if not search_sids:
             warning("Nothing Searchable. ")
@@ -94,68 +94,78 @@ class FindByGlob(Finder):
         """
         Operates a sorted read.
         A sorted read contains the ">" sign, standing for "last"
-        or the "<" sign, standing for "first". (not yet implemented)
+        or the "<" sign, standing for "first".
+        For "<" searches to be typed, the key patterns of the sid config must accept "<", like they accept ">" and "*".
+        Configs written for earlier versions need to add it (see the key_patterns in docs/configuration.md).
+
+        The candidate matches of each search sid are returned by sorted_candidates().
+        They are grouped by their segments before the first sign,
+        and only the current last (or first) match of each group is kept while searching:
+        the matches are not accumulated.
+
+        The last matches are returned in descending order, followed by the first matches in ascending order.
 
         TODO: "meaningful sort" (eg. LAY < ANI < RND), currently only alphanumerical sort.
 
+        Examples:
+
+            >>> from spil import FindInList
+            >>> sids = ['hamlet/s/sq010/sh0010/anim/v001/w/ma', 'hamlet/s/sq010/sh0010/anim/v003/w/ma',
+            ...         'hamlet/s/sq010/sh0010/anim/v002/w/ma', 'hamlet/s/sq010/sh0020/anim/v001/w/ma']
+            >>> list(FindInList(sids).find('hamlet/s/sq010/*/anim/>/w/ma', as_sid=False))
+            ['hamlet/s/sq010/sh0020/anim/v001/w/ma', 'hamlet/s/sq010/sh0010/anim/v003/w/ma']
+            >>> list(FindInList(sids).find('hamlet/s/sq010/*/anim/</w/ma', as_sid=False))
+            ['hamlet/s/sq010/sh0010/anim/v001/w/ma', 'hamlet/s/sq010/sh0020/anim/v001/w/ma']
+
         :param search_sids:
         :param as_sid:
         :return:
         """
-        # index is coherent in all search_sids, which is a bit strange
-        index = str(search_sids[0]).split("/").index(">")
+        lasts: Dict[str, str] = {}  # segments before the sign: current last match
+        firsts: Dict[str, str] = {}  # segments before the sign: current first match
 
-        """
-        indices = []
-        for ss in search_sids:
-            indices.append(str(ss).split('/').index('>'))
-        print('ind' + str(indices))
-        indices = list(set(indices))
-        """
-        # indices = [i for i, x in enumerate(str(search_sid).split('/')) if x == '>']
-        # debug index, indices
-
-        founds: List[str] = []
         for search_sid in search_sids:
-            ssid = search_sid.uri.replace(">", "*")
-            debug("star read start on {}".format(ssid))
-            founds.extend(self.star_search([Sid(ssid)], as_sid=False))
+            parts = str(search_sid).split("/")
+            index, sign = next(((i, part) for i, part in enumerate(parts) if part in (">", "<")), (len(parts), ">"))
+            found = firsts if sign == "<" else lasts
+            get = found.get
+            is_first = sign == "<"
+            # matches have the search's amount of segments: the segments after the sign are split from the right
+            tail = len(parts) - index
+            slashes = len(parts) - 1
+
+            for item in self.sorted_candidates(search_sid, is_first):
+                if index and item.count("/") == slashes:
+                    key = item.rsplit("/", tail)[0] if tail else item
+                else:
+                    key = "/".join(item.split("/")[:index])
+                current = get(key)
+                if current is None or (item < current if is_first else item > current):
+                    found[key] = item
             debug("star read done")
 
-        founds = sorted(list(set(founds)), reverse=True)
-        # TODO: sort by row - and resort after each narrowing
-        # pprint(founds)
-        debug("found {} matches".format(len(founds)))
-
-        # for index in indices:
-        # works with > in any position, but does not use sort by row, and no delegate sorting, and no special sorting
-        for key, grp in it.groupby(founds, key=lambda x: x.split("/")[0:index]):
-            result = list(grp)
-            # debug('{}: {}'.format(key, result))
+        debug("found {} last and {} first matches".format(len(lasts), len(firsts)))
+        for item in it.chain(sorted(lasts.values(), reverse=True), sorted(firsts.values())):
             if as_sid:
-                yield Sid(result[0])
+                yield Sid(item)
             else:
-                yield result[0]
+                yield item
 
+    def sorted_candidates(self, search_sid: Sid, is_first: bool = False) -> Iterator[str]:
         """
-        for index in indices:
-            if not founds:
-                break
-            filtered = []
-            for key, grp in it.groupby(founds, key=lambda x: x.split('/')[0:index]):
-                result = list(grp)
-                debug('{}: "{}" {}'.format(key, result[0].split('/')[index], result))
-                filtered.append(result[0])
-                filtered.extend(result)
-            founds = filtered
-        """
+        Returns the candidate matches of a sorted search sid,
+        among which sorted_search keeps the last (or first) of each group.
 
+        By default, all the matches: the search sid is star searched, with the signs replaced by "*".
+        Finders may return fewer candidates, if they contain the last (or first) of each group (see FindInPaths).
+
+        :param search_sid: a typed search Sid, containing ">" or "<"
+        :param is_first: True if the first matches are searched ("<"), False for the last (">")
+        :return: an iterator of sid strings
         """
-        for index in indices:
-            for key, grp in it.groupby(founds, key=lambda x: x.split('/')[0:index]):
-                result = list(grp)
-                debug('{}: "{}" {}'.format(key, result[0].split('/')[index], result))
-        """
+        ssid = search_sid.uri.replace(">", "*").replace("<", "*")
+        debug("star read start on {}".format(ssid))
+        yield from self.star_search([Sid(ssid)], as_sid=False)
 
     """
     Problem:
@@ -11,7 +11,7 @@ You should have received a copy of the GNU Lesser General Public License along w
 If not, see <https://www.gnu.org/licenses/>.
 """
 from __future__ import annotations
-from typing import Iterator, List, Set
+from typing import Any, Iterator, List, Optional, Set
 
 import re
 
@@ -64,7 +64,7 @@ def glob2re(pat):
                 res = '%s[%s]' % (res, stuff)
         else:
             res = res + re.escape(c)
-    return res + '\Z(?ms)'
+    return '(?ms)' + res + r'\Z'  # global flags must be at the start of the pattern (python 3.11)
 
 
 class FindInList(FindByGlob):
@@ -79,35 +79,51 @@ class FindInList(FindByGlob):
     Implements a glob like "star_search".
     This loops through the list and accumulates the matching results.
 
+    Optionally, the list is indexed in a trie of "/" separated segments (do_index).
+    The star search then walks the trie: literal segments are dict lookups, only the "*" segments loop through their level.
+    This is faster for big lists that are searched many times, at the cost of building the index once.
+
     Note: searchlist can be a generator, but it will be exhausted after a single function call.
 
     Still beta.
+
+    Example:
+
+        >>> sids = ['hamlet/a/char/ophelia/model', 'hamlet/s/sq010/sh0010/anim', 'hamlet/a/prop/skull/model']
+        >>> list(FindInList(sids, do_index=True).star_search(['hamlet/a/*/*/model']))
+        ['hamlet/a/char/ophelia/model', 'hamlet/a/prop/skull/model']
     """
     def __init__(self, searchlist: List[str],
                  do_extrapolate: bool = False,
                  do_pre_sort: bool = False,
-                 do_strip: bool = False):
+                 do_strip: bool = False,
+                 do_index: bool = False):
         """
         Sets the search list, a list of sid strings.
 
         Note: searchlist could be a generator, but it would be exhausted after a single function call.
-        If do_extrapolate is True, searchlist becomes a list.
+        If do_extrapolate or do_index is True, searchlist becomes a list.
 
         Args:
             searchlist:
             do_extrapolate:
             do_pre_sort:
             do_strip: if the returned items should be strip() (typically if coming from file input)
+            do_index: if the searchlist should be indexed in a segment trie, for faster searches
         """
-        if do_extrapolate:
-            self.searchlist = list(extrapolate(searchlist))
+        if do_extrapolate or do_index:
+            self.searchlist = list(extrapolate(searchlist) if do_extrapolate else searchlist)
         else:
             self.searchlist = searchlist
 
         self.is_searchlist_sorted = False
+        self.do_index = do_index
+        self._index: Optional[dict] = None
 
         if do_pre_sort:
             self._sort_searchlist()
+        elif do_index:
+            self._build_index()
 
         self.do_strip = do_strip
 
@@ -115,6 +131,55 @@ class FindInList(FindByGlob):
         self.searchlist = sorted(list(set(self.searchlist)))
         debug('Pre-sorted {} sids'.format(len(self.searchlist)))
         self.is_searchlist_sorted = True
+        if self.do_index:
+            self._build_index()
+
+    def _build_index(self) -> None:
+        """
+        Builds the segment trie of the searchlist.
+
+        Each node is a dict of segment: child.
+        A child is the index of the item in the searchlist if the item ends there and has no children,
+        or a dict, holding the index of the item ending there (if any) under the None key.
+        Only the first index of duplicate items is kept.
+        """
+        index: dict = {}
+        for i, item in enumerate(self.searchlist):
+            *parents, last = item.split("/")
+            node = index
+            for segment in parents:
+                child = node.get(segment)
+                if child is None:
+                    child = node[segment] = {}
+                elif child.__class__ is int:
+                    child = node[segment] = {None: child}
+                node = child
+            child = node.get(last)
+            if child is None:
+                node[last] = i
+            elif child.__class__ is dict and None not in child:
+                child[None] = i
+        self._index = index
+        debug('Indexed {} sids'.format(len(self.searchlist)))
+
+    def _index_search(self, pattern: str) -> List[int]:
+        """
+        Returns the sorted indices of the searchlist items matching the pattern, using the segment trie.
+        The segments are matched like the glob2re pattern: "*" and "?" do not traverse "/".
+        """
+        nodes: List[Any] = [self._index]  # trie nodes (dicts) or leaf indices (ints)
+        for segment in pattern.split("/"):
+            if "*" in segment or "?" in segment:
+                match = re.compile(glob2re(segment)).match
+                nodes = [child for node in nodes if node.__class__ is dict
+                         for key, child in node.items() if key is not None and match(key)]
+            else:
+                nodes = [child for node in nodes if node.__class__ is dict
+                         for child in (node.get(segment),) if child is not None]
+            if not nodes:
+                return []
+        indices = [node if node.__class__ is int else node.get(None) for node in nodes]
+        return sorted(i for i in indices if i is not None)
 
     def _get_searchlist(self, do_sort: bool = False) -> List[str]:
         if do_sort and not self.is_searchlist_sorted:
@@ -129,6 +194,7 @@ class FindInList(FindByGlob):
         Simple star search.
 
         Transforms the pattern into a regex (like fnmatch.translate), but without traversing "/" (the sid separator).
+        If the searchlist is indexed, the segment trie is searched instead (except for patterns containing "[").
 
         Args:
             search_sids:
@@ -145,22 +211,27 @@ class FindInList(FindByGlob):
 
         for search_sid in search_sids:
 
-            pattern = glob2re(str(search_sid))
             debug('[star_search] "{}"'.format(search_sid))
 
-            for item in search_list:
-                if re.match(pattern, item):
-                    # debug('match : {}'.format(item))
-                    if item not in done:
-                        done_add(item)
-                        if self.do_strip:
-                            item = item.strip()
-                        if as_sid:
-                            yield Sid(item)
-                        else:
-                            yield item
+            if self._index is not None and "[" not in str(search_sid):
+                # matching items, in searchlist order
+                matches = (search_list[i] for i in self._index_search(str(search_sid)))
+            else:
+                pattern = glob2re(str(search_sid))
+                matches = (item for item in search_list if re.match(pattern, item))
+
+            for item in matches:
+                # debug('match : {}'.format(item))
+                if item not in done:
+                    done_add(item)
+                    if self.do_strip:
+                        item = item.strip()
+                    if as_sid:
+                        yield Sid(item)
                     else:
-                        debug('{} was already found, skipped. '.format(item))
+                        yield item
+                else:
+                    debug('{} was already found, skipped. '.format(item))
 
     def __str__(self):
         return f'[spil.{self.__class__.__name__} -- List: "{list(self.searchlist)[:5]}(...)"]'
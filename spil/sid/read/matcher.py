@@ -0,0 +1,138 @@
+"""
+This file is part of SPIL, The Simple Pipeline Lib.
+
+(C) copyright 2019-2023 Michael Haussmann, spil@xeo.info
+
+SPIL is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option) any later version.
+
+SPIL is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR a PARTICULAR PURPOSE.  See the GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with SPIL.
+If not, see <https://www.gnu.org/licenses/>.
+"""
+from __future__ import annotations
+from typing import Iterable, List, Optional, Pattern
+
+import re
+
+from spil import Sid
+from spil.sid.read.tools import unfold_search
+from spil.sid.read.finders.find_list import glob2re
+from spil.util.caching import lru_cache as cache
+from spil.util.log import debug
+
+
+class SidMatcher:
+    """
+    A search Sid, unfolded and compiled once, to test many Sids or strings against it.
+
+    The result is the same as searching in a list containing the tested Sid
+    (which is how Sid.match used to be implemented: FindInList([sid]).find_one(search_sid)).
+    The search is unfolded, the sorted search signs (">" and "<") match any value,
+    and the resulting search strings are compiled into a single regular expression.
+
+    Examples:
+
+        >>> matcher = SidMatcher('hamlet/a/*/*/model')
+        >>> matcher.match('hamlet/a/char/ophelia/model')
+        True
+
+        >>> matcher.filter(['hamlet/a/char/ophelia/model', 'hamlet/a/char/ophelia/rig', Sid('hamlet/a/prop/dagger/model')])
+        ['hamlet/a/char/ophelia/model', Sid('asset__task:hamlet/a/prop/dagger/model')]
+
+        >>> SidMatcher('hamlet/s/**/movie?version=>').match('hamlet/s/sq030/sh0100/anim/v001/w/mov')
+        True
+    """
+
+    def __init__(self, search_sid: str | Sid):
+        """
+        Unfolds and compiles the given search Sid.
+
+        Args:
+            search_sid: typed or untyped search Sid or string
+        """
+        self.search_sid = search_sid
+        self.sid = Sid(search_sid)
+
+        # same shortcut as Finder.find: a Sid that is not a search is not unfolded.
+        if self.sid and not self.sid.is_search():
+            searches = [self.sid]
+        else:
+            searches = unfold_search(search_sid)
+
+        strings = dict.fromkeys(s.string.replace(">", "*").replace("<", "*") for s in searches)  # unique, ordered
+        self.exact = {s for s in strings if not any(c in s for c in "*?[")}
+        patterns = [glob2re(s).replace("(?ms)", "", 1) for s in strings if s not in self.exact]  # flags are set once
+        self.regex: Optional[Pattern] = re.compile("|".join(f"(?:{p})" for p in patterns), re.M | re.S) if patterns else None
+        debug(f'Compiled "{search_sid}": {len(self.exact)} strings and {len(patterns)} patterns')
+
+    def match_string(self, string: str) -> bool:
+        """
+        Returns True if the given Sid string matches, else False.
+        """
+        return string in self.exact or bool(self.regex and self.regex.match(string))
+
+    def match(self, sid: Sid | str) -> bool:
+        """
+        Returns True if the given Sid or string matches, else False.
+
+        As with Sid.match, a Sid identical to the search Sid always matches,
+        and an undefined (untyped) Sid does not match.
+
+        Args:
+            sid: a Sid or a Sid string
+
+        Returns:
+            True if matched, else False
+        """
+        if isinstance(sid, Sid):
+            if sid == self.sid:
+                return True
+            if not sid:
+                return False
+            return self.match_string(sid.string)
+        return self.match_string(str(sid))
+
+    def filter(self, sids: Iterable[Sid | str]) -> List[Sid | str]:
+        """
+        Returns the matching Sids or strings, in the given order.
+
+        Args:
+            sids: an iterable of Sids or Sid strings
+
+        Returns:
+            A list of the matching items
+        """
+        exact = self.exact
+        regex_match = self.regex.match if self.regex else (lambda s: None)
+        match = self.match
+        return [s for s in sids if ((s in exact or regex_match(s) is not None) if type(s) is str else match(s))]
+
+    def __repr__(self) -> str:
+        return f"SidMatcher('{self.search_sid}')"
+
+
+@cache(subsystem="search")
+def get_matcher(search_sid: str | Sid) -> SidMatcher:
+    """
+    Returns the SidMatcher for the given search Sid. The matchers are cached.
+
+    Examples:
+
+        >>> get_matcher('hamlet/a/*') is get_matcher('hamlet/a/*')
+        True
+
+    Args:
+        search_sid: typed or untyped search Sid or string
+
+    Returns:
+        SidMatcher
+    """
+    return SidMatcher(search_sid)
+
+
+if __name__ == "__main__":
+
+    import doctest
+
+    doctest.testmod()
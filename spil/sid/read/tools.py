@@ -23,6 +23,7 @@ from spil.sid.read.unfolders.or_op import execute as or_op
 from spil.sid.read.unfolders.expand import execute as expand
 from spil.sid.read.unfolders.typed_narrow import execute as narrow
 from spil.sid.read.unfolders.extrapolate import execute as extrapolate
+from spil.sid.read.unfold_plans import unfold_with_plan
 
 # "unfolders" by execution order for existing searches
 list_search_unfolders = [extensions, or_op, expand, narrow]
@@ -36,11 +37,11 @@ def apply_unfolders(sid: str, unfolders: List[Callable]) -> List[Sid]:
     Takes the given sid, executes Search Sid "unfolders" (functions)
     and returns a sorted list of unique search sids.
 
-    "Unfolder" functions takes a list of search sids, and returns a list of search sids.
+    "Unfolder" functions take an iterable of search sids, and return an iterable of search sids.
 
     Note: (#FIXME: this has to be refactored with explicit typing)
         The unfolder function list is: [extensions, or_op, expand, narrow]
-        "extension" and "or_op" operate on lists of strings
+        "extension" operates on lists of strings, "or_op" lazily generates strings
         "expand" gets strings and returns Sid objects
         "narrow" gets Sids and returns Sids.
 
@@ -59,7 +60,7 @@ def apply_unfolders(sid: str, unfolders: List[Callable]) -> List[Sid]:
     return sorted(set(result))
 
 
-@cache
+@cache(subsystem="search")
 def unfold_search(
     search_sid: str | Sid, do_uniquify: bool = False, do_extrapolate: bool = False
 ) -> List[Sid]:
@@ -107,10 +108,29 @@ def unfold_search(
 
     debug('Treating Search Sid: "{}"'.format(search_sid))
 
-    # unfolding
-    search_sids = apply_unfolders(
-        str(search_sid), list_search_unfolders + ([extrapolate] if do_extrapolate else [])
-    )
+    # unfolding, using the plan of the search shape if possible (see unfold_plans)
+    search_sids = unfold_with_plan(str(search_sid), do_extrapolate, unfold)
+
+    if do_uniquify:
+        search_sids = uniquify_searches(search_sids)
+
+    debug(f'Done "{search_sid}" - Unfolded {len(search_sids)} --> {pformat(search_sids)}')
+
+    return search_sids
+
+
+def unfold(search: str, do_extrapolate: bool = False) -> List[Sid]:
+    """
+    Unfolds the given search string into a sorted list of typed search Sids, by applying the unfolders.
+    Untyped Sids, and Sids with an unapplied query, are removed.
+
+    Args:
+        search: a search string
+        do_extrapolate: if True, include intermediate types in the result.
+
+    Returns: a sorted list of Sid objects
+    """
+    search_sids = apply_unfolders(search, list_search_unfolders + ([extrapolate] if do_extrapolate else []))
 
     # removing invalid
     for ssid in search_sids.copy():  # make this a search unfolder ?
@@ -120,11 +140,6 @@ def unfold_search(
             warn(f'SearchSid "{ssid}" is typed, but has un-applied Query. Cannot be searched.')
             search_sids.remove(ssid)
 
-    if do_uniquify:
-        search_sids = uniquify_searches(search_sids)
-
-    debug(f'Done "{search_sid}" - Unfolded {len(search_sids)} --> {pformat(search_sids)}')
-
     return search_sids
 
 
@@ -0,0 +1,238 @@
+"""
+This file is part of SPIL, The Simple Pipeline Lib.
+
+(C) copyright 2019-2024 Michael Haussmann, spil@xeo.info
+
+SPIL is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option) any later version.
+
+SPIL is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public License along with SPIL.
+If not, see <https://www.gnu.org/licenses/>.
+"""
+"""
+Structural cache of search unfolding plans, used by tools.unfold_search.
+
+Searches that only differ by their literal values, like "hamlet/s/sq010/*/anim" and "hamlet/s/sq020/*/anim",
+have the same "shape": they unfold to the same types, with the same structure.
+The search is unfolded once per shape, and the result is stored as a plan:
+for each resulting type, the Sid segments, being either constants or references to the literal values of the search.
+The plan is then applied to the literal values of the following searches of the same shape.
+
+The shape of a search contains:
+- the search symbols ("*", "**", ">", "<") and the "or" groups, by position,
+- for each literal value, a signature: the set of sid template segments the value matches
+  (values matching the same template segments are typed identically),
+- the query, as is.
+
+Literal values of keys set by the query or the search narrowing are constants of the plan:
+the plan only applies to searches with the same values for these keys.
+
+Searches that cannot be planned are unfolded normally:
+values containing search symbols (eg. "sq0*"), repeated values, or types whose template segments are not single keys.
+"""
+from typing import Callable, List, NamedTuple, Optional, Tuple, Union
+
+from resolva.template import construct_regular_expression  # type: ignore
+
+from spil import Sid
+from spil.conf import sip, ors, search_symbols  # type: ignore
+from spil.conf import sid_templates, sid_type_meta, basetyped_search_narrowing, typed_search_narrowing  # type: ignore
+from spil.sid.core import query_helper
+from spil.sid.read.unfolders.extensions import extensions
+from spil.util.caching import Memo
+
+# whole segment search symbols, and the characters that make a value a search
+symbols = set(search_symbols) - {ors}
+symbol_chars = set("".join(symbols))
+
+# one regex per distinct sid template segment, to compute value signatures
+segment_regexes = [construct_regular_expression(segment) for segment in sorted({s for t in sid_templates.values() for s in t.split(sip)})]
+
+_signatures = Memo("spil.sid.read.unfold_plans.signatures", subsystem="search")
+_plans = Memo("spil.sid.read.unfold_plans.plans", subsystem="search")
+
+
+class UnfoldPlan(NamedTuple):
+    """
+    Unfolding result of a search shape.
+    """
+    results: Tuple[Tuple[str, Tuple[str, ...], Tuple[Union[str, int], ...]], ...]  # (type, keys, segments: constant or literal index)
+    fixed: Tuple[Tuple[int, str], ...]  # (literal index, value) required to apply the plan
+
+
+def get_signature(value: str) -> int:
+    """
+    Returns the signature of a literal value: a bit mask of the sid template segments it matches.
+
+    Examples:
+
+        >>> get_signature('sq010') == get_signature('sq020')
+        True
+        >>> get_signature('sq010') == get_signature('sh0010')
+        False
+
+    Args:
+        value: a literal Sid segment value
+
+    Returns: the signature, as an int
+    """
+    signature = _signatures.lookup(value)
+    if signature is None:
+        signature = _signatures.put(value, sum(1 << i for i, regex in enumerate(segment_regexes) if regex.match(value)))
+    return signature
+
+
+def get_shape(search: str) -> Optional[Tuple[tuple, List[str]]]:
+    """
+    Returns the shape of the given search string, and its literal values, in order.
+    Returns None if the search cannot be planned.
+
+    Examples:
+
+        >>> get_shape('hamlet/s/sq010/*/anim')[0] == get_shape('hamlet/s/sq020/*/anim')[0]
+        True
+        >>> get_shape('hamlet/s/sq010/*/anim')[1]
+        ['hamlet', 's', 'sq010', 'anim']
+        >>> get_shape('hamlet/s/sq010/*/anim')[0] == get_shape('hamlet/a/char/*/rig')[0]
+        False
+        >>> get_shape('hamlet/s/sq0*')
+
+    Args:
+        search: a search string, with extension aliases already replaced
+
+    Returns: a (shape, literals) tuple, or None
+    """
+    if "?" in search:
+        path, query = search.split("?", 1)
+    else:
+        path, query = search, ""
+
+    shape: list = []
+    literals = []
+    for segment in path.split(sip):
+        if segment in symbols:
+            shape.append(segment)
+            continue
+        group: List[Union[str, int]] = []  # search symbols and value signatures
+        for value in ([v.strip() for v in segment.split(ors)] if ors in segment else [segment]):
+            if value in symbols:
+                group.append(value)
+            elif not value or symbol_chars.intersection(value):  # eg. "sq0*"
+                return None
+            else:
+                group.append(get_signature(value))
+                literals.append(value)
+        shape.append(tuple(group) if ors in segment else group[0])
+
+    if len(set(literals)) != len(literals):  # values are mapped back by equality, they must be unique
+        return None
+
+    return (tuple(shape), query), literals
+
+
+def build_plan(results: List[Sid], literals: List[str], query: str) -> Optional[UnfoldPlan]:
+    """
+    Builds the plan from the unfolding results of a search, and the search literal values.
+    Returns None if the results cannot be planned.
+
+    Args:
+        results: the unfolded typed search Sids
+        literals: the literal values of the search
+        query: the search query
+
+    Returns: UnfoldPlan or None
+    """
+    index = {value: i for i, value in enumerate(literals)}
+    query_keys = set(query_helper.to_dict(query)) if query else set()
+
+    fixed = {}
+    planned = []
+    for sid in results:
+        meta = sid_type_meta.get(sid.type)
+        segments = sid.string.split(sip)
+        if not meta or len(segments) != len(meta.keys):
+            return None
+        # values of these keys may come from the query, not from the search path
+        set_keys = query_keys.union(
+            query_helper.to_dict(basetyped_search_narrowing.get(meta.basetype, "")),
+            query_helper.to_dict(typed_search_narrowing.get(meta.type, "")),
+        )
+        parts: List[Union[str, int]] = []
+        for key, value in zip(meta.keys, segments):
+            i = index.get(value)
+            if i is None:
+                parts.append(value)
+            elif key in set_keys:
+                fixed[i] = value
+                parts.append(value)
+            else:
+                parts.append(i)
+        planned.append((meta.type, meta.keys, tuple(parts)))
+
+    return UnfoldPlan(tuple(planned), tuple(fixed.items()))
+
+
+def apply_plan(plan: UnfoldPlan, literals: List[str]) -> Optional[List[Sid]]:
+    """
+    Applies the plan to the literal values of a search of the same shape.
+    Returns None if the plan does not apply (the fixed values differ).
+
+    Args:
+        plan: UnfoldPlan
+        literals: the literal values of the search
+
+    Returns: a sorted list of typed search Sids, or None
+    """
+    for i, value in plan.fixed:
+        if literals[i] != value:
+            return None
+
+    result = []
+    for _type, keys, parts in plan.results:
+        values = [literals[part] if isinstance(part, int) else part for part in parts]
+        sid = Sid(from_factory=True)  # trusted constructor, the plan types and keys are checked
+        sid._init(string=sip.join(values), type=_type, fields=dict(zip(keys, values)))
+        result.append(sid)
+
+    return sorted(set(result))
+
+
+def unfold_with_plan(search: str, do_extrapolate: bool, unfold: Callable[[str, bool], List[Sid]]) -> List[Sid]:
+    """
+    Unfolds the search using the plan of its shape.
+    If no plan exists, the search is unfolded using the given "unfold" callable, and its plan is stored.
+
+    Examples:
+
+        >>> from spil.sid.read.tools import unfold_search
+        >>> unfold_search('hamlet/s/sq010/*/anim')
+        [Sid('shot__task:hamlet/s/sq010/*/anim')]
+        >>> unfold_search('hamlet/s/sq020/*/anim')  # from the plan
+        [Sid('shot__task:hamlet/s/sq020/*/anim')]
+
+    Args:
+        search: a search string
+        do_extrapolate: if True, include intermediate types in the result
+        unfold: a callable, unfolding the search (without plan)
+
+    Returns: a sorted list of typed search Sids
+    """
+    search = extensions(search)
+    shaped = get_shape(search)
+    if not shaped:
+        return unfold(search, do_extrapolate)
+
+    shape, literals = shaped
+    key = (shape, do_extrapolate)
+    plan = _plans.lookup(key)
+    if plan:
+        result = apply_plan(plan, literals)
+        if result is not None:
+            return result
+    if plan is not None:  # not plannable (False), or fixed values differ
+        return unfold(search, do_extrapolate)
+
+    result = unfold(search, do_extrapolate)
+    _plans.put(key, build_plan(result, literals, shape[1]) or False)
+    return result
@@ -10,148 +10,158 @@ SPIL is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY
 You should have received a copy of the GNU Lesser General Public License along with SPIL.
 If not, see <https://www.gnu.org/licenses/>.
 """
-from typing import List
+from typing import Iterable, Iterator
 
+from functools import reduce
+from itertools import islice, product
+from operator import mul
+
+from spil import conf
 from spil.conf import sip, ors
 from spil.sid.core import query_helper
+from spil.util.log import warning
 
 
-def execute(sids: List[str]) -> List[str]:
+def execute(sids: Iterable[str]) -> Iterator[str]:
     """
-    Runs or_op (the "or operator") on a list of Sids.
+    Runs or_op (the "or operator") on Sids.
+    The resulting Sid strings are generated lazily, one search at a time.
 
     Args:
-        sids: a list of Sid strings to edit
+        sids: Sid strings to edit
 
-    Returns: the list of Sid strings, edited
+    Returns: an iterator of Sid strings, edited
     """
-    result = []
     for sid in sids:
-        result.extend(or_op(sid))
-
-    return result
+        yield from or_op(sid)
 
 
-def or_op(sid: str) -> List[str]:
+def or_op(sid: str) -> Iterator[str]:
     """
     or_op (the "or operator") transforms a string containing the "or" sign
-    into a list of strings, each one individually representing the options without the or.
+    into strings, each one individually representing the options without the or.
+
+    The strings are generated lazily.
+    Their amount is the product of the amount of options of each "or" group, which can grow very fast.
+    It is limited by conf.search_or_limit: if the search would generate more strings,
+    a warning is logged before generating, and only the first strings are generated.
 
     Note: the ors sign can be configured, it is called "ors" in the config.
     Typically it is a comma ",".
 
     Example:
 
-        >>> or_op('bla/s/bla/A,B/**/one,two?test=X,Y,Z')
+        >>> list(or_op('bla/s/bla/A,B/**/one,two?test=X,Y,Z'))
         ['bla/s/bla/A/**/one?test=X', 'bla/s/bla/A/**/one?test=Y', 'bla/s/bla/A/**/one?test=Z', 'bla/s/bla/B/**/one?test=X', 'bla/s/bla/B/**/one?test=Y', 'bla/s/bla/B/**/one?test=Z', 'bla/s/bla/A/**/two?test=X', 'bla/s/bla/A/**/two?test=Y', 'bla/s/bla/A/**/two?test=Z', 'bla/s/bla/B/**/two?test=X', 'bla/s/bla/B/**/two?test=Y', 'bla/s/bla/B/**/two?test=Z']
 
     Args:
         sid: a sid string
 
-    Returns: a list of Sid strings
+    Returns: an iterator of Sid strings
     """
     sid = str(sid)
     if not sid.count(ors):  # no "or" operators in sid.
-        return [sid]
+        yield sid
+        return
 
     if sid.count("?"):  # sid contains Query ending. We put it aside, and later append it back
-        sid, query = sid.split("?", 1)
+        path, query = sid.split("?", 1)
     else:
-        query = ""
+        path, query = sid, ""
 
-    sids = or_on_path(sid)
-
-    result = []
+    searches: Iterator[str]
     if query:
-        uris = or_on_query(query)
-        for s in sids:
-            for u in uris:
-                result.append("{}?{}".format(s, u))
+        uris = list(or_on_query(query))
+        searches = ("{}?{}".format(s, u) for s in or_on_path(path) for u in uris)
     else:
-        result = sids
+        searches = or_on_path(path)
+
+    limit = conf.search_or_limit
+    if limit:
+        amount = or_count(sid)
+        if amount > limit:
+            warning(
+                f'Search "{sid}" generates {amount} searches with the "or" operator, '
+                f"only the first {limit} are used (see conf.search_or_limit)."
+            )
+            searches = islice(searches, limit)
 
-    return result
+    yield from searches
 
 
-def or_on_path(sid):
+def or_count(sid: str) -> int:
+    """
+    Returns the amount of strings the or_op generates for the given sid string, without generating them.
+    Duplicate options of the path are counted once, as or_on_path removes them (the query options are not deduplicated).
+
+    Example:
+
+        >>> or_count('bla/s/bla/A,B/**/one,two?test=X,Y,Z')
+        12
+        >>> or_count('bla/s/bla/A/**/one')
+        1
+        >>> or_count('hamlet/a/char/ophelia,ophelia, ophelia/model,model')
+        1
+
+    Args:
+        sid: a sid string
+
+    Returns: the amount of strings, as an int
+    """
+    path, _, query = str(sid).partition("?")
+    counts = [len({alt.strip() for alt in part.split(ors)}) for part in path.split(sip)]
+    if query:
+        counts.extend(value.count(ors) + 1 for value in query_helper.to_dict(query).values())
+    return reduce(mul, counts, 1)
+
+
+def or_on_path(sid: str) -> Iterator[str]:
     """
     Applies the or_op on the path part of the Sid.
+    The options of the first "or" group vary first.
 
     Example:
 
-        >>> or_on_path('bla/s/bla/A,B,C/**/one,two,three')
+        >>> list(or_on_path('bla/s/bla/A,B,C/**/one,two,three'))
         ['bla/s/bla/A/**/one', 'bla/s/bla/B/**/one', 'bla/s/bla/C/**/one', 'bla/s/bla/A/**/two', 'bla/s/bla/B/**/two', 'bla/s/bla/C/**/two', 'bla/s/bla/A/**/three', 'bla/s/bla/B/**/three', 'bla/s/bla/C/**/three']
 
+        >>> list(or_on_path('bla/A,A/B'))
+        ['bla/A/B']
+
     Args:
         sid: sid string
 
-    Returns: list of sid string
+    Returns: iterator of unique sid strings
     """
+    groups = [[alt.strip() for alt in part.split(ors)] if ors in part else [part] for part in sid.split(sip)]
+
+    seen = set()
+    for combination in product(*reversed(groups)):  # product varies its last group first
+        new = sip.join(reversed(combination))
+        if new not in seen:
+            seen.add(new)
+            yield new
 
-    _start = "--start--"
-
-    parts = sid.split(sip)
-
-    found = [_start]
-    for part in parts:
-        current = found.copy()
-        if ors in part:
-            for alt in part.split(ors):
-                alt = alt.strip()
-                for sid in current.copy():
-                    new = sid + sip + alt
-                    # print 'replace', sid, ' --> ', new, ' -- ', sid in found, '?'
-                    #
-                    if sid in found:
-                        found[found.index(sid)] = new  # replace (of the first element)
-                    else:
-                        found.append(new)  # replace (of the first element)
-
-            # found.remove()
-        else:
-            for sid in found.copy():
-                new = sid + sip + part
-                # print new
-                found[found.index(sid)] = new  # replace (of the first element)
-
-    result = []
-    for sid in found:
-        if not sid in result:
-            result.append(sid.replace(_start + sip, ""))
-
-    # no type check needed
-    return result
-
-
-def or_on_query(query):
+
+def or_on_query(query: str) -> Iterator[str]:
     """
-    Applies the or operator to values of the query, creating unique uris without the operator.
+    Applies the or operator to values of the query, creating uris without the operator.
+    The options of the first key vary first.
 
     Example:
 
-        >>> or_on_query('titi=tata,blip&roger=vadim,bom,tom, tata')
+        >>> list(or_on_query('titi=tata,blip&roger=vadim,bom,tom, tata'))
         ['titi=tata&roger=vadim', 'titi=blip&roger=vadim', 'titi=tata&roger=bom', 'titi=blip&roger=bom', 'titi=tata&roger=tom', 'titi=blip&roger=tom', 'titi=tata&roger=tata', 'titi=blip&roger=tata']
 
     Args:
-        query:
-
-    Returns:
+        query: query string
 
+    Returns: iterator of uri strings
     """
     query_dict = query_helper.to_dict(query)
-    result = [query_dict.copy()]
-    for key, value in query_dict.items():
-        if value.count(ors):
-            new_result = []
-            for i in value.split(ors):
-                for d in result.copy():
-                    new_dict = d.copy()
-                    new_dict[key] = i
-                    new_result.append(new_dict)
-            result = new_result
-    #     print(result)
-
-    return [query_helper.to_string(d) for d in result]
+    groups = [value.split(ors) for value in query_dict.values()]
+    for combination in product(*reversed(groups)):
+        yield query_helper.to_string(dict(zip(query_dict, reversed(combination))))
 
 
 if __name__ == "__main__":
@@ -10,17 +10,20 @@ You should have received a copy of the GNU Lesser General Public License along w
 If not, see <https://www.gnu.org/licenses/>.
 """
 from __future__ import annotations
-from typing import Any, Optional, List
+from typing import Any, Callable, ClassVar, Optional, List, Iterable, Iterator, Tuple
 
 import importlib
+import sys
+from collections.abc import Mapping
 from functools import total_ordering
 from pathlib import Path
 
 from spil.sid.core import query_helper
-from spil.util.caching import lru_cache as cache
+from spil.util.caching import lru_cache as cache, Memo
 from spil.util.log import debug, info, warning
 
 from spil import conf
+from spil.conf import sid_type_meta  # type: ignore
 from spil.util.exception import SpilException
 
 """
@@ -36,13 +39,77 @@ We could use a global data validation framework (pydantic, apischema or so).
 """
 
 
+# Key tuples are shared between all Sids of the same keys.
+_shared_keys: dict[tuple, tuple] = {}
+
+# Sids created from plain strings, by (class, string). Fast path of BaseSid.__new__.
+_string_sids = Memo("spil.sid.sid.string_sids", subsystem="sid")
+
+# Slots of a "lazy" Sid, that are set when it is resolved.
+_lazy_slots = frozenset(["_type", "_keys", "_values"])
+
+
+class FieldsView(Mapping):
+    """
+    Read-only view on the fields of a Sid, without copy.
+    It is built on the Sids keys and values tuples.
+
+    Examples:
+
+        >>> view = Sid("hamlet/s/sq010").fields_view
+        >>> view
+        FieldsView({'project': 'hamlet', 'type': 's', 'sequence': 'sq010'})
+
+        >>> view["sequence"], view.get("shot"), "type" in view, len(view)
+        ('sq010', None, True, 3)
+
+        >>> view == Sid("hamlet/s/sq010").fields
+        True
+    """
+
+    __slots__ = ("_keys", "_values")
+
+    def __init__(self, keys: tuple, values: tuple):
+        self._keys = keys
+        self._values = values
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self._keys:
+            raise KeyError(key)
+        return self._values[self._keys.index(key)]
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key not in self._keys:
+            return default
+        return self._values[self._keys.index(key)]
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._keys
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._keys)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __repr__(self) -> str:
+        return f"FieldsView({dict(zip(self._keys, self._values))})"
+
+
 class BaseSid:
     """Base class for Sids.
 
     Implements __new__ and __init__ to allow Sid instances to be created by a factory.
     The goal is to have an extendable Sid and factory.
+
+    Sid classes define __slots__, to keep Sid objects small in memory.
     """
 
+    __slots__ = ()
+
+    _factory: ClassVar[Tuple[str, str]]  # (module name, function name) of the factory function
+    _bound_factory: ClassVar[Tuple[Tuple[str, str], Callable]]  # (_factory, imported function), see _get_factory
+
     def __new__(cls, *args, **kwargs):
         """
         Calls a Factory function that handles the Sid object creation.
@@ -52,18 +119,45 @@ class BaseSid:
         the method uses the kwarg "from_factory".
         If it is set, an object instance is returned.)
 
+        The factory function is imported once per class (see _get_factory).
+
+        Fast paths, without calling the factory:
+        - a Sid object of the same class is returned as is (Sids are immutable)
+        - a plain string that was already passed returns the same Sid
+
         Args:
             *args:
             **kwargs:
         """
-        if not kwargs.get("from_factory"):
-            (mod, fn) = cls._factory
-            mod = importlib.import_module(mod)
-            fn = getattr(mod, fn)
-            return fn(*args, **kwargs)
-        else:
+        if kwargs.get("from_factory"):
             return object.__new__(cls)
 
+        if len(args) == 1 and not kwargs:
+            sid = args[0]
+            if type(sid) is cls:
+                return sid
+            if type(sid) is str:
+                key = (cls, sid)
+                found = _string_sids.lookup(key)
+                if found is None:
+                    found = _string_sids.put(key, cls._get_factory()(sid))
+                return found
+
+        return cls._get_factory()(*args, **kwargs)
+
+    @classmethod
+    def _get_factory(cls) -> Callable:
+        """
+        Returns the factory function defined by the "_factory" (module name, function name) class attribute.
+        The function is imported once, and again only if "_factory" is changed.
+        """
+        bound = cls.__dict__.get("_bound_factory")
+        if bound is None or bound[0] is not cls._factory:
+            (mod, fn) = cls._factory
+            bound = (cls._factory, getattr(importlib.import_module(mod), fn))
+            cls._bound_factory = bound
+        return bound[1]
+
     def __init__(self, *args, **kwargs):
         """
         Empty Method.
@@ -82,9 +176,16 @@ class StringSid(BaseSid):
     StringSid is the barest form of Sids.
     It only has a string.
     It is not typed.
+
+    Sids are immutable: the uri, the hash and the search flag are computed once, when first needed.
     """
 
-    _string = ""
+    __slots__ = ("_string", "_uri", "_hash", "_search")
+
+    _string: str
+    _uri: Optional[str]  # computed once, when first needed
+    _hash: Optional[int]
+    _search: Optional[bool]
 
     @property
     def string(self) -> str:
@@ -154,7 +255,9 @@ class StringSid(BaseSid):
             True if the Sid contains search symbols, else False.
 
         """
-        return any(s in str(self) for s in conf.search_symbols)
+        if self._search is None:
+            self._search = any(s in self._string for s in conf.search_symbols)
+        return self._search
 
     def __str__(self) -> str:
         return self._string
@@ -163,13 +266,15 @@ class StringSid(BaseSid):
         return "Sid('{0}')".format(self.uri)
 
     def __hash__(self, *args, **kwargs) -> int:
-        return hash(repr(self))
+        if self._hash is None:
+            self._hash = hash(self.uri)
+        return self._hash
 
     def __eq__(self, other: object) -> bool:
         if isinstance(other, Sid):
-            return str(other.uri) == str(self.uri)
+            return other.uri == self.uri
         else:
-            return str(other) == str(self)
+            return str(other) == self._string
 
     def __lt__(self, other: Sid | str) -> bool:
         return str(self) < str(other)
@@ -203,8 +308,18 @@ class TypedSid(StringSid):
     The TypedSid class implements a Sid that has been resolved successfully.
 
     It has a "type" and a "field" data dictionary.
+
+    To stay compact in memory, the fields are not stored as a dictionary:
+    the keys tuple is shared by all Sids having the same keys,
+    and the values are stored in a tuple, as interned strings (eg. the project, sequence or task values are highly repeated).
     """
 
+    __slots__ = ("_type", "_keys", "_values")
+
+    _type: str
+    _keys: Tuple[str, ...]
+    _values: Tuple[Any, ...]
+
     def _init(
         self,
         string: Optional[str] = None,
@@ -213,7 +328,54 @@ class TypedSid(StringSid):
     ):
         self._string = string or ""
         self._type = type or ""
-        self._fields = fields or {}
+        self._uri = self._hash = self._search = None
+        fields = fields or {}
+        keys = tuple(fields)
+        self._keys = _shared_keys.setdefault(keys, keys)
+        try:
+            self._values = tuple(map(sys.intern, fields.values()))
+        except TypeError:  # non string values are not interned
+            self._values = tuple(sys.intern(v) if isinstance(v, str) else v for v in fields.values())
+
+    def _init_lazy(self, string: str):
+        """
+        Initialises a "lazy" Sid, that only holds its string.
+        The type, keys and values are resolved when first accessed (see __getattr__).
+        """
+        self._string = string
+        self._uri = self._hash = self._search = None
+
+    def __getattr__(self, name: str) -> Any:
+        """
+        Only called if the attribute is not found: resolves a "lazy" Sid, on first access of its typed attributes.
+        """
+        if name in _lazy_slots:
+            from spil.sid.core.sid_resolver import sid_to_dict  # fmt: skip
+            _type, fields = sid_to_dict(self._string)
+            self._init(string=self._string, type=_type, fields=fields)
+            return getattr(self, name)
+        raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
+
+    def __reduce__(self):
+        """
+        Pickles the Sid in a compact form (see spil.sid.core.sid_codec).
+        Unpickling does not go through the Sid factory.
+
+        Examples:
+
+            >>> import pickle
+            >>> pickle.loads(pickle.dumps(Sid("hamlet/s/sq010")))
+            Sid('shot__sequence:hamlet/s/sq010')
+        """
+        from spil.sid.core.sid_codec import encode_sid, decode_sid, type_table_signature  # fmt: skip
+        return decode_sid, (encode_sid(self), type_table_signature)
+
+    @property
+    def _fields(self) -> dict:
+        """
+        Returns a new fields dictionary, built from the keys and values tuples.
+        """
+        return dict(zip(self._keys, self._values))
 
     @property
     def type(self) -> str:
@@ -254,11 +416,32 @@ class TypedSid(StringSid):
             >>> Sid("hamlet/s/sq010/sh0010/anim").fields
             {'project': 'hamlet', 'type': 's', 'sequence': 'sq010', 'shot': 'sh0010', 'task': 'anim'}
 
+        The returned dictionary is a new copy, that can be modified.
+        To read the fields without copy, use fields_view.
+
         Returns:
             Sids data dictionary.
 
         """
-        return self._fields.copy()
+        return self._fields
+
+    @property
+    def fields_view(self) -> FieldsView:
+        """
+        Returns a read-only view on the Sids data dictionary, without copy.
+
+        Examples:
+
+            >>> Sid("hamlet/s/sq010/sh0010/anim").fields_view["shot"]
+            'sh0010'
+
+            >>> dict(Sid("hamlet/s/sq010").fields_view)
+            {'project': 'hamlet', 'type': 's', 'sequence': 'sq010'}
+
+        Returns:
+            Read-only mapping of the Sids fields.
+        """
+        return FieldsView(self._keys, self._values)
 
     @property
     def uri(self) -> str:
@@ -294,7 +477,41 @@ class TypedSid(StringSid):
             the "uri" representation of a Sid.
 
         """
-        return "{}{}".format(self._type + ":" if self._type else "", self.string)
+        if self._uri is None:
+            self._uri = f"{self._type}:{self._string}" if self._type else self._string
+        return self._uri
+
+    def __hash__(self, *args, **kwargs) -> int:
+        """
+        The hash is computed from the string (so a "lazy" Sid needs no resolving),
+        and is equal to the hash of the string, as a Sid is equal to its string.
+
+        Examples:
+
+            >>> {Sid("hamlet/s/sq010"), Sid("shot__sequence:hamlet/s/sq010")}
+            {Sid('shot__sequence:hamlet/s/sq010')}
+        """
+        if self._hash is None:
+            self._hash = hash(self._string)
+        return self._hash
+
+    def __eq__(self, other: object) -> bool:
+        """
+        Sids are equal if they have the same uri, so the same type and string.
+        A Sid is equal to a string, if its string is equal.
+
+        Examples:
+
+            >>> Sid("hamlet/s/sq010") == Sid("shot__sequence:hamlet/s/sq010")
+            True
+
+            >>> Sid("hamlet/s/sq010") == "hamlet/s/sq010"
+            True
+        """
+        if isinstance(other, TypedSid):
+            return other is self or (self._string == other._string and self._type == other._type)
+        else:
+            return str(other) == self._string
 
     @property
     def basetype(self) -> str | None:
@@ -319,6 +536,9 @@ class TypedSid(StringSid):
         if not self._type:
             info(f"This Sid has no type. ({self})")
             return None
+        meta = sid_type_meta.get(self._type)
+        if meta:
+            return meta.basetype
         try:
             result = self._type.split(conf.sidtype_keytype_sep)[0]
         except Exception as e:
@@ -364,10 +584,13 @@ class TypedSid(StringSid):
              string keytype
 
         """
-        if not self._fields:
+        if not self._keys:
             warning(f'Sid operation on an undefined Sid "{self.string}"')
             return None
-        return list(self._fields.keys() or [None])[-1]
+        meta = sid_type_meta.get(self._type)
+        if meta:
+            return meta.keytype
+        return self._keys[-1]
 
     @property
     def parent(self) -> Sid:
@@ -393,12 +616,12 @@ class TypedSid(StringSid):
             Returns an empty Sid, if the Sid is not "defined", or self if the Sid is already the root (has no parent).
 
         """
-        if not self._fields:
+        if not self._keys:
             warning(f'Sid operation on an undefined Sid "{self.string}"')
             return Sid()
-        if len(self._fields.keys()) == 1:
+        if len(self._keys) == 1:
             return self.copy()
-        parent_key = list(self._fields.keys())[-2]
+        parent_key = self._keys[-2]
         return self.get_as(parent_key)
 
     def __len__(self) -> int:
@@ -409,7 +632,7 @@ class TypedSid(StringSid):
             The amount of keys in the "fields" dictionary.
 
         """
-        return len(self._fields)
+        return len(self._keys)
 
     def get(self, key: str) -> str | None:
         """
@@ -428,11 +651,13 @@ class TypedSid(StringSid):
             Value of given key, in the "fields" data dictionary.
 
         """
-        if not self._fields:
+        if not self._keys:
             warning(f'Sid operation on an undefined Sid "{self.string}"')
             return None
 
-        return self._fields.get(key)
+        if key not in self._keys:
+            return None
+        return self._values[self._keys.index(key)]
 
     def get_as(self, key: str) -> Sid:
         """
@@ -458,18 +683,27 @@ class TypedSid(StringSid):
             Sid as given key
 
         """
-        if not self._fields:
+        if not self._keys:
             warning(f'Sid operation on an undefined Sid "{self.string}"')
             return Sid()  # Return type is always Sid.
 
-        if key not in self._fields:
+        if key not in self._keys:
             info(f'Key "{key}" not found in fields "{self._fields}"')
             return Sid()
 
         fields = {}
-        for k, v in self._fields.items():
+        for k, v in zip(self._keys, self._values):
             fields[k] = v
             if k == key:
+                # The type is looked up in the type metadata, if the parents are unique (no type detection needed).
+                _type = self._type
+                while _type and getattr(sid_type_meta.get(_type), "keytype", key) != key:
+                    _type = sid_type_meta[_type].parent
+                if _type:
+                    from spil.sid.core.sid_factory import typed_dict_to_sid  # fmt: skip
+                    new_sid = typed_dict_to_sid(_type, fields, check=True)
+                    if new_sid:
+                        return new_sid
                 return Sid(fields=fields)
 
         raise SpilException(f"[Sid][get_as] Unexpected error during {self}.get_as({key})")
@@ -520,7 +754,7 @@ class TypedSid(StringSid):
             A new Sid. Depending on the update, the type of the returned Sid can change.
 
         """
-        if self._string and not self._fields:
+        if self._string and not self._keys:
             warning(f'Sid operation on an undefined Sid "{self.string}"')
             return Sid()  # Return type is always Sid.
 
@@ -528,7 +762,7 @@ class TypedSid(StringSid):
         if query:
             return Sid("{}?{}".format(self.uri, query))
 
-        data_copy = self._fields.copy()
+        data_copy = self._fields
 
         if key:
             kwargs[key] = value
@@ -573,7 +807,9 @@ class TypedSid(StringSid):
             True if this Sid is a leaf, else False.
 
         """
-        return bool(self.get(conf.leaf_keys.get(self.basetype)))
+        meta = sid_type_meta.get(self._type)
+        leaf_key = meta.leaf_key if meta else conf.leaf_keys.get(self.basetype)
+        return bool(self.get(leaf_key))
         # TODO:
         # Better define "complete". Also in regard to a search Sid.
         # For example Sids containing /** are "complete".
@@ -592,7 +828,7 @@ class TypedSid(StringSid):
             string query
 
         """
-        return query_helper.to_string(self._fields)
+        return query_helper.to_string(self.fields_view)
 
     # IDEA: match_as(search_sid, key) for example, do the "seq" of both sids match (like is_relative_to ?)
     def match(self, search_sid: Sid | str) -> bool:
@@ -612,32 +848,35 @@ class TypedSid(StringSid):
             >>> Sid('hamlet/a/char/ophelia').match('hamlet/a/prop/*')
             False
 
+        The search Sid is unfolded and compiled once, and cached (see spil.sid.read.matcher.SidMatcher).
+        To filter many Sids, use SidMatcher.filter().
+
         Returns
             True if matched, else False
 
         """
+        from spil.sid.read.matcher import get_matcher  # fmt: skip
+        matcher = get_matcher(search_sid)
         # Identicals always match
-        if Sid(search_sid) == self:
+        if matcher.sid == self:
             return True
         # Should untyped sids be able to match ? Identical strings could match.
-        if not self._fields:
+        if not self._keys:
             warning(f'Cannot match check an undefined Sid: "{self.string}". Returning False.')
             return False
-        # To check the match, we search in a list with self as single element,
-        # and expect self to be found using given search_sid.
-        from spil import FindInList  # fmt: skip
-        fl = FindInList([self.string])
-        return fl.find_one(search_sid, as_sid=False) == self.string
+        return matcher.match_string(self._string)
 
 
 class PathSid(TypedSid):
     """
     The PathSid adds path resolving.
 
-    TODO: cache must be invalidated whenever (if ever) the default PathConfig changes.
+    Paths are cached. The cache is invalidated lazily when the config changes (see spil.util.caching).
     """
 
-    @cache
+    __slots__ = ()
+
+    @cache(subsystem="path")
     def path(self, config: Optional[str] = None) -> Path | None:
         """
         Returns the file path for the current Sid, as a pathlib.Path.
@@ -645,7 +884,8 @@ class PathSid(TypedSid):
 
         This method is cached.
         A path for a Sid is configured (not the result of a data lookup),
-        and is not supposed to change during runtime.
+        it only changes if the config changes (eg. the default path config),
+        in which case the cached path is recomputed.
 
         Example:
 
@@ -661,19 +901,24 @@ class PathSid(TypedSid):
 
             >>> Sid('bla/bla').path()
 
+            >>> conf.set('default_path_config', 'server', save=False)
+            >>> sid.path().relative_to(conf.default_sid_conf_data_path).parts[:3]
+            ('testing', 'SPIL_PROJECTS', 'SERVER')
+            >>> conf.set('default_path_config', 'local', save=False)
+
         Args:
             config: Name of the path config to be used, as configured.
 
         Returns:
             A path, if the Sid has a path, else None.
         """
-        if not self._fields:
+        if not self._keys:
             debug(f'Sid is undefined: "{self.string}". Returning None.')
             return None
         from spil.sid.pathops.fs_resolver import dict_to_path  # fmt: skip
         result = None
         try:
-            result = dict_to_path(self._fields, self._type, config=config)
+            result = dict_to_path(self.fields_view, self._type, config=config)
         except SpilException as e:
             debug(f"This Sid has no path (config_name: {config}). ({e})")
         return result
@@ -688,6 +933,8 @@ class DataSid(PathSid):
     # Could be handled using a default config_name, and/or be changed at runtime.
     """
 
+    __slots__ = ()
+
     def get_attr(self, attribute: str) -> Any | None:
         """
         Returns an attribute for the current sid.
@@ -741,7 +988,7 @@ class DataSid(PathSid):
         Returns:
             Sid or None
         """
-        if not self._fields:
+        if not self._keys:
             debug(f'Sid is undefined: "{self.string}". Returning Emptu Sid..')
             return Sid()
         if not key:
@@ -845,7 +1092,7 @@ class DataSid(PathSid):
         Returns:
             True if Sid exists, else False
         """
-        if not self._fields:
+        if not self._keys:
             debug(f'Sid is undefined: "{self.string}". Returning False')
             return False
         from spil import FindInAll  # fmt: skip
@@ -867,7 +1114,7 @@ class DataSid(PathSid):
             List of sibling Sids
 
         """
-        if key not in self._fields:
+        if key not in self._keys:
             info(f'[Sid][siblings_as] Key "{key}" not found in fields "{self._fields}"')
             return []
         search = self.get_as(key).get_with(key=key, value="*")
@@ -961,8 +1208,82 @@ class Sid(DataSid):
     The goal is to be able to Extend the Sid class to custom needs.
     """
 
+    __slots__ = ()
+
     _factory = ("spil.sid.core.sid_factory", "sid_factory")  # TODO: config_name, or better system.
 
+    @classmethod
+    def from_strings(cls, sids: Iterable[str | Sid], as_list: bool = True) -> List[Sid] | Iterator[Sid]:
+        """
+        Creates Sids from the given Sid objects or strings.
+        Equivalent to `[Sid(s) for s in sids]`, but faster for large amounts.
+
+        See spil.sid.core.sid_factory.sids_from_strings
+
+        Examples:
+
+            >>> Sid.from_strings(['hamlet/s/sq010', 'hamlet/a/char/ophelia'])
+            [Sid('shot__sequence:hamlet/s/sq010'), Sid('asset__asset:hamlet/a/char/ophelia')]
+
+        Args:
+            sids: an iterable of Sid objects or strings
+            as_list: if True (default) returns a list, else a generator
+
+        Returns:
+            List or generator of Sids
+        """
+        from spil.sid.core.sid_factory import sids_from_strings  # fmt: skip
+        result = sids_from_strings(sids)
+        return list(result) if as_list else result
+
+    @classmethod
+    def from_paths(cls, paths: Iterable, config: Optional[str] = None, as_list: bool = True) -> List[Sid] | Iterator[Sid]:
+        """
+        Creates Sids from the given paths.
+        Equivalent to `[Sid(path=p, config=config) for p in paths]`, but faster for large amounts.
+
+        See spil.sid.core.sid_factory.sids_from_paths
+
+        Args:
+            paths: an iterable of paths
+            config: config name for the path resolving
+            as_list: if True (default) returns a list, else a generator
+
+        Returns:
+            List or generator of Sids
+        """
+        from spil.sid.core.sid_factory import sids_from_paths  # fmt: skip
+        result = sids_from_paths(paths, config=config)
+        return list(result) if as_list else result
+
+    @classmethod
+    def lazy(cls, sid: str | Sid) -> Sid:
+        """
+        Creates a "lazy" Sid, that is resolved only when typed information (type, fields, uri, path...) is first needed.
+        Printing, hashing and comparing to strings does not resolve it.
+
+        Lazy Sids can be made the default for Sid("string") by setting spil.conf.lazy_sids to True.
+
+        See spil.sid.core.sid_factory.lazy_sid
+
+        Examples:
+
+            >>> sid = Sid.lazy('hamlet/s/sq010')
+            >>> print(sid)
+            hamlet/s/sq010
+
+            >>> sid
+            Sid('shot__sequence:hamlet/s/sq010')
+
+        Args:
+            sid: a Sid string
+
+        Returns:
+            Sid
+        """
+        from spil.sid.core.sid_factory import lazy_sid  # fmt: skip
+        return lazy_sid(sid)
+
 
 if __name__ == "__main__":
 
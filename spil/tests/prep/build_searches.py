@@ -20,7 +20,7 @@ def from_sid_build_searches(sid: Sid | str) -> Mapping[Sid, str]:
     searches = {}
     searches[_sid] = f"Plain {_sid.type} Sid"
 
-    for key in reversed(list(_sid.fields.keys())):
+    for key in reversed(list(_sid.fields_view)):
 
         search = _sid.get_as(key).get_with(key=key, value='**')
         searches[search] = f"Find all under {key} (**)"
@@ -35,12 +35,12 @@ def from_sid_build_searches(sid: Sid | str) -> Mapping[Sid, str]:
         search = _sid.get_with(key=key, value='*')
         searches[search] = f"{_sid.type} with all {key}"
 
-        for subkey in list(_sid.fields.keys()):
+        for subkey in _sid.fields_view:
             if subkey == key:
                 continue
             subsearch = search.get_with(key=subkey, value='*')
             searches[subsearch] = f"{search.type} with all {key} and {subkey}"
-            for subsubkey in list(_sid.fields.keys()):
+            for subsubkey in _sid.fields_view:
                 if (subsubkey == key) or (subsubkey == subkey):
                     continue
                 subsubsearch = subsearch.get_with(key=subsubkey, value='*')
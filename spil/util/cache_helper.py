@@ -14,24 +14,41 @@ If not, see <https://www.gnu.org/licenses/>.
 """
 
 
-# FIXME: this is work in progress
-def reload_lru_caches():
+from typing import Optional
+
+from spil.util.caching import clear_caches, cache_report
+
+
+def reload_lru_caches(subsystem: Optional[str] = None):
     """
-    Reloads all current lru caches.
+    Clears the registered caches (see spil.util.caching), of the given subsystem or all.
 
+    Args:
+        subsystem: eg. "sid", "path", "search", "data" or "resolver". If None, all caches are cleared.
+    """
+    import spil  # noqa, to ensure the cached functions are imported and registered.
+    clear_caches(subsystem)
 
+
+def print_cache_report(subsystem: Optional[str] = None):
     """
-    from spil.data.find_in_cache import get_sidcache
-    from spil.data.data import get_cached_attribute, get_data_source
-    from spil.sid.read.tools import unfold_search
-    from spil.sid.core.sid_resolver import sid_to_dict, sid_to_dicts
-    from spil.sid.core.fs_resolver import path_to_dict
+    Prints a report of the registered caches: size, hit ratio and memory estimate.
 
-    cached_functions = [get_cached_attribute, sid_to_dict, path_to_dict, get_data_source, unfold_search, get_sidcache, sid_to_dicts]
-    for f in cached_functions:
-        f.cache_clear()
+    Args:
+        subsystem: eg. "sid", "path", "search", "data" or "resolver". If None, all caches are reported.
+    """
+    import spil  # noqa, to ensure the cached functions are imported and registered.
+    for c in cache_report(subsystem):
+        memory = f"{c['memory'] / 1024:.0f} Ko" if c["memory"] is not None else "?"
+        print(f"{c['subsystem']:<10}{c['name']:<60}{c['currsize']:>8}/{c['maxsize']:<8} hit ratio: {c['hit_ratio']}  memory: {memory}")
 
 
 if __name__ == '__main__':
 
+    from spil import Sid, FindInAll
+    list(FindInAll().find('hamlet/a/char/*'))
+    Sid('hamlet/a/char/ophelia/model/v001/w/ma').path()
+
+    print_cache_report()
     reload_lru_caches()
+    print_cache_report()
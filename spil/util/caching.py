@@ -12,125 +12,494 @@ You should have received a copy of the GNU Lesser General Public License along w
 If not, see <https://www.gnu.org/licenses/>.
 """
 """
-Thank you Hugh Brown
-https://gist.github.com/hughdbrown
+Memoizing decorators used throughout spil.
+
+Initially derived from a minimal lru implementation by Hugh Brown
 https://gist.github.com/hughdbrown/bf5c63792d5f912a162bf012fb6b4527
 Also borrowed pieces from functool.py, Copyright (C) 2006-2013 Python Software Foundation
 
-This is a minimal but fast lru implementation.
+The caches are true LRU caches (least recently used entries are evicted first), with O(1) operations.
+Keys are built from the positional and the keyword arguments (names and values).
+
+Each cache keeps hit, miss and eviction counters, returned by cache_info().
+An optional time to live (ttl, in seconds) can be given.
+
+Cache sizes are configurable in spil.conf:
+- "cache_size" is the default maximum amount of entries per cache.
+- "cache_sizes" is a dict to set the size of a given cache, by name (eg. "spil.sid.core.sid_resolver.sid_to_dict")
+  or qualified function name (eg. "sid_to_dict").
+The size is read from the conf when the cache is first filled.
+A size given to the decorator has priority over the conf.
+
+Every cache is registered, by name, with a "subsystem" (eg. "sid", "path", "search", "data").
+The registry reports the caches sizes, hit ratios and memory estimates (cache_report),
+and clears caches by subsystem or all at once (clear_caches).
+Caches from other libraries (eg. resolva, using functools.lru_cache) can be added by register_cache.
+For the hottest paths, the Memo class is a plain dict cache, without LRU bookkeeping.
+
+Entries are tagged with the config generation (see bump_config_generation).
+When the config changes (spil.conf.set, pathconfig.reload_path_config), the generation is bumped,
+and older entries are lazily recomputed when accessed, instead of flushing the caches.
+
+Usage:
+
+    @lru_cache
+    def function(arg): ...
 
-TODO: replace for PY3 with the functools.lru_cache implementation.
-Note that the cache size needs to be high enough.
+    @lru_cache(maxsize=100, ttl=60, subsystem="sid")
+    def function(arg): ...
 """
+from typing import Callable, Optional, Any, Dict, List
+
+import sys
+import time
 from functools import wraps
+from collections import OrderedDict, namedtuple
 
-_max_size = 4096 * 2 * 2  # approx 40 Mo
-_max_size = 4096
+_max_size = 4096 * 4  # approx 40 Mo. Default if spil.conf.cache_size is not set.
 
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "evictions", "maxsize", "currsize"])
 
-def lru_cache(user_function):
-    cache = {}
+_kwd_mark = (object(),)  # separates positional from keyword arguments in the cache key
 
-    @wraps(user_function)
-    def wrapper(*args):
-        key = tuple(args)
-        if key not in cache:
-            # Validate we didn't exceed the max_size:
-            if len(cache) >= _max_size:
-                cache.popitem()
-                # cache.clear()
-            cache[key] = user_function(*args)
-        return cache[key]
+subsystems = ("sid", "path", "search", "data", "resolver")
+_default_subsystem = "other"
 
-    def cache_clear():
-        cache.clear()
+_registry: Dict[str, Any] = {}  # cache name -> cached function (with cache_info, cache_clear, cache_subsystem)
 
-    def cache_info():
-        from pprint import pformat
-        return pformat(cache)
+_config_generation = 0  # bumped on any config change
 
-    wrapper.cache_clear = cache_clear
-    wrapper.cache_info = cache_info
 
-    return wrapper
+def get_config_generation() -> int:
+    """
+    Returns the current config generation.
+    """
+    return _config_generation
 
 
-def lru_kw_cache(user_function):
-    cache = {}
-    #stats = [0, 0]  # hits,misses
+def bump_config_generation() -> int:
+    """
+    Increments the config generation, and returns it.
+    Cached entries from previous generations are considered stale, and recomputed when accessed.
+    Configured cache sizes are read again.
+
+    The caches of the "resolver" subsystem (the resolva.Resolver methods, functools.lru_cache) do not check the generation:
+    they are cleared.
+
+    Called by spil.conf.set and spil.sid.pathops.pathconfig.reload_path_config.
+
+    Examples:
+
+        >>> calls = []
+        >>> @lru_cache
+        ... def tracked(x):
+        ...     calls.append(x)
+        ...     return x
+        >>> tracked(1), tracked(1), len(calls)
+        (1, 1, 1)
+        >>> __ = bump_config_generation()
+        >>> tracked(1), len(calls)
+        (1, 2)
+
+        >>> from spil.sid.core.sid_resolver import get_resolver
+        >>> __ = get_resolver().resolve_one('hamlet/s/sq010', 'shot__sequence')
+        >>> __ = bump_config_generation()
+        >>> get_caches("resolver")["resolva.Resolver.resolve_one"].cache_info().currsize
+        0
+    """
+    global _config_generation
+    _config_generation += 1
+    clear_caches("resolver")  # not generation aware
+    return _config_generation
 
-    @wraps(user_function)
-    def wrapper(*args, **kwargs):
-        #return user_function(*args, **kwargs)
-        key = tuple(args) + tuple(kwargs)
-        if key not in cache:
-            #stats[1] += 1  # miss
-            # Validate we didn't exceed the max_size:
-            if len(cache) >= _max_size:
-                cache.popitem()
-                # cache.clear()
-            cache[key] = user_function(*args, **kwargs)
-        else:
-            #stats[0] += 1  # hit
-            pass
-        return cache[key]
 
-    def cache_clear():
-        cache.clear()
-        #stats[0] = stats[1] = 0
+def _make_key(args: tuple, kwargs: dict) -> tuple:
+    """
+    Builds a hashable cache key from positional and keyword arguments.
+    Keyword arguments are sorted, so their order does not matter.
 
-    def cache_info():
-        from pprint import pformat
-        return pformat(cache)
-        #return f"Hits: {stats[0]}/ Misses: {stats[1]} / Cache: {pformat(cache)}"
+    Examples:
 
-    wrapper.cache_clear = cache_clear
-    wrapper.cache_info = cache_info
-    return wrapper
+        >>> _make_key((1, 2), {}) == (1, 2)
+        True
+        >>> _make_key((1,), {'b': 2, 'a': 1}) == _make_key((1,), {'a': 1, 'b': 2})
+        True
+        >>> _make_key(('x',), {'do_extrapolate': True}) == _make_key(('x',), {'do_extrapolate': False})
+        False
+    """
+    if not kwargs:
+        return args
+    return args + _kwd_mark + tuple(sorted(kwargs.items()))
 
 
-def hit_cache(user_function):
+def get_configured_size(name: str, qualname: Optional[str] = None) -> int:
     """
-    A cache decorator that caches only if the wrapped function returns something.
-    This is useful on data that is often queried but rarely or not at all erased.
+    Returns the configured size for the cache with the given name.
+
+    Looks up spil.conf "cache_sizes" by name, then by qualified function name,
+    then spil.conf "cache_size", and defaults to _max_size.
 
-    TODO: add TTL mechanism
+    The conf is not imported here (the caches are created while the conf is loading),
+    it is read if it is already loaded.
+
+    Examples:
+
+        >>> get_configured_size("some.module.function") > 0
+        True
+    """
+    conf = sys.modules.get("spil.conf")
+    sizes = getattr(conf, "cache_sizes", None) or {}
+    size = sizes.get(name) or (qualname and sizes.get(qualname))
+    return int(size or getattr(conf, "cache_size", None) or _max_size)
+
+
+def _sizeof(obj: Any, seen: set, depth: int = 3) -> int:
+    """
+    Returns an estimate of the memory used by "obj", in bytes.
+    Follows containers (dict, list, tuple, set) up to the given depth.
+    Shared objects are counted once.
+    """
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj, 0)
+    if depth > 0:
+        if isinstance(obj, dict):
+            size += sum(_sizeof(k, seen, depth - 1) + _sizeof(v, seen, depth - 1) for k, v in obj.items())
+        elif isinstance(obj, (list, tuple, set, frozenset)):
+            size += sum(_sizeof(i, seen, depth - 1) for i in obj)
+    return size
+
+
+def register_cache(cached_function: Callable, subsystem: str = _default_subsystem, name: Optional[str] = None) -> None:
+    """
+    Registers a cached function, so it is included in cache_report() and clear_caches().
+
+    The function must have a "cache_clear" and a "cache_info" method (as with functools.lru_cache).
+    The caches from this module register themselves.
 
     Args:
-        user_function:
+        cached_function: the cached function
+        subsystem: the subsystem the cache belongs to, eg. "sid", "path", "search", "data"
+        name: the cache name. Defaults to the module and qualified name of the function.
+    """
+    name = name or getattr(cached_function, "cache_name", None) or f"{cached_function.__module__}.{cached_function.__qualname__}"
+    cached_function.cache_subsystem = subsystem  # type: ignore
+    _registry[name] = cached_function
+
+
+def get_caches(subsystem: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Returns the registered caches, as a dict of name: cached function.
+    If "subsystem" is given, only caches of this subsystem are returned.
+
+    Examples:
+
+        >>> "spil.sid.core.sid_resolver.sid_to_dict" in get_caches("sid")
+        True
+    """
+    return {name: f for name, f in _registry.items() if subsystem in (None, f.cache_subsystem)}
+
+
+def clear_caches(subsystem: Optional[str] = None) -> None:
+    """
+    Clears the registered caches of the given "subsystem", or all caches if subsystem is None.
+
+    Examples:
+
+        >>> from spil.sid.core.sid_resolver import sid_to_dict
+        >>> __ = sid_to_dict('hamlet/s/sq010')
+        >>> clear_caches("sid")
+        >>> sid_to_dict.cache_info().currsize
+        0
+    """
+    for f in get_caches(subsystem).values():
+        f.cache_clear()
+
+
+def cache_report(subsystem: Optional[str] = None, memory: bool = True) -> List[dict]:
+    """
+    Returns a report of the registered caches (of the given "subsystem", or all).
+
+    Each cache is described by a dict with the keys:
+    name, subsystem, hits, misses, evictions, hit_ratio, maxsize, currsize, memory (in bytes).
+
+    The memory is an estimate, only available for caches of this module (else None).
+    Computing it walks the cache entries, set "memory" to False to skip it.
+
+    Examples:
+
+        >>> report = cache_report("sid")
+        >>> sorted(report[0].keys())
+        ['currsize', 'evictions', 'hit_ratio', 'hits', 'maxsize', 'memory', 'misses', 'name', 'subsystem']
+
+    Args:
+        subsystem: a subsystem name, or None for all caches.
+        memory: if True (default) the memory is estimated.
 
     Returns:
+        list of dicts
+    """
+    report = []
+    for name, f in get_caches(subsystem).items():
+        info = f.cache_info()
+        calls = info.hits + info.misses
+        report.append(
+            {
+                "name": name,
+                "subsystem": f.cache_subsystem,
+                "hits": info.hits,
+                "misses": info.misses,
+                "evictions": getattr(info, "evictions", None),
+                "hit_ratio": round(info.hits / calls, 3) if calls else None,
+                "maxsize": info.maxsize,
+                "currsize": info.currsize,
+                "memory": f.cache_memory() if memory and hasattr(f, "cache_memory") else None,
+            }
+        )
+    return report
+
+
+def _cached(user_function: Callable, maxsize: Optional[int], ttl: Optional[float], only_hits: bool, subsystem: str) -> Callable:
+    """
+    Wraps the user_function with an LRU cache, and registers it.
+
+    Args:
+        user_function: the function to wrap
+        maxsize: maximum amount of entries. If None, the configured size is used.
+        ttl: time to live of the entries, in seconds. If None, entries do not expire.
+        only_hits: if True, only results that evaluate to True are cached.
+        subsystem: the subsystem the cache belongs to.
 
+    Returns:
+        The wrapper function
     """
-    cache = {}
+    cache: OrderedDict = OrderedDict()
+    stats = [0, 0, 0]  # hits, misses, evictions
+    HITS, MISSES, EVICTIONS = 0, 1, 2
+    name = f"{user_function.__module__}.{user_function.__qualname__}"
+    size: list = [maxsize, None]  # size, generation it was read at
+
+    def get_size() -> int:
+        if maxsize:
+            return maxsize
+        if size[1] != _config_generation:
+            size[:] = [get_configured_size(name, user_function.__qualname__), _config_generation]
+        return size[0]
+
+    def store(key, value):
+        if only_hits and not value:
+            return
+        if len(cache) >= get_size():
+            try:
+                cache.popitem(last=False)
+                stats[EVICTIONS] += 1
+            except KeyError:
+                pass
+        cache[key] = (value, _config_generation, time.monotonic() + ttl if ttl else None)
 
     @wraps(user_function)
     def wrapper(*args, **kwargs):
-        key = tuple(args) + tuple(kwargs)
-        if key not in cache:
-            # Validate we didn't exceed the max_size:
-            if len(cache) >= _max_size:
-                # Delete an item in the dict:
-                # print('lru_cache over size')
-                cache.popitem()  # does not make sens in PY2
-                # cache.clear()
-            returned = user_function(*args, **kwargs)
-            if returned:
-                cache[key] = returned
-            else:
-                return returned
-        return cache[key]
+        key = _make_key(args, kwargs)
+        try:
+            value, generation, expires = cache[key]
+        except KeyError:
+            pass
+        else:
+            if generation == _config_generation and (expires is None or time.monotonic() < expires):
+                cache.move_to_end(key)
+                stats[HITS] += 1
+                return value
+            cache.pop(key, None)  # stale entry
+
+        stats[MISSES] += 1
+        value = user_function(*args, **kwargs)
+        store(key, value)
+        return value
 
     def cache_clear():
         cache.clear()
+        stats[:] = [0, 0, 0]
 
-    def cache_info():
-        from pprint import pformat
-        return pformat(cache)
+    def cache_info() -> CacheInfo:
+        return CacheInfo(stats[HITS], stats[MISSES], stats[EVICTIONS], get_size(), len(cache))
 
-    wrapper.cache_clear = cache_clear
-    wrapper.cache_info = cache_info
+    def cache_memory() -> int:
+        return _sizeof(cache, set())
+
+    wrapper.cache_clear = cache_clear  # type: ignore
+    wrapper.cache_info = cache_info  # type: ignore
+    wrapper.cache_memory = cache_memory  # type: ignore
+    wrapper.cache_name = name  # type: ignore
+    register_cache(wrapper, subsystem, name)
     return wrapper
 
 
+def _decorator(user_function: Optional[Callable], maxsize: Optional[int], ttl: Optional[float], only_hits: bool, subsystem: str) -> Any:
+    """
+    Allows the decorators to be used bare (@lru_cache) or with arguments (@lru_cache(maxsize=100)).
+    """
+    if user_function is not None:
+        return _cached(user_function, maxsize, ttl, only_hits, subsystem)
+
+    def decorating_function(user_function):
+        return _cached(user_function, maxsize, ttl, only_hits, subsystem)
+
+    return decorating_function
+
+
+def lru_cache(
+    user_function: Optional[Callable] = None,
+    *,
+    maxsize: Optional[int] = None,
+    ttl: Optional[float] = None,
+    subsystem: str = _default_subsystem,
+):
+    """
+    LRU cache decorator.
+
+    Examples:
+
+        >>> @lru_cache(maxsize=2)
+        ... def double(x):
+        ...     return x * 2
+        >>> double(1), double(2), double(1), double(3)
+        (2, 4, 2, 6)
+        >>> double.cache_info()  # the least recently used entry (2) was evicted
+        CacheInfo(hits=1, misses=3, evictions=1, maxsize=2, currsize=2)
+
+    Args:
+        user_function: the decorated function (if used without arguments)
+        maxsize: maximum amount of entries. If None, the configured size is used.
+        ttl: time to live of the entries, in seconds. If None, entries do not expire.
+        subsystem: the subsystem the cache belongs to, eg. "sid", "path", "search", "data" (see clear_caches).
+    """
+    return _decorator(user_function, maxsize, ttl, only_hits=False, subsystem=subsystem)
+
+
+def lru_kw_cache(
+    user_function: Optional[Callable] = None,
+    *,
+    maxsize: Optional[int] = None,
+    ttl: Optional[float] = None,
+    subsystem: str = _default_subsystem,
+):
+    """
+    LRU cache decorator, for functions with keyword arguments.
+    Keyword argument names and values are part of the cache key.
+
+    Since lru_cache now also handles keyword arguments, this is the same decorator.
+    It is kept for compatibility.
+
+    Examples:
+
+        >>> @lru_kw_cache
+        ... def power(x, exp=2):
+        ...     return x ** exp
+        >>> power(3), power(3, exp=3), power(3, exp=2)
+        (9, 27, 9)
+        >>> power.cache_info().misses
+        3
+
+    Args:
+        user_function: the decorated function (if used without arguments)
+        maxsize: maximum amount of entries. If None, the configured size is used.
+        ttl: time to live of the entries, in seconds. If None, entries do not expire.
+        subsystem: the subsystem the cache belongs to, eg. "sid", "path", "search", "data" (see clear_caches).
+    """
+    return _decorator(user_function, maxsize, ttl, only_hits=False, subsystem=subsystem)
+
+
+def hit_cache(
+    user_function: Optional[Callable] = None,
+    *,
+    maxsize: Optional[int] = None,
+    ttl: Optional[float] = None,
+    subsystem: str = _default_subsystem,
+):
+    """
+    A cache decorator that caches only if the wrapped function returns something.
+    This is useful on data that is often queried but rarely or not at all erased.
+
+    Examples:
+
+        >>> found = {}
+        >>> @hit_cache(ttl=60)
+        ... def lookup(key):
+        ...     return found.get(key)
+        >>> lookup('a')
+        >>> found['a'] = 1
+        >>> lookup('a')
+        1
+        >>> lookup.cache_info().currsize
+        1
+
+    Args:
+        user_function: the decorated function (if used without arguments)
+        maxsize: maximum amount of entries. If None, the configured size is used.
+        ttl: time to live of the entries, in seconds. If None, entries do not expire.
+        subsystem: the subsystem the cache belongs to, eg. "sid", "path", "search", "data" (see clear_caches).
+    """
+    return _decorator(user_function, maxsize, ttl, only_hits=True, subsystem=subsystem)
+
+
+class Memo(dict):
+    """
+    A plain dictionary cache, for the hottest paths, where the LRU bookkeeping is too costly.
+
+    There is no eviction order: the memo is emptied when it is full.
+    It is also emptied when the config changes (see bump_config_generation).
+    Like the LRU caches, it is registered (see cache_report and clear_caches).
+
+    Examples:
+
+        >>> memo = Memo("doctest.memo", maxsize=2)
+        >>> memo.put("a", 1)
+        1
+        >>> memo.lookup("a"), memo.lookup("b")
+        (1, None)
+        >>> memo.cache_info()
+        CacheInfo(hits=1, misses=1, evictions=0, maxsize=2, currsize=1)
+        >>> __ = bump_config_generation()
+        >>> memo.lookup("a")
+    """
 
+    def __init__(self, name: str, maxsize: Optional[int] = None, subsystem: str = _default_subsystem):
+        super().__init__()
+        self.cache_name = name
+        self.maxsize = maxsize
+        self.generation = _config_generation
+        self.stats = [0, 0, 0]  # hits, misses, evictions
+        register_cache(self, subsystem, name)  # type: ignore
+
+    def lookup(self, key: Any) -> Any:
+        """
+        Returns the value stored for "key", or None.
+        """
+        if self.generation != _config_generation:
+            self.clear()
+            self.generation = _config_generation
+        value = self.get(key)
+        self.stats[value is None] += 1
+        return value
+
+    def put(self, key: Any, value: Any) -> Any:
+        """
+        Stores and returns the value.
+        """
+        if len(self) >= (self.maxsize or get_configured_size(self.cache_name)):
+            self.stats[2] += len(self)
+            self.clear()
+        self[key] = value
+        return value
+
+    def cache_clear(self) -> None:
+        self.clear()
+        self.stats = [0, 0, 0]
+
+    def cache_info(self) -> CacheInfo:
+        hits, misses, evictions = self.stats
+        return CacheInfo(hits, misses, evictions, self.maxsize or get_configured_size(self.cache_name), len(self))
+
+    def cache_memory(self) -> int:
+        return _sizeof(self, set())
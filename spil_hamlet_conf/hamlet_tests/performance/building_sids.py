@@ -0,0 +1,78 @@
+"""
+Compares building Sids from fields (as done by get_with, get_as, parent and FindInConstants),
+with the legacy composition (type detection, formatting, resolving back the string to get ordered fields),
+and the current factory (type detection, then a single format with the trusted constructor).
+"""
+from codetiming import Timer
+
+from spil import Sid
+from spil.sid.core import sid_resolver, sid_factory
+from spil.util.caching import clear_caches
+from spil_hamlet_conf.hamlet_scripts.example_sids import sids
+
+
+def legacy_dict_to_sid(fields):
+    _type = sid_resolver.dict_to_type(fields)
+    if not _type:
+        return None
+    sid = sid_resolver.dict_to_sid(fields, _type)
+    _type, fields = sid_resolver.sid_to_dict(sid, _type)
+    if not fields:
+        return None
+    new_sid = Sid(from_factory=True)
+    new_sid._init(string=sid, type=_type, fields=fields)
+    return new_sid
+
+
+def workload(sids):
+    # get_with / parent / get_as heavy workload, as fields
+    result = []
+    for sid in sids:
+        fields = sid.fields
+        while len(fields) > 1:
+            result.append(dict(fields))
+            if "version" in fields:
+                result.append(dict(fields, version="v999"))
+            fields.popitem()
+    return result
+
+
+def check(sids):
+    for fields in workload(sids):
+        legacy = legacy_dict_to_sid(fields)
+        new = sid_factory.dict_to_sid(fields)
+        assert legacy.uri == new.uri, (legacy, new)
+        assert list(legacy.fields.items()) == list(new.fields.items()), (legacy, new)
+
+
+def bench(function, all_fields, msg):
+    clear_caches()
+    t = Timer(logger=None)
+    with t:
+        for fields in all_fields:
+            function(fields)
+    print(f"{msg}: {t.last / len(all_fields) * 1000:.4f} ms/sid")
+    return t.last
+
+
+if __name__ == "__main__":
+
+    print("start")
+    sids = [s for s in Sid.from_strings(sids[:2000]) if s.type]
+    all_fields = workload(sids)
+    print(f"{len(all_fields)} Sids from fields")
+
+    check(sids)
+
+    legacy = bench(legacy_dict_to_sid, all_fields, "legacy composition")
+    fast = bench(sid_factory.dict_to_sid, all_fields, "trusted constructor")
+    print(f"x{legacy / fast:.1f}")
+
+    t = Timer(logger=None)
+    clear_caches()
+    with t:
+        for sid in sids:
+            sid.parent
+            sid.get_with(task="render")
+    print(f"parent + get_with: {t.last / len(sids) * 1000:.4f} ms/sid")
+    print("done")
@@ -0,0 +1,69 @@
+"""
+Compares searches on a multi-million Sid list,
+with FindInList (a regex match per item and per typed search),
+and FindInCatalog (dictionary encoded columns per type, vectorized masks, needs numpy).
+
+The list is built from the example Sids, made unique by renaming the assets, sequences and shots (all Sids are valid).
+The catalog build is measured separately, it is done once.
+"""
+from codetiming import Timer
+
+from spil import FindInList, FindInCatalog
+from spil_hamlet_conf.hamlet_scripts.example_sids import sids
+
+amount = 2000000
+
+searches = [
+    "hamlet/a/char/ophelia_7/model",
+    "hamlet/s/sq010/*/anim",
+    "hamlet/a/*/*/model/**/maya",
+    "hamlet/a/char/o*/*",
+    "hamlet/*/*/*",
+]
+
+
+def build_list(amount):
+    # unique valid sids, eg. "hamlet/a/char/ophelia_12/model", "hamlet/s/sq012/sh0110/anim"
+    base = [s.split("/") for s in sids if s.count("/") >= 3]
+    result = {}
+    i = 0
+    while len(result) < amount:
+        for parts in base:
+            parts = list(parts)
+            if parts[1] == "a":
+                parts[3] = f"{parts[3]}_{i}"
+            else:
+                parts[2] = f"sq{i % 1000:03d}"
+                parts[3] = f"sh{int(parts[3][2:]) + 100 * (i // 1000):04d}"
+            result["/".join(parts)] = None
+        i += 1
+    return list(result)[:amount]
+
+
+def bench(finder, search, msg):
+    t = Timer(logger=None)
+    with t:
+        found = list(finder.find(search, as_sid=False))
+    print(f"        {msg}: {t.last * 1000:.1f} ms ({len(found)} found)")
+    return t.last, found
+
+
+if __name__ == "__main__":
+
+    print("start")
+    searchlist = build_list(amount)
+    print(f"{amount} sids")
+
+    scanning = FindInList(searchlist)
+    t = Timer(logger=None)
+    with t:
+        catalog = FindInCatalog(searchlist)
+    print(f"    catalog build: {t.last:.1f} s - {catalog}")
+
+    for search in searches:
+        print(f'    "{search}"')
+        scan_time, expected = bench(scanning, search, "list scan")
+        catalog_time, found = bench(catalog, search, "catalog")
+        assert expected == found, search
+        print(f"        x{scan_time / catalog_time:.0f}")
+    print("done")
@@ -0,0 +1,103 @@
+"""
+Compares the configuration work done by each process (as on a render farm), with and without the configuration snapshot.
+
+Without snapshot, each process extrapolates the sid templates, builds the indexes and type metadata,
+and creates the sid and path resolvers (building and compiling their regexes).
+With the snapshot (see spil.conf.snapshot), these are loaded from a pickle file, and only the used regexes are compiled.
+
+The configuration work is measured in process (the regex cache is purged between runs),
+the process startup (import spil, first Sid and path) is measured in new interpreters, it is more noisy.
+"""
+import os
+import re
+import subprocess
+import sys
+import tempfile
+
+from codetiming import Timer
+from resolva import Resolver
+
+from spil import conf
+from spil.conf import sid_conf_load
+from spil.conf.util import extrapolate_templates, pattern_replacing, build_template_index, build_keyset_index, build_type_meta
+from spil.conf.snapshot import build_snapshot, read_snapshot, restore_resolver
+from spil.sid.pathops.pathconfig import get_path_config
+
+runs = 100
+
+sid = "hamlet/a/char/ophelia/model/v001/w/ma"
+path = "/HAMLET/PROD/ASSETS/char/ophelia/model/v001/char_ophelia_model_WORK_v001.ma"
+
+code = f"""
+import time
+t = time.perf_counter()
+from spil import Sid
+Sid('{sid}').path()
+print(time.perf_counter() - t)
+"""
+
+
+def use(sid_resolver, path_resolver):
+    # resolves a sid and a path, as a short job would
+    sid_resolver.resolve_one(sid, "asset__file")
+    path_resolver.resolve_first(path)
+
+
+def compute(sid_module, path_config):
+    sid_templates = extrapolate_templates(sid_module.sid_templates, sid_module.to_extrapolate)
+    pattern_replacing(sid_templates, sid_module.key_patterns)
+    build_template_index(sid_templates)
+    build_keyset_index(sid_templates)
+    build_type_meta(sid_templates, sid_module.leaf_keys)
+    sid_resolver = Resolver("sid", sid_templates, check_duplicate_placeholders=False)
+    path_resolver = Resolver(path_config.name, path_config.path_templates)
+    use(sid_resolver, path_resolver)
+
+
+def load(snapshot_path, path_config):
+    entries = read_snapshot(snapshot_path)
+    sid_templates, sid_template_index, sid_keyset_index, sid_type_meta, sid_resolver_state = entries["spil_sid_conf"][1]
+    sid_resolver = restore_resolver(sid_resolver_state)
+    path_resolver = restore_resolver(entries[path_config.name][1])
+    use(sid_resolver, path_resolver)
+
+
+def bench(function, *args):
+    # best of the runs, in ms
+    t = Timer(logger=None)
+    times = []
+    for _ in range(runs):
+        re.purge()
+        Resolver.resolve_one.cache_clear()
+        Resolver.resolve_first.cache_clear()
+        with t:
+            function(*args)
+        times.append(t.last)
+    return min(times) * 1000
+
+
+def startup_ms(env):
+    # best of a few runs, in new interpreters
+    outputs = [subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, env=env).stdout for _ in range(10)]
+    # the last output line is the timing (the demo configuration message may be printed before)
+    return min(float(out.split()[-1]) for out in outputs) * 1000
+
+
+if __name__ == "__main__":
+
+    print("start")
+    snapshot_path = os.path.join(tempfile.mkdtemp(), "spil_conf.snapshot")
+    build_snapshot(snapshot_path)
+    path_config = get_path_config(conf.default_path_config)
+
+    computed = bench(compute, sid_conf_load.module, path_config)
+    loaded = bench(load, snapshot_path, path_config)
+    print(f"configuration work: computed {computed:.2f} ms - from snapshot {loaded:.2f} ms - x{computed / loaded:.1f}")
+
+    env = dict(os.environ)
+    env.pop("SPIL_CONF_SNAPSHOT", None)
+    computed = startup_ms(env)
+    env["SPIL_CONF_SNAPSHOT"] = snapshot_path
+    loaded = startup_ms(env)
+    print(f"process startup: computed {computed:.1f} ms - from snapshot {loaded:.1f} ms")
+    print("done")
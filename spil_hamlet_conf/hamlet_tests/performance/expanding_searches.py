@@ -0,0 +1,116 @@
+"""
+Compares expanding "**" searches (spil.sid.core.utils.expand),
+with the legacy implementation (loop over all types, test strings resolved against all candidate templates),
+and the table driven implementation (candidate types by amount of segments, precomputed at config load).
+
+The caches are cleared before each search, so that the resolver caches are not hit.
+"""
+from codetiming import Timer
+
+from spil import Sid
+from spil.conf import sid_type_meta  # type: ignore
+from spil.sid.core.sid_resolver import sid_to_dicts
+from spil.sid.core.utils import expand
+from spil.util.caching import clear_caches
+from spil.util.exception import SpilException
+
+shapes = [
+    "hamlet/*/**",
+    "*/**/maya",
+    "hamlet/*/**/maya",
+    "hamlet/s/sq{i:03d}/**",
+    "hamlet/s/sq{i:03d}/sh{i:04d}/**/mov",
+    "hamlet/a/char/asset{i}/**/abc",
+]
+
+
+def legacy_expand(sid, do_extrapolate=False):
+    # previous implementation
+    sid = str(sid)
+
+    if not sid.count("/**"):
+        raise SpilException("Nothing to expand (not compared).")
+
+    if sid.count("?"):
+        sid, query = sid.split("?", 1)
+    else:
+        query = ""
+
+    root = sid.split("/**")[0]
+    root_meta = sid_type_meta.get(Sid(root).type)
+    basetype = root_meta.basetype if root_meta else None
+    if not basetype:
+        raise SpilException(f'The Search Sids "{sid}" root "{root}" cannot be typed.')
+
+    leaf_key = root_meta.leaf_key
+
+    tested = []
+    found = []
+    result = []
+    for key, meta in sid_type_meta.items():
+        if key in found:
+            continue
+        if do_extrapolate or meta.keytype == leaf_key:
+            count = meta.segments - 1
+            current = sid.count("/")
+            needed = count - current + 1
+            test = sid.replace("/**", "/*" * needed)
+            if test in tested:
+                continue
+            else:
+                tested.append(test)
+            matching = sid_to_dicts(test)
+            for __type, data in matching.items():
+                found.append(__type)
+                if data and (do_extrapolate or sid_type_meta[__type].keytype == leaf_key):
+                    if query:
+                        new_sid = Sid("{}:{}?{}".format(__type, test, query))
+                    else:
+                        new_sid = Sid(__type + ":" + test)
+                    result.append(new_sid)
+        else:
+            continue
+
+    return sorted(list(set(result)))
+
+
+def build_searches(amount):
+    return sorted({shape.format(i=i) for i in range(amount) for shape in shapes})
+
+
+def check(searches):
+    for search in searches:
+        for do_extrapolate in (False, True):
+            expected = legacy_expand(search, do_extrapolate)
+            result = expand(search, do_extrapolate)
+            assert sorted(s.uri for s in expected) == sorted(s.uri for s in result), search
+
+
+def bench(function, searches, msg, do_extrapolate=False):
+    t = Timer(logger=None)
+    total = 0.0
+    for search in searches:
+        clear_caches()  # each search is resolved from scratch
+        with t:
+            function(search, do_extrapolate)
+        total += t.last
+    print(f"{msg}: {total / len(searches) * 1000:.4f} ms/search")
+    return total
+
+
+if __name__ == "__main__":
+
+    print("start")
+    searches = build_searches(20)
+    check(searches)
+
+    for shape in shapes:
+        searches = [shape.format(i=i) for i in range(20)]
+        print(f'"{shape}"')
+        legacy = bench(legacy_expand, searches, "    legacy")
+        table = bench(expand, searches, "    table")
+        print(f"    x{legacy / table:.1f}")
+        legacy = bench(legacy_expand, searches, "    legacy, extrapolated", do_extrapolate=True)
+        table = bench(expand, searches, "    table, extrapolated", do_extrapolate=True)
+        print(f"    x{legacy / table:.1f}")
+    print("done")
@@ -0,0 +1,80 @@
+"""
+Set and dict heavy workloads on 1M Sids, as done by the Finders (deduplication, FindInAll, FindInConstants, extrapolate).
+
+Compares the current Sid, which computes its hash, uri and search flag once,
+with the previous implementation (hash of the repr, equality on rebuilt uris, search symbols scanned on every call).
+
+The Sids are created with the typed constructor, so that every Sid is a new object
+(Sid() returns cached objects for identical strings).
+"""
+from codetiming import Timer
+
+from spil import Sid, conf
+from spil.sid.core.sid_factory import typed_dict_to_sid
+from spil_hamlet_conf.hamlet_scripts.example_sids import sids
+
+
+class LegacySid(Sid):
+    # previous hash, equality and search flag implementations.
+    __slots__ = ()
+
+    @property
+    def uri(self):
+        return "{}{}".format(self._type + ":" if self._type else "", self.string)
+
+    def is_search(self):
+        return any(s in str(self) for s in conf.search_symbols)
+
+    def __hash__(self, *args, **kwargs):
+        return hash(repr(self))
+
+    def __eq__(self, other):
+        if isinstance(other, Sid):
+            return str(other.uri) == str(self.uri)
+        else:
+            return str(other) == str(self)
+
+
+def build_sids(amount):
+    typed = [s for s in Sid.from_strings(sids[:5000]) if s.type]
+    data = [(s.type, s.fields, s.string) for s in (typed * (amount // len(typed) + 1))[:amount]]
+    current = [typed_dict_to_sid(_type, fields, string=string) for _type, fields, string in data]
+    legacy = []
+    for _type, fields, string in data:
+        sid = LegacySid(from_factory=True)
+        sid._init(string=string, type=_type, fields=fields)
+        legacy.append(sid)
+    return current, legacy
+
+
+def workload(sids):
+    result = set(sids)  # deduplication
+    index = {sid: i for i, sid in enumerate(sids)}  # dict
+    found = sum(1 for sid in sids if sid in result)  # lookups
+    searches = sum(1 for sid in sids if sid.is_search())  # search flags
+    return len(result), len(index), found, searches
+
+
+def bench(sids, msg, repeat=2):
+    t = Timer(logger=None)
+    results = []
+    for i in range(repeat):  # the second run uses the values computed by the first
+        with t:
+            result = workload(sids)
+        results.append(t.last)
+    print(f"{msg}: {' / '.join(f'{r:.2f}' for r in results)} s")
+    return result, results[-1]
+
+
+if __name__ == "__main__":
+
+    print("start")
+    amount = 1000000
+    current, legacy = build_sids(amount)
+    print(f"{amount} Sids")
+
+    legacy_result, legacy_time = bench(legacy, "previous hash, eq and is_search")
+    result, current_time = bench(current, "cached hash, uri and is_search")
+    assert result == legacy_result, (result, legacy_result)
+    print(f"x{legacy_time / current_time:.1f}")
+    print("done")
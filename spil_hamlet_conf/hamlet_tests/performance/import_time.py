@@ -0,0 +1,53 @@
+"""
+Measures the startup cost of "import spil" in a new interpreter,
+and the cost of the first Sid, which imports the Sid classes and creates the "sid" resolver.
+
+"import spil" only loads the configuration, the public classes are imported on first access.
+The heaviest imports are listed using python -X importtime.
+
+The time budget is indicative, it depends on the machine.
+"""
+import re
+import subprocess
+import sys
+
+budget_ms = 100
+runs = 5
+
+line_re = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)")
+
+
+def timed(code, setup=""):
+    # best of a few runs, in new interpreters (the module cache is empty)
+    script = f"import time\n{setup}\nt = time.perf_counter()\n{code}\nprint(time.perf_counter() - t)"
+    outputs = [subprocess.run([sys.executable, "-c", script], capture_output=True, text=True).stdout for _ in range(runs)]
+    # the last output line is the timing (the demo configuration message may be printed before)
+    return min(float(out.split()[-1]) for out in outputs) * 1000
+
+
+def heaviest_imports(code, amount=8):
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code], capture_output=True, text=True)
+    times = []
+    for line in result.stderr.splitlines():
+        match = line_re.match(line)
+        if match:
+            self_us, cumulated_us, indent, module = match.groups()
+            times.append((int(cumulated_us), module))
+    return sorted(times, reverse=True)[:amount]
+
+
+if __name__ == "__main__":
+
+    print("start")
+    spil_ms = timed("import spil")
+    print(f'"import spil": {spil_ms:.1f} ms (budget {budget_ms} ms) - {"OK" if spil_ms <= budget_ms else "over budget"}')
+
+    print("Heaviest imports (cumulated):")
+    for cumulated_us, module in heaviest_imports("import spil"):
+        print(f"    {module:<30} {cumulated_us / 1000:.1f} ms")
+
+    print(f'"from spil import Sid": {timed("from spil import Sid"):.1f} ms')
+    first_sid = timed("spil.Sid('hamlet/s/sq010/sh0010/anim/v001/w/ma')", setup="import spil")
+    print(f"first Sid: {first_sid:.1f} ms")
+    print(f'"from spil import FindInAll": {timed("from spil import FindInAll"):.1f} ms')
+    print("done")
@@ -0,0 +1,66 @@
+"""
+Compares FindInList searches on big Sid lists (as used by FindInCache),
+with the list scan (a regex match per item and per typed search), and the segment trie index (do_index=True).
+
+The lists are built from the example Sids, made unique by suffixing the asset or shot segment.
+The index build is measured separately, it is done once, at construction.
+"""
+from codetiming import Timer
+
+from spil import FindInList
+from spil_hamlet_conf.hamlet_scripts.example_sids import sids
+
+searches = [
+    "hamlet/a/char/ophelia_7/model",
+    "hamlet/s/sq010/*/anim",
+    "hamlet/a/*/*/model/**/maya",
+    "hamlet/a/char/ophelia_3/**",
+    "hamlet/*/*/*",
+]
+
+
+def build_list(amount):
+    # unique sids, by suffixing segment 3 (asset or shot), eg. "hamlet/a/char/ophelia_12/model"
+    base = [s for s in sids if s.count("/") >= 3]
+    result = []
+    i = 0
+    while len(result) < amount:
+        for sid in base:
+            parts = sid.split("/")
+            parts[3] = f"{parts[3]}_{i}"
+            result.append("/".join(parts))
+        i += 1
+    return result[:amount]
+
+
+def bench(finder, search, msg, runs=3):
+    t = Timer(logger=None)
+    times = []
+    for _ in range(runs):
+        with t:
+            found = list(finder.find(search, as_sid=False))
+        times.append(t.last)
+    print(f"        {msg}: {min(times) * 1000:.1f} ms ({len(found)} found)")
+    return min(times), found
+
+
+if __name__ == "__main__":
+
+    print("start")
+    for amount in (100000, 1000000):
+        searchlist = build_list(amount)
+        print(f"{amount} sids")
+
+        scanning = FindInList(searchlist)
+        t = Timer(logger=None)
+        with t:
+            indexed = FindInList(searchlist, do_index=True)
+        print(f"    index build: {t.last * 1000:.0f} ms")
+
+        for search in searches:
+            print(f'    "{search}"')
+            scan_time, expected = bench(scanning, search, "scan", runs=1)
+            index_time, found = bench(indexed, search, "index")
+            assert expected == found, search
+            print(f"        x{scan_time / index_time:.0f}")
+    print("done")
@@ -11,6 +11,36 @@ def instance_sids(sids, msg=""):
     bw = t.last / float(len(sids)) * 1000
     print(f"{msg}: {bw} ms/sid")
 
+def instance_sids_batch(sids, msg=""):
+    t = Timer()
+    t.start()
+    result = Sid.from_strings(sids)
+    t.stop()
+    bw = t.last / float(len(sids)) * 1000
+    print(f"{msg}: {bw} ms/sid (batch)")
+    return result
+
+def clear_caches():
+    # so that no run profits from the caches of the previous (including the resolver and the Sid string memo).
+    from spil.util.caching import clear_caches as clear_registered_caches
+    clear_registered_caches()
+
+def compare_throughput(sids):
+    t = Timer(logger=None)
+
+    clear_caches()
+    with t:
+        per_item = [Sid(s) for s in sids]
+    loop = len(sids) / t.last
+
+    clear_caches()
+    with t:
+        batch = Sid.from_strings(sids)
+    batched = len(sids) / t.last
+
+    assert [s.type for s in per_item] == [s.type for s in batch]
+    print(f"{len(sids)} sids - per item loop: {loop:.0f} sids/s - batch: {batched:.0f} sids/s - x{batched / loop:.1f}")
+
 if __name__ == "__main__":
 
     # Important note:
@@ -25,4 +55,13 @@ if __name__ == "__main__":
     for i in range(5):  # amount of cycles
         instance_sids(sids, i)
     # instance_sids(sids, "Cached")
-    print("done")
\ No newline at end of file
+
+    # Sid objects passed to Sid() are returned as is (fast path)
+    instance_sids([Sid(s) for s in sids], "From Sid objects")
+
+    # Batch creation, to compare with the per item loop
+    for i in range(5):
+        instance_sids_batch(sids, i)
+
+    compare_throughput(sids)
+    print("done")
@@ -0,0 +1,46 @@
+"""
+Filters 50k Sids against search Sids, as done in UIs.
+
+Compares the previous Sid.match (a FindInList search per Sid), with a compiled SidMatcher (unfolded and compiled once).
+"""
+from codetiming import Timer
+
+from spil import Sid, FindInList, SidMatcher
+from spil_hamlet_conf.hamlet_scripts.example_sids import sids
+
+searches = ["hamlet/a/*/*/model", "hamlet/s/**/movie?version=>", "hamlet/*/**", "hamlet/a,s/*"]
+
+
+def legacy_match(sid, search_sid):
+    # previous Sid.match implementation
+    if Sid(search_sid) == sid:
+        return True
+    if not sid:
+        return False
+    return FindInList([sid.string]).find_one(search_sid, as_sid=False) == sid.string
+
+
+if __name__ == "__main__":
+
+    print("start")
+    all_sids = Sid.from_strings(sids)
+    all_sids = (all_sids * (50000 // len(all_sids) + 1))[:50000]
+    sample = all_sids[::50]  # the legacy match is too slow for all Sids
+    print(f"{len(all_sids)} Sids")
+
+    t = Timer(logger=None)
+    for search in searches:
+        with t:
+            legacy = [s for s in sample if legacy_match(s, search)]
+        legacy_time = t.last / len(sample) * len(all_sids)
+
+        with t:
+            matcher = SidMatcher(search)
+            found = matcher.filter(all_sids)
+        assert legacy == matcher.filter(sample)
+        print(f"{search}: {len(found)} found - Sid.match (previous, extrapolated) {legacy_time:.2f} s - SidMatcher.filter {t.last:.3f} s - x{legacy_time / t.last:.0f}")
+
+    with t:
+        found = [s for s in all_sids if s.match(searches[0])]
+    print(f"Sid.match (cached matcher): {t.last:.3f} s")
+    print("done")
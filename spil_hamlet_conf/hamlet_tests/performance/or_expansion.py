@@ -0,0 +1,127 @@
+"""
+Compares the "or" operator expansion (spil.sid.read.unfolders.or_op),
+with the legacy implementation (lists built group by group, duplicates removed by list lookup),
+and the lazy implementation (generated one by one with itertools.product, bounded by conf.search_or_limit).
+
+The searches are consumed one by one, as the next unfolder (expand) does.
+Memory is the peak allocated while expanding (tracemalloc).
+"""
+import tracemalloc
+
+from codetiming import Timer
+
+from spil import conf
+from spil.conf import sip, ors
+from spil.sid.core import query_helper
+from spil.sid.read.unfolders.or_op import or_op
+
+groups = 5
+
+
+def legacy_or_op(sid):
+    # previous implementation
+    sid = str(sid)
+    if not sid.count(ors):
+        return [sid]
+
+    if sid.count("?"):
+        sid, query = sid.split("?", 1)
+    else:
+        query = ""
+
+    sids = legacy_or_on_path(sid)
+
+    result = []
+    if query:
+        uris = legacy_or_on_query(query)
+        for s in sids:
+            for u in uris:
+                result.append("{}?{}".format(s, u))
+    else:
+        result = sids
+
+    return result
+
+
+def legacy_or_on_path(sid):
+    _start = "--start--"
+    parts = sid.split(sip)
+    found = [_start]
+    for part in parts:
+        current = found.copy()
+        if ors in part:
+            for alt in part.split(ors):
+                alt = alt.strip()
+                for sid in current.copy():
+                    new = sid + sip + alt
+                    if sid in found:
+                        found[found.index(sid)] = new
+                    else:
+                        found.append(new)
+        else:
+            for sid in found.copy():
+                new = sid + sip + part
+                found[found.index(sid)] = new
+
+    result = []
+    for sid in found:
+        if sid not in result:
+            result.append(sid.replace(_start + sip, ""))
+    return result
+
+
+def legacy_or_on_query(query):
+    query_dict = query_helper.to_dict(query)
+    result = [query_dict.copy()]
+    for key, value in query_dict.items():
+        if value.count(ors):
+            new_result = []
+            for i in value.split(ors):
+                for d in result.copy():
+                    new_dict = d.copy()
+                    new_dict[key] = i
+                    new_result.append(new_dict)
+            result = new_result
+    return [query_helper.to_string(d) for d in result]
+
+
+def build_search(options):
+    # eg. "hamlet/s/sq000,sq001/sh0000,sh0001/anim,layout/v000,v001/w/ma?version=1,2"
+    values = [",".join(f"{prefix}{i:03d}" for i in range(options)) for prefix in ("sq", "sh", "task", "v")]
+    query = ",".join(str(i) for i in range(options))
+    return f"hamlet/s/{values[0]}/{values[1]}/{values[2]}/{values[3]}/w/ma?state={query}"
+
+
+def check(search):
+    assert sorted(set(legacy_or_op(search))) == sorted(set(or_op(search))), search
+
+
+def bench(function, search, msg):
+    tracemalloc.start()
+    t = Timer(logger=None)
+    with t:
+        count = sum(1 for _ in function(search))
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    print(f"{msg}: {count} searches, {t.last * 1000:.1f} ms, peak {peak / 1024:.0f} KiB")
+    return t.last, peak
+
+
+if __name__ == "__main__":
+
+    print("start")
+    check(build_search(3))
+
+    conf.search_or_limit = None
+    for options in (3, 5, 7):
+        search = build_search(options)
+        print(f"{options} options per group ({options ** groups} searches)")
+        legacy_time, legacy_peak = bench(legacy_or_op, search, "    legacy")
+        lazy_time, lazy_peak = bench(or_op, search, "    lazy")
+        print(f"    time x{legacy_time / lazy_time:.1f} - memory x{legacy_peak / lazy_peak:.0f}")
+
+    conf.search_or_limit = 10000
+    search = build_search(12)
+    print(f"12 options per group ({12 ** groups} searches), limited to {conf.search_or_limit}")
+    bench(or_op, search, "    lazy, limited")
+    print("done")
@@ -0,0 +1,81 @@
+"""
+Round trip of 100k Sids through a ProcessPoolExecutor (sent to worker processes, and sent back).
+
+Compares:
+- the previous pickling: the full object state, and the Sid factory called on unpickling
+- the compact pickling (Sid.__reduce__, a type id and a tuple of values, see spil.sid.core.sid_codec)
+- the batch encoding (sid_codec.encode_sids / decode_sids)
+"""
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+
+from codetiming import Timer
+
+from spil import Sid
+from spil.sid.core import sid_codec
+from spil.sid.core.sid_factory import typed_dict_to_sid
+from spil_hamlet_conf.hamlet_scripts.example_sids import sids
+
+
+class LegacySid(Sid):
+    # previous pickling: the object state (slots), with the factory called on unpickling.
+    __slots__ = ()
+    __reduce__ = object.__reduce__
+
+
+def build_sids(amount, cls=Sid):
+    typed = [s for s in Sid.from_strings(sids) if s.type]
+    result = []
+    for s in (typed * (amount // len(typed) + 1))[:amount]:
+        if cls is Sid:
+            result.append(typed_dict_to_sid(s.type, s.fields, string=s.string))
+        else:
+            sid = cls(from_factory=True)
+            sid._init(string=s.string, type=s.type, fields=s.fields)
+            result.append(sid)
+    return result
+
+
+def echo(chunk):
+    return chunk
+
+
+def echo_encoded(data):
+    # the worker decodes the Sids, and encodes them to send them back
+    return sid_codec.encode_sids(sid_codec.decode_sids(data))
+
+
+def chunks(items, size):
+    return [items[i: i + size] for i in range(0, len(items), size)]
+
+
+def round_trip(executor, sids, msg, encoded=False):
+    t = Timer(logger=None)
+    with t:
+        if encoded:
+            payloads = [sid_codec.encode_sids(chunk) for chunk in chunks(sids, 10000)]
+            result = [sid for data in executor.map(echo_encoded, payloads) for sid in sid_codec.decode_sids(data)]
+        else:
+            result = [sid for chunk in executor.map(echo, chunks(sids, 10000)) for sid in chunk]
+    size = len(pickle.dumps(sid_codec.encode_sids(sids) if encoded else sids))
+    assert [s.uri for s in result] == [s.uri for s in sids]
+    print(f"{msg}: {t.last:.2f} s - {size / len(sids):.0f} bytes/sid pickled")
+    return t.last
+
+
+if __name__ == "__main__":
+
+    print("start")
+    amount = 100000
+    current = build_sids(amount)
+    legacy = build_sids(amount, cls=LegacySid)
+    print(f"{amount} Sids")
+
+    with ProcessPoolExecutor(4) as executor:
+        executor.map(echo, range(4))  # starts the workers
+        legacy_time = round_trip(executor, legacy, "object state pickling")
+        compact_time = round_trip(executor, current, "compact pickling")
+        batch_time = round_trip(executor, current, "batch encoding", encoded=True)
+
+    print(f"compact x{legacy_time / compact_time:.1f} - batch x{legacy_time / batch_time:.1f}")
+    print("done")
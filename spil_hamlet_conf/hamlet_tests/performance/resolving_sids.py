@@ -0,0 +1,110 @@
+"""
+Compares the cost of resolving a Sid string (string to dict),
+by matching every template (Resolver.resolve_first)
+or only the candidate templates found in the template dispatch index (conf.util.build_template_index),
+for growing amounts of templates.
+
+Also compares the cost of typing a fields dict (dict to type),
+by formatting with every template (Resolver.format_all)
+or only with the candidates found in the keyset index (conf.util.build_keyset_index).
+"""
+import random
+
+from codetiming import Timer
+from resolva import Resolver
+
+import spil  # noqa, needed to load the conf
+from spil.conf.util import extrapolate_templates, build_template_index, get_candidate_types
+from spil.conf.util import build_keyset_index, get_keyset_candidates
+
+basetype_template = "{{project:(hamlet|\\*|\\>)}}/{{type:(t{i}|\\*|\\>)}}/{{sequence:(sq\\d\\d\\d|\\*|\\>)}}/{{shot}}/{{task}}/{{version:(v\\d\\d\\d|\\*|\\>)}}/{{state:(w|p|\\*|\\>)}}/{{ext:(ma|mb|\\*|\\>)}}"
+
+
+def build_templates(basetypes):
+    templates = {f"t{i}__file": basetype_template.format(i=i) for i in range(basetypes)}
+    return extrapolate_templates(templates, list(templates.keys()))
+
+
+def build_sids(basetypes, amount):
+    # unique strings, so that the resolver lru caches are not hit.
+    sids = []
+    for n in range(amount):
+        i = random.randrange(basetypes)
+        depth = random.randint(2, 8)
+        parts = ["hamlet", f"t{i}", f"sq{n % 1000:03d}", f"sh{n:06d}", "anim", "v001", "w", "ma"]
+        sids.append("/".join(parts[:depth]))
+    return sids
+
+
+def resolve_all_templates(r, sids):
+    for s in sids:
+        r.resolve_first(s)
+
+
+def resolve_indexed(r, index, sids):
+    for s in sids:
+        for _type in get_candidate_types(index, s):
+            if r.resolve_one(s, _type):
+                break
+
+
+def bench(basetypes, amount=5000):
+    templates = build_templates(basetypes)
+    r = Resolver(f"bench_{basetypes}", templates, check_duplicate_placeholders=False)
+    index = build_template_index(templates)
+    sids = build_sids(basetypes, amount)
+
+    t = Timer(logger=None)
+    with t:
+        resolve_all_templates(r, sids)
+    legacy = t.last / amount * 1000
+
+    # new strings, to avoid the resolver cache
+    sids = [s.replace("/sh", "/sx") for s in sids]
+    with t:
+        resolve_indexed(r, index, sids)
+    indexed = t.last / amount * 1000
+
+    print(f"{len(templates):>5} templates: all templates {legacy:.4f} ms/sid - indexed {indexed:.4f} ms/sid - x{legacy / indexed:.1f}")
+
+
+def type_all_templates(r, all_fields):
+    for fields in all_fields:
+        r.format_all(fields)
+
+
+def type_indexed(r, index, all_fields):
+    for fields in all_fields:
+        for _type in get_keyset_candidates(index, fields):
+            if r.resolve_one(r.get_format_for(_type).format(**fields), _type):
+                pass
+
+
+def bench_typing(basetypes, amount=5000):
+    templates = build_templates(basetypes)
+    r = Resolver(f"bench_typing_{basetypes}", templates, check_duplicate_placeholders=False)
+    index = build_keyset_index(templates)
+    sids = build_sids(basetypes, amount)
+    all_fields = [r.resolve_first(s)[1] for s in sids]
+
+    t = Timer(logger=None)
+    with t:
+        type_all_templates(r, all_fields)
+    legacy = t.last / amount * 1000
+
+    r.resolve_one.cache_clear()
+    with t:
+        type_indexed(r, index, all_fields)
+    indexed = t.last / amount * 1000
+
+    print(f"{len(templates):>5} templates: dict to type, all templates {legacy:.4f} ms/sid - indexed {indexed:.4f} ms/sid - x{legacy / indexed:.1f}")
+
+
+if __name__ == "__main__":
+
+    print("start")
+    for basetypes in (1, 5, 10, 25, 50):
+        bench(basetypes)
+    for basetypes in (1, 5, 10, 25, 50):
+        bench_typing(basetypes)
+    print("done")
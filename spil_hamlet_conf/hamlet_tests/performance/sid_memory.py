@@ -0,0 +1,69 @@
+"""
+Measures how much a Sid weighs in memory.
+
+Compares the current compact Sid (__slots__, shared keys tuple, interned values tuple)
+with the previous layout (instance __dict__ holding the string, the type and a fields dict).
+
+The Sids are created with the typed constructor, so that every Sid is a new object
+(Sid() returns cached objects for identical strings).
+"""
+import gc
+import tracemalloc
+
+from spil import Sid
+from spil.sid.core.sid_factory import typed_dict_to_sid
+from spil_hamlet_conf.hamlet_scripts.example_sids import sids
+
+
+class LegacySid:
+    # previous layout: instance __dict__, with a fields dict per Sid.
+    def __init__(self, string, type, fields):
+        self._string = string
+        self._type = type
+        self._fields = fields
+
+
+def build_data(sids, amount):
+    typed = [s for s in Sid.from_strings(sids) if s.type]
+    return [(s.type, s.fields, s.string) for s in (typed * (amount // len(typed) + 1))[:amount]]
+
+
+def copied(fields, string):
+    # new string objects, as they would come from a data source (eg. a file listing or a database).
+    return {k: "".join(v) for k, v in fields.items()}, "".join(string)
+
+
+def create_legacy(_type, fields, string):
+    fields, string = copied(fields, string)
+    return LegacySid(string, _type, fields)
+
+
+def create_compact(_type, fields, string):
+    fields, string = copied(fields, string)
+    return typed_dict_to_sid(_type, fields, string=string)
+
+
+def measure(create, data, msg):
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = [create(*item) for item in data]
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    weight = (after - before) / len(result)
+    print(f"{msg}: {weight:.0f} bytes/sid")
+    return weight
+
+
+if __name__ == "__main__":
+
+    print("start")
+    amount = 100000
+    data = build_data(sids[:5000], amount)
+    print(f"{amount} Sids")
+
+    legacy = measure(create_legacy, data, "dict based Sid")
+    compact = measure(create_compact, data, "compact Sid")
+    print(f"x{legacy / compact:.1f} less memory (the Sid string is included)")
+    print("done")
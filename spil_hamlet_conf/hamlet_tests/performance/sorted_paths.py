@@ -0,0 +1,96 @@
+"""
+Compares sorted searches (">", the last version) in FindInPaths,
+without pushdown (all the versions are globbed, and all found files resolved to Sids, before keeping the last),
+and with the sorted key pushed down into the file system walk (FindInPaths.sorted_candidates):
+the version level is listed, and the versions are searched from the last one, until one has matches.
+
+A temporary sequence (sq900) with hundreds of versions per shot is written to the test files, and removed at the end.
+In shot sh0020, the last versions only have published files, so the search for work files falls back to previous versions.
+Counts the file system calls (os.scandir, os.lstat and os.stat), and the wall time.
+"""
+import os
+import shutil
+
+from codetiming import Timer
+
+from spil import FindInPaths, Sid
+from spil.sid.read.finders.find_glob import FindByGlob
+from spil.sid.read.tools import unfold_search
+
+versions = 300
+
+searches = [
+    "hamlet/s/sq900/sh0010/anim/>/w/ma",
+    "hamlet/s/sq900/sh0020/anim/>/w/ma",
+    "hamlet/s/sq900/*/anim/>/w/*",
+    "hamlet/s/sq900/sh0010/anim/>",
+    "hamlet/s/sq900/sh0010/anim/</w/ma",
+]
+
+calls = {"scandir": 0, "lstat": 0, "stat": 0}
+
+
+def counting(name, function):
+    def counted(*args, **kwargs):
+        calls[name] += 1
+        return function(*args, **kwargs)
+
+    return counted
+
+
+def write_files():
+    # returns the sequence folder
+    for shot in ("sh0010", "sh0020"):
+        for v in range(1, versions + 1):
+            sid = Sid(f"hamlet/s/sq900/{shot}/anim/v{v:03d}/p/ma")
+            states = ["p"] if (shot == "sh0020" and v > versions - 20) else ["w", "p"]
+            for state in states:
+                for ext in ("ma", "mb"):
+                    path = Sid(f"hamlet/s/sq900/{shot}/anim/v{v:03d}/{state}/{ext}").path()
+                    os.makedirs(os.path.dirname(path), exist_ok=True)
+                    open(path, "w").close()
+    return os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(str(sid.path())))))
+
+
+def without_pushdown(finder, search_sids):
+    # the default candidates: star search of all the matches
+    finder.sorted_candidates = lambda search_sid, is_first=False: FindByGlob.sorted_candidates(finder, search_sid, is_first)
+    try:
+        return list(finder.sorted_search(search_sids, as_sid=False))
+    finally:
+        del finder.sorted_candidates
+
+
+def bench(function, msg, runs=3):
+    t = Timer(logger=None)
+    times = []
+    for _ in range(runs):
+        for name in calls:
+            calls[name] = 0
+        with t:
+            found = function()
+        times.append(t.last)
+    print(f"    {msg}: {min(times) * 1000:.1f} ms, {calls['scandir']} listings, {calls['lstat'] + calls['stat']} stats ({len(found)} found)")
+    return min(times), found
+
+
+if __name__ == "__main__":
+
+    print("start")
+    folder = write_files()
+    try:
+        finder = FindInPaths()
+        os.scandir = counting("scandir", os.scandir)
+        os.lstat = counting("lstat", os.lstat)
+        os.stat = counting("stat", os.stat)
+
+        for search in searches:
+            search_sids = unfold_search(search)
+            print(f'"{search}"')
+            legacy_time, expected = bench(lambda: without_pushdown(finder, search_sids), "without pushdown")
+            pushed_time, found = bench(lambda: list(finder.sorted_search(search_sids, as_sid=False)), "pushdown")
+            assert expected == found, search
+            print(f"    x{legacy_time / pushed_time:.0f} - {found}")
+    finally:
+        shutil.rmtree(folder)
+    print("done")
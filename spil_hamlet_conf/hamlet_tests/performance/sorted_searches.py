@@ -0,0 +1,95 @@
+"""
+Compares sorted searches (">", the last version) in FindByGlob.sorted_search,
+with the legacy implementation (all matches collected in a list, deduplicated, sorted, then grouped),
+and the streaming implementation (only the current last match per group is kept).
+
+The list contains shots with hundreds of versions. Memory is the peak allocated during the search (tracemalloc), it includes the finder's own deduplication of the star search matches.
+Also checks the results on the file system (FindInPaths), with the test files.
+"""
+import itertools as it
+import tracemalloc
+
+from codetiming import Timer
+
+from spil import Sid, FindInList, FindInPaths
+from spil.sid.read.tools import unfold_search
+
+versions = 500
+
+searches = [
+    "hamlet/s/sq010/*/*/>/w/ma",
+    "hamlet/s/*/*/anim/>",
+    "hamlet/s/sq010/sh0010/**/>/w/ma",
+    "hamlet/s/sq010/*/*/</w/ma",
+]
+
+paths_searches = [
+    "hamlet/s/**/movie?version=>",
+    "hamlet/a/*/*/model/>/w/*",
+    "hamlet/s/sq010/*/*/>",
+]
+
+
+def legacy_sorted_search(finder, search_sids):
+    # previous implementation
+    index = str(search_sids[0]).split("/").index(">")
+    founds = []
+    for search_sid in search_sids:
+        ssid = search_sid.uri.replace(">", "*")
+        founds.extend(finder.star_search([Sid(ssid)], as_sid=False))
+    founds = sorted(list(set(founds)), reverse=True)
+    for key, grp in it.groupby(founds, key=lambda x: x.split("/")[0:index]):
+        result = list(grp)
+        yield result[0]
+
+
+def build_list():
+    result = []
+    for sequence, shot, task in it.product(["sq010", "sq020"], ["sh0010", "sh0020", "sh0030", "sh0040"], ["anim", "layout", "render"]):
+        prefix = f"hamlet/s/{sequence}/{shot}/{task}"
+        for v in range(1, versions + 1):
+            result.append(f"{prefix}/v{v:03d}")
+            for state, ext in (("w", "ma"), ("w", "mb"), ("p", "ma")):
+                result.append(f"{prefix}/v{v:03d}/{state}/{ext}")
+    return result
+
+
+def bench(function, msg, runs=3):
+    # best time of the runs, and peak memory of another run (tracemalloc slows allocations down)
+    t = Timer(logger=None)
+    times = []
+    for _ in range(runs):
+        with t:
+            found = list(function())
+        times.append(t.last)
+    tracemalloc.start()
+    list(function())
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    print(f"    {msg}: {min(times) * 1000:.1f} ms, peak {peak / 1024:.0f} KiB ({len(found)} found)")
+    return min(times), peak, found
+
+
+if __name__ == "__main__":
+
+    print("start")
+    finder = FindInPaths()
+    for search in paths_searches:
+        search_sids = unfold_search(search)
+        expected = list(legacy_sorted_search(finder, search_sids))
+        assert expected == list(finder.sorted_search(search_sids, as_sid=False)), search
+        print(f'"{search}" on paths: {len(expected)} found, same results')
+
+    searchlist = build_list()
+    finder = FindInList(searchlist, do_index=True)
+    print(f"{len(searchlist)} sids, {versions} versions per task")
+    for search in searches:
+        search_sids = unfold_search(search)
+        print(f'"{search}"')
+        if ">" in search:
+            legacy_time, legacy_peak, expected = bench(lambda: legacy_sorted_search(finder, search_sids), "legacy")
+        streaming_time, streaming_peak, found = bench(lambda: finder.sorted_search(search_sids, as_sid=False), "streaming")
+        if ">" in search:
+            assert expected == found, search
+            print(f"    time x{legacy_time / streaming_time:.1f} - memory -{(legacy_peak - streaming_peak) / 1024:.0f} KiB")
+    print("done")
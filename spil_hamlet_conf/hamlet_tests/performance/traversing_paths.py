@@ -0,0 +1,104 @@
+"""
+Compares FindInPaths star searches (star_search_simple),
+with the legacy implementation (one glob per typed search, duplicate patterns detected by list scan),
+and the shared traversal (the patterns are merged into a TraversalTree, each directory is listed once).
+
+Uses the test files (see spil.tests), and deep "**" searches, that unfold to many typed searches sharing directories.
+Counts the file system calls (os.scandir and os.lstat, as used by glob and os.path.lexists), and the wall time.
+"""
+from collections import defaultdict
+import glob
+import os
+
+from codetiming import Timer
+
+from spil import Sid, FindInPaths
+from spil.sid.read.tools import unfold_search
+from spil.util.exception import SpilException
+
+searches = [
+    "hamlet/*/**/maya",
+    "hamlet/*/**",
+    "hamlet/a/*/**/abc",
+    "hamlet/s/*/*/**/movie",
+    "hamlet/a,s/**/maya?version=*",
+]
+
+calls = {"scandir": 0, "lstat": 0}
+
+
+def counting(name, function):
+    def counted(*args, **kwargs):
+        calls[name] += 1
+        return function(*args, **kwargs)
+
+    return counted
+
+
+def legacy_star_search_simple(finder, search_sids):
+    # previous implementation (without the warnings and debug messages)
+    searched = defaultdict(list)
+    found_paths = set()
+    for search in search_sids:
+        pattern = str(search.path(finder.config_name))
+        if not pattern:
+            continue
+        for key, value in finder.conf.search_path_mapping.items():
+            pattern = pattern.replace(key, value)
+        if pattern in searched.get(search.type, []):
+            continue
+        else:
+            searched[search.type].append(pattern)
+        for path in glob.glob(pattern):
+            path = path.replace(os.sep, "/")
+            if path in found_paths:
+                continue
+            try:
+                sid = Sid(path=path, config=finder.config_name)
+                if sid.type != search.type:
+                    continue
+            except SpilException:
+                continue
+            if not sid:
+                continue
+            found_paths.add(path)
+            yield str(sid)
+
+
+def check(finder, search_sids):
+    expected = sorted(legacy_star_search_simple(finder, search_sids))
+    result = sorted(finder.star_search_simple(search_sids))
+    assert expected == result, (len(expected), len(result))
+    return len(result)
+
+
+def bench(function, search_sids, msg, runs=5):
+    # best of the runs, calls are counted for one run
+    t = Timer(logger=None)
+    times = []
+    for _ in range(runs):
+        for name in calls:
+            calls[name] = 0
+        with t:
+            for _ in function(search_sids):
+                pass
+        times.append(t.last)
+    print(f"    {msg}: {min(times) * 1000:.1f} ms, {calls['scandir']} listings, {calls['lstat']} stats")
+    return min(times)
+
+
+if __name__ == "__main__":
+
+    print("start")
+    finder = FindInPaths()
+    os.scandir = counting("scandir", os.scandir)
+    os.lstat = counting("lstat", os.lstat)
+
+    for search in searches:
+        search_sids = unfold_search(search)
+        count = check(finder, search_sids)
+        print(f'"{search}": {len(search_sids)} typed searches, {count} found')
+        legacy = bench(lambda s: legacy_star_search_simple(finder, s), search_sids, "legacy")
+        shared = bench(finder.star_search_simple, search_sids, "shared traversal")
+        print(f"    x{legacy / shared:.1f}")
+    print("done")
@@ -0,0 +1,71 @@
+"""
+Compares unfolding searches (tools.unfold_search) with and without the structural plan cache (see unfold_plans).
+
+The workload is typical of UI browsing: thousands of different searches, sharing a few shapes
+(eg. "hamlet/s/sq010/*/anim", "hamlet/s/sq020/*/anim"...).
+The literal search cache of unfold_search is not hit, since all search strings are different.
+"""
+import itertools
+
+from codetiming import Timer
+
+from spil.sid.read.tools import unfold
+from spil.sid.read.unfold_plans import unfold_with_plan
+from spil.util.caching import clear_caches
+
+shapes = [
+    "hamlet/s/{sequence}/*/{task}",
+    "hamlet/s/{sequence}/{shot}/{task}/*/w/maya",
+    "hamlet/s/{sequence}/{shot}/**/movie?version=>",
+    "hamlet/a/{assettype}/{asset}/*/>/p/*",
+    "hamlet/a,s/*/{asset},{shot}/*",
+]
+
+values = {
+    "sequence": [f"sq{i:03d}" for i in range(10, 100, 10)],
+    "shot": [f"sh{i:04d}" for i in range(10, 200, 10)],
+    "task": ["anim", "layout", "fx", "render"],
+    "assettype": ["char", "prop", "location"],
+    "asset": [f"asset{i:03d}" for i in range(50)],
+}
+
+
+def build_searches():
+    searches = set()
+    for shape in shapes:
+        keys = [k for k in values if "{" + k + "}" in shape]
+        for combination in itertools.product(*[values[k] for k in keys]):
+            searches.add(shape.format(**dict(zip(keys, combination))))
+    return sorted(searches)
+
+
+def check(searches):
+    for search in searches[::10]:
+        expected = unfold(search)
+        result = unfold_with_plan(search, False, unfold)
+        assert [s.string for s in expected] == [s.string for s in result], search
+        assert sorted(s.uri for s in expected) == sorted(s.uri for s in result), search
+
+
+def bench(function, searches, msg):
+    clear_caches()
+    t = Timer(logger=None)
+    with t:
+        for search in searches:
+            function(search)
+    print(f"{msg}: {t.last / len(searches) * 1000:.4f} ms/search")
+    return t.last
+
+
+if __name__ == "__main__":
+
+    print("start")
+    searches = build_searches()
+    print(f"{len(searches)} searches, {len(shapes)} shapes")
+
+    check(searches)
+
+    legacy = bench(unfold, searches, "unfolders")
+    planned = bench(lambda search: unfold_with_plan(search, False, unfold), searches, "structural plans")
+    print(f"x{legacy / planned:.1f}")
+    print("done")
@@ -48,32 +48,33 @@ extension_alias = {
     'movie': extensions_movie[:-1]
 }
 
+# Key patterns also accept the search symbols "*", ">" (last) and "<" (first), so that searches can be typed.
 key_patterns = {
 
     '__': {
-        '{state}':      r'{state:(w|p|\*|\>)}',         # "w" or "p" or *
-        '{state:w}':    r'{state:(w|\*|\>)}',           # "w" or "p" or *
-        '{state:p}':    r'{state:(p|\*|\>)}',           # "w" or "p" or *
-        '{version}':    r'{version:(v\d\d\d|\*|\>)}',   # "V" followed by 3 digits, or *
-        '{sequence}':   r'{sequence:(sq\d\d\d|\*|\>)}',   # "sq" followed by 3 digits, or *  # !!!: do not use r'{2}', error with lucidity
-        '{shot}':       r'{shot:(sh\d\d\d\d|\*|\>)}',     # "sh" followed by 4 digits, or *  # !!!: do not use r'{3}', error with lucidity
-
-        '{ext:scenes}': r'{ext:(' + '|'.join(extensions_scene) + r'|\*|\>)}',
-        '{ext:caches}': r'{ext:(' + '|'.join(extensions_cache) + r'|\*|\>)}',
-        '{ext:movies}': r'{ext:(' + '|'.join(extensions_movie) + r'|\*|\>)}',
+        '{state}':      r'{state:(w|p|\*|\>|\<)}',         # "w" or "p", or *, > or <
+        '{state:w}':    r'{state:(w|\*|\>|\<)}',           # "w", or *, > or <
+        '{state:p}':    r'{state:(p|\*|\>|\<)}',           # "p", or *, > or <
+        '{version}':    r'{version:(v\d\d\d|\*|\>|\<)}',   # "v" followed by 3 digits, or *, > or <
+        '{sequence}':   r'{sequence:(sq\d\d\d|\*|\>|\<)}',   # "sq" followed by 3 digits, or *, > or <  # !!!: do not use r'{2}', error with lucidity
+        '{shot}':       r'{shot:(sh\d\d\d\d|\*|\>|\<)}',     # "sh" followed by 4 digits, or *, > or <  # !!!: do not use r'{3}', error with lucidity
+
+        '{ext:scenes}': r'{ext:(' + '|'.join(extensions_scene) + r'|\*|\>|\<)}',
+        '{ext:caches}': r'{ext:(' + '|'.join(extensions_cache) + r'|\*|\>|\<)}',
+        '{ext:movies}': r'{ext:(' + '|'.join(extensions_movie) + r'|\*|\>|\<)}',
     },
 
     'asset__': {
-        '{task}': r'{task:(' + '|'.join(asset_tasks) + r'|\*|\>)}',
-        '{assettype}': r'{assettype:(' + '|'.join(asset_types) + r'|\*|\>)}',
+        '{task}': r'{task:(' + '|'.join(asset_tasks) + r'|\*|\>|\<)}',
+        '{assettype}': r'{assettype:(' + '|'.join(asset_types) + r'|\*|\>|\<)}',
     },
     'shot__': {
-        '{task}': r'{task:(' + '|'.join(shot_tasks) + r'|\*|\>)}',
+        '{task}': r'{task:(' + '|'.join(shot_tasks) + r'|\*|\>|\<)}',
     },
     't': {  # everything   containing a "t" (asset, shot, project...) # FIXME
-        '{project}': r'{project:(' + '|'.join(projects) + r'|\*|\>)}',
-        '{type:a}': r'{type:(a|\*|\>)}',
-        '{type:s}': r'{type:(s|\*|\>)}',
+        '{project}': r'{project:(' + '|'.join(projects) + r'|\*|\>|\<)}',
+        '{type:a}': r'{type:(a|\*|\>|\<)}',
+        '{type:s}': r'{type:(s|\*|\>|\<)}',
     },
 }
 
@@ -126,7 +126,7 @@ class FindInSG(Finder):
 
         # building SG request filters
         filters = []
-        for key, value in sid.fields.items():
+        for key, value in sid.fields_view.items():
             # print(f"Field {key} / {value}")
             # for every Sid field, we get the corresponding SG field
             field = get_key(field_mapping, key)
@@ -108,7 +108,7 @@ class GetFromSG(Getter):
 
         # building SG request filters
         filters = []
-        for key, value in sid.fields.items():
+        for key, value in sid.fields_view.items():
             # print(f"Field {key} / {value}")
             field = get_key(
                 field_mapping, key